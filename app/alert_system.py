@@ -29,6 +29,8 @@ import sqlite3
 import base64
 import mimetypes
 
+from .camera import metrics
+
 
 class AlertWorker(QThread):
     status = Signal(str)
@@ -58,6 +60,9 @@ class AlertWorker(QThread):
         except Exception:
             pass
 
+    def queue_depth(self) -> int:
+        return self._q.qsize()
+
     def enqueue(self, event: Dict[str, Any]):
         try:
             self._q.put_nowait(event)
@@ -391,10 +396,13 @@ class AlertSystem(QObject):
         self.worker.status.connect(self.status)
 
     def start(self):
+        # exported only while the worker runs, so a scrape never calls into a stopped one
+        metrics.register_gauge("cctv_alert_queue_depth", self.worker.queue_depth, "Alert events waiting for the alert worker.")
         if not self.worker.isRunning():
             self.worker.start()
 
     def stop(self):
+        metrics.unregister_gauge("cctv_alert_queue_depth")
         self.worker.stop()
         self.worker.wait(2000)
 
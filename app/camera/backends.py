@@ -0,0 +1,154 @@
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+import cv2
+
+# Candidate keys as stored per camera (cameras.last_backend); open_parallel() reports which one won
+GSTREAMER = "gstreamer"
+FFMPEG = "ffmpeg"
+V4L2 = "v4l2"
+DEFAULT = "default"
+
+_caps = None
+_caps_lock = threading.Lock()
+
+
+def _build_flag(info: str, key: str) -> bool:
+    # e.g. "    GStreamer:                   YES (1.20.3)" in the Video I/O section
+    m = re.search(rf"^\s*{re.escape(key)}:\s*(\w+)", info, re.MULTILINE | re.IGNORECASE)
+    return bool(m and m.group(1).upper() == "YES")
+
+
+def capabilities() -> dict:
+    """Capture backends compiled into this OpenCV build; parsed once per process and cached."""
+    global _caps
+    if _caps is not None:
+        return _caps
+    with _caps_lock:
+        if _caps is None:
+            try:
+                info = cv2.getBuildInformation()
+            except Exception:
+                info = ""
+            _caps = {
+                GSTREAMER: _build_flag(info, "GStreamer"),
+                FFMPEG: _build_flag(info, "FFMPEG"),
+                V4L2: _build_flag(info, "v4l/v4l2") or _build_flag(info, "V4L/V4L2"),
+            }
+    return _caps
+
+
+def probe_capabilities():
+    # Called at startup so the first camera doesn't pay for parsing the build information
+    capabilities()
+
+
+def _gst_pipeline(url: str) -> str:
+    # uridecodebin handles RTSP/HTTP/FILE; appsink caps left flexible, drop buffers to reduce lag
+    return f"uridecodebin uri={url} ! videoconvert ! appsink sync=false drop=true max-buffers=1"
+
+
+def open_with(backend: str, url: str, cam_type: str):
+    """Open `url` with one specific backend; returns an opened VideoCapture or None."""
+    cap = None
+    try:
+        if cam_type == "usb":
+            try:
+                index = int(url)
+            except Exception:
+                index = 0
+            cap = cv2.VideoCapture(index, cv2.CAP_V4L2) if backend == V4L2 else cv2.VideoCapture(index)
+            if cap.isOpened():
+                # Request modest resolution to reduce CPU
+                try:
+                    cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
+                    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+                    cap.set(cv2.CAP_PROP_FPS, 15)
+                except Exception:
+                    pass
+        elif backend == GSTREAMER:
+            cap = cv2.VideoCapture(_gst_pipeline(url), cv2.CAP_GSTREAMER)
+        elif backend == FFMPEG:
+            cap = cv2.VideoCapture(url, cv2.CAP_FFMPEG)
+        else:
+            cap = cv2.VideoCapture(url)
+    except Exception:
+        cap = None
+    if cap is not None and cap.isOpened():
+        return cap
+    if cap is not None:
+        try:
+            cap.release()
+        except Exception:
+            pass
+    return None
+
+
+def candidates(cam_type: str) -> list:
+    """Backends worth trying for a camera type, in preference order."""
+    caps = capabilities()
+    if cam_type == "usb":
+        return [V4L2, DEFAULT] if caps[V4L2] else [DEFAULT]
+    order = []
+    if caps[GSTREAMER]:
+        order.append(GSTREAMER)
+    order.append(DEFAULT)
+    # Only try FFmpeg by name if explicitly enabled via env (avoids capture-by-name warnings)
+    if caps[FFMPEG] and os.environ.get("OPENCV_USE_FFMPEG", "0") == "1":
+        order.append(FFMPEG)
+    return order
+
+
+def _release_quietly(fut):
+    try:
+        cap = fut.result()
+        if cap is not None:
+            cap.release()
+    except Exception:
+        pass
+
+
+def open_parallel(url: str, cam_type: str, backends: list, status=lambda msg: None):
+    """
+    Try `backends` concurrently and return (cap, backend) for the best one that opens, or (None, None).
+    An earlier backend in the list wins over a later one that happens to open first; once the best possible
+    candidate has answered, the slower ones are released in the background as they finish.
+    """
+    if not backends:
+        return None, None
+    if len(backends) == 1 or cam_type == "usb":
+        # a local device can't be opened twice at once; try sequentially
+        for b in backends:
+            status(f"Opening camera ({b})…")
+            cap = open_with(b, url, cam_type)
+            if cap is not None:
+                return cap, b
+        return None, None
+    status(f"Opening network stream ({', '.join(backends)})…")
+    pool = ThreadPoolExecutor(max_workers=len(backends), thread_name_prefix="cctv-open")
+    futs = {b: pool.submit(open_with, b, url, cam_type) for b in backends}
+    won = None
+    try:
+        pending = set(futs.values())
+        while pending:
+            _done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            # best = first backend in preference order that is either still running or opened
+            for b in backends:
+                f = futs[b]
+                if not f.done():
+                    break
+                if f.result() is not None:
+                    won = b
+                    break
+            if won is not None:
+                break
+    finally:
+        for b, f in futs.items():
+            if b != won:
+                f.add_done_callback(_release_quietly)
+        pool.shutdown(wait=False)
+    if won is None:
+        return None, None
+    return futs[won].result(), won
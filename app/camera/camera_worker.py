@@ -1,14 +1,59 @@
 from PySide6.QtCore import QThread, Signal
 import cv2
+import random
 import time
 from pathlib import Path
 
+from . import backends
+from .frame_ring import FrameRing
+from .metrics import metrics_for, FileGrowth
+from . import tracing
+from .osd import CaptureClock, TimestampOverlay
+
+# Display-branch widths for the GStreamer tee pipeline; snapping to a few sizes keeps tile resizes from
+# rebuilding the pipeline on every pixel
+_DISPLAY_WIDTHS = (320, 480, 640, 960, 1280, 1920)
+
+
+def gst_available() -> bool:
+    return backends.capabilities()[backends.GSTREAMER]
+
+
+def open_capture(url: str, cam_type: str, status=lambda msg: None, preferred: str | None = None):
+    """
+    Shared by CameraWorker and the capture process; returns (opened VideoCapture, candidate key) or (None, None).
+    `preferred` is the backend that last worked for this camera: it is tried alone first, and only if it fails are
+    the remaining candidates probed (in parallel for network sources). The key is None for simulated cameras.
+    A stored key that is no longer a candidate (build changed, OPENCV_USE_FFMPEG unset) is ignored.
+    """
+    cam_type = (cam_type or "rtsp").lower()
+    if cam_type == "sim" or url.lower().startswith("sim://"):
+        # synthetic source for load testing; no backend involved
+        from .sim import SimCapture
+        status("Opening simulated camera…")
+        cap = SimCapture(url)
+        return (cap, None) if cap.isOpened() else (None, None)
+    order = backends.candidates(cam_type)
+    if preferred and preferred in order:
+        cap = backends.open_with(preferred, url, cam_type)
+        if cap is not None:
+            return cap, preferred
+        status(f"{preferred} open failed; probing other backends...")
+        order = [b for b in order if b != preferred]
+    return backends.open_parallel(url, cam_type, order, status)
+
 
 class CameraWorker(QThread):
     frame_ready = Signal(object, int)  # (frame: numpy array, camera_id)
     status = Signal(int, str)  # (camera_id, message)
+    backend_changed = Signal(int, str)  # (camera_id, backend) when a different backend than preferred_backend opened
+    # reconnects on its own (see run); the tile's stale-stream restart leaves it alone
+    self_healing = True
+    RECONNECT_BASE = 1.0
+    RECONNECT_MAX = 30.0
+    STALL_TIMEOUT = 5.0  # seconds without a frame before the capture is considered dead
 
-    def __init__(self, camera_id: int, url: str, recordings_dir: Path, cam_type: str = "rtsp"):
+    def __init__(self, camera_id: int, url: str, recordings_dir: Path, cam_type: str = "rtsp", gst_tee: bool = False):
         super().__init__()
         self.camera_id = camera_id
         self.url = url
@@ -19,98 +64,93 @@ class CameraWorker(QThread):
         self._writer = None
         self._fps = 25.0
         self._size = (1280, 720)
+        # tee mode: GStreamer scales the display branch and muxes the encoded stream for recording
+        self.gst_tee = bool(gst_tee)
+        self._tee_active = False
+        self._display_width = None  # None = full resolution
+        self._record_path = None
+        self._reopen = False
+        # capture reads into preallocated slots; consumers borrow them by reference
+        self._ring = FrameRing(slots=6)
+        # per-consumer target rates in fps (0 = every source frame); frames nobody is due for are grabbed, not retrieved
+        self._rates = {"display": 12.0, "analytics": 12.0, "record": 0.0}
+        self._next_due = {}
+        self._display_on = True  # off while the tile isn't on screen: frames flow at the analytics rate only
+        self._osd = TimestampOverlay()
+        self._clock = CaptureClock()
+        self.metrics = metrics_for(camera_id)
+        self._rec_bytes = FileGrowth(self.metrics)  # cv2.VideoWriter doesn't report bytes; follow the file size
+        self._connected = False
+        self.preferred_backend = None  # last backend that worked (persisted per camera); tried first on open
+        self._rec_args = None  # (name_prefix, codec, out_dir) while recording; reused for post-reconnect segments
+
+    def _backoff_delay(self, attempt: int) -> float:
+        # exponential backoff with jitter so many dead cameras don't retry in lockstep
+        delay = min(self.RECONNECT_MAX, self.RECONNECT_BASE * (2 ** max(0, attempt - 1)))
+        return delay * random.uniform(0.5, 1.0)
+
+    def _sleep(self, secs: float):
+        end = time.time() + secs
+        while self._running and time.time() < end:
+            time.sleep(min(0.1, max(0.0, end - time.time())))
 
     def run(self):
-        # Open capture depending on type/backends
-        cap = None
-        opened = False
-        def gst_available():
-            try:
-                info = cv2.getBuildInformation()
-                return ("GStreamer" in info) or hasattr(cv2, "CAP_GSTREAMER")
-            except Exception:
-                return False
-
-        def ffmpeg_available():
-            try:
-                info = cv2.getBuildInformation()
-                return ("FFMPEG:" in info and "YES" in info.split("FFMPEG:",1)[1][:40]) or hasattr(cv2, "CAP_FFMPEG")
-            except Exception:
-                return False
-
-        def try_gstreamer(url: str, cam_type: str):
-            # Build flexible pipelines; return opened cap or None
-            try:
-                if not gst_available():
-                    return None
-                # Use uridecodebin which handles RTSP/HTTP/FILE
-                # appsink caps left flexible; drop buffers to reduce lag
-                if url.lower().startswith("rtsp"):
-                    pipe = f"uridecodebin uri={url} ! videoconvert ! appsink sync=false drop=true max-buffers=1"
-                elif url.lower().startswith("http"):
-                    pipe = f"uridecodebin uri={url} ! videoconvert ! appsink sync=false drop=true max-buffers=1"
-                else:
-                    pipe = f"uridecodebin uri={url} ! videoconvert ! appsink sync=false drop=true max-buffers=1"
-                c = cv2.VideoCapture(pipe, cv2.CAP_GSTREAMER)
-                if c is not None and c.isOpened():
-                    return c
-            except Exception:
-                return None
-            return None
-        # Try USB index with V4L2 first (Linux), then default
-        if self.cam_type == "usb":
-            try:
-                index = int(self.url)
-            except Exception:
-                index = 0
-            self.status.emit(self.camera_id, f"Opening USB camera index {index} (V4L2)...")
-            cap = cv2.VideoCapture(index, cv2.CAP_V4L2)
-            # Request modest resolution to reduce CPU
-            try:
-                cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-                cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-                cap.set(cv2.CAP_PROP_FPS, 15)
-            except Exception:
-                pass
-            opened = cap.isOpened()
-            if not opened:
-                self.status.emit(self.camera_id, "V4L2 open failed, trying default backend...")
-                cap.release()
-                cap = cv2.VideoCapture(index)
-                opened = cap.isOpened()
-        else:
-            # Network sources: try GStreamer (if available) then FFmpeg then default
-            cap = None
-            if gst_available():
-                self.status.emit(self.camera_id, "Opening network stream (GStreamer)…")
-                cap = try_gstreamer(self.url, self.cam_type)
-                opened = bool(cap and cap.isOpened())
-                if not opened and cap is not None:
-                    try:
-                        cap.release()
-                    except Exception:
-                        pass
-            if not opened:
-                # Try default backend first to avoid FFmpeg 'capture by name' warnings
-                self.status.emit(self.camera_id, "Opening network stream (Default)…")
-                cap = cv2.VideoCapture(self.url)
-                opened = cap.isOpened()
-            # Only try FFmpeg if explicitly enabled via env
-            import os
-            if not opened and ffmpeg_available() and os.environ.get("OPENCV_USE_FFMPEG", "0") == "1":
-                self.status.emit(self.camera_id, "Opening network stream (FFmpeg)…")
-                try:
-                    cap.release()
-                except Exception:
-                    pass
-                cap = cv2.VideoCapture(self.url, cv2.CAP_FFMPEG)
-                opened = cap.isOpened()
-        if not cap.isOpened():
-            self.status.emit(self.camera_id, "Camera open failed")
-            return
         self._running = True
-        self.status.emit(self.camera_id, "Camera started")
+        if self.gst_tee and self.cam_type != "usb" and gst_available():
+            if self._run_gst_tee():
+                return
+            self.status.emit(self.camera_id, "GStreamer tee pipeline unavailable; using decoded pipeline")
+        # Reconnect state machine: connecting -> streaming -> (stalled) -> backoff -> connecting ...
+        attempt = 0
+        started = False
+        while self._running:
+            # Open capture depending on type/backends (backend chatter only on the first attempt)
+            report = (lambda msg: self.status.emit(self.camera_id, msg)) if attempt == 0 else (lambda msg: None)
+            cap, backend = open_capture(self.url, self.cam_type, report, self.preferred_backend)
+            if cap is None:
+                attempt += 1
+                delay = self._backoff_delay(attempt)
+                self.metrics.count("reconnects")
+                self.status.emit(self.camera_id, f"Camera open failed; retrying in {delay:.0f}s")
+                self._sleep(delay)
+                continue
+            self.status.emit(self.camera_id, "Camera reconnected" if started else "Camera started")
+            self._note_backend(backend)
+            started = True
+            attempt = 0
+            self._configure(cap)
+            self._connected = True
+            if self._recording and self._writer is None and self._rec_args is not None:
+                # continue the recording in a new segment
+                self._open_writer(*self._rec_args)
+            lost = self._stream(cap)
+            self._connected = False
+            cap.release()
+            if lost and self._running:
+                if self._writer is not None:
+                    # close the current segment cleanly; a new one starts after reconnect
+                    self._writer.release()
+                    self._writer = None
+                    self._rec_bytes.track(None)
+                attempt = 1
+                delay = self._backoff_delay(attempt)
+                self.metrics.count("reconnects")
+                self.status.emit(self.camera_id, f"Stream lost; reconnecting in {delay:.0f}s")
+                self._sleep(delay)
+
+        self._ring.clear()
+        if self._writer is not None:
+            self._writer.release()
+            self._writer = None
+            self._rec_bytes.track(None)
+        self.status.emit(self.camera_id, "Camera stopped")
 
+    def _note_backend(self, name):
+        if name and name != self.preferred_backend:
+            self.preferred_backend = name
+            self.backend_changed.emit(self.camera_id, name)
+
+    def _configure(self, cap):
         fps = cap.get(cv2.CAP_PROP_FPS)
         try:
             fps = float(fps)
@@ -123,34 +163,202 @@ class CameraWorker(QThread):
         self._fps = fps
         self._size = (width, height)
 
-        last_emit = 0.0
-        emit_interval = 1.0 / 12.0  # throttle UI updates ~12 FPS
+    def _stream(self, cap) -> bool:
+        """Read until stopped (returns False) or no frame arrived for STALL_TIMEOUT seconds (returns True)."""
+        self._clock.reset()
+        last_ok = time.time()
+        failing = False
         while self._running:
-            ok, frame = cap.read()
+            ok, frame, due, recv_ts = self._next_frame(cap)
             if not ok:
-                self.status.emit(self.camera_id, "Frame read failed; retrying...")
+                if not failing:
+                    failing = True
+                    self.status.emit(self.camera_id, "Frame read failed; retrying...")
+                if time.time() - last_ok > self.STALL_TIMEOUT:
+                    return True
                 time.sleep(0.1)
                 continue
+            last_ok = time.time()
+            failing = False
+            if frame is None:
+                continue
 
-            # timestamp overlay
-            ts = time.strftime("%Y-%m-%d %H:%M:%S")
-            cv2.putText(frame, ts, (10, self._size[1] - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 200, 255), 2, cv2.LINE_AA)
+            # timestamp overlay (only frames a consumer takes get here)
+            self._osd.stamp(frame, self._clock.timestamp(cap.get(cv2.CAP_PROP_POS_MSEC), recv_ts))
 
-            if self._recording and self._writer is not None:
+            if "record" in due and self._writer is not None:
+                t = self.metrics.start()
                 self._writer.write(frame)
+                self.metrics.stop("write", t)
+                self._rec_bytes.poll()
 
-            now = time.time()
-            if (now - last_emit) >= emit_interval:
-                last_emit = now
+            if "display" in due or "analytics" in due:
                 try:
+                    tracing.emitted(self.camera_id, frame)
                     self.frame_ready.emit(frame, self.camera_id)
                 except Exception:
                     pass
+        return False
 
-        cap.release()
-        if self._writer is not None:
-            self._writer.release()
+    def set_rates(self, display_fps: float = 12.0, analytics_fps: float = 12.0, record_fps: float = 0.0):
+        self._rates = {
+            "display": max(0.0, float(display_fps or 0.0)),
+            "analytics": max(0.0, float(analytics_fps or 0.0)),
+            "record": max(0.0, float(record_fps or 0.0)),
+        }
+
+    def set_display_enabled(self, flag: bool):
+        self._display_on = bool(flag)
+
+    def _due(self, consumer: str, now: float) -> bool:
+        if consumer == "display" and not self._display_on:
+            return False
+        return self._rates[consumer] <= 0 or now >= self._next_due.get(consumer, 0.0)
+
+    def _consumed(self, consumer: str, now: float):
+        rate = self._rates[consumer]
+        if rate > 0:
+            # advance on a fixed cadence so the average matches the target; don't bank time while the source stalls
+            self._next_due[consumer] = max(self._next_due.get(consumer, 0.0) + 1.0 / rate, now)
+
+    def _next_frame(self, cap):
+        """
+        grab() every frame so the source never backs up, but retrieve() (convert + copy out) only when the display,
+        analytics or recording consumer is due. Returns (ok, frame or None, due consumers, receive time).
+        """
+        m = self.metrics
+        t = m.start()
+        if not cap.grab():
+            return False, None, (), 0.0
+        m.captured()
+        m.stop("capture", t)
+        m.count("frames")
+        now = time.time()
+        due = [c for c in ("display", "analytics") if self._due(c, now)]
+        if self._recording and self._writer is not None and self._due("record", now):
+            due.append("record")
+        if not due:
+            return True, None, (), now
+        slot = self._ring.acquire()
+        if slot is None:
+            if "record" not in due:
+                # every slot is still borrowed downstream; skip this frame
+                m.count("drops")
+                return True, None, (), now
+            # the writer must not lose frames, so overflow into a fresh allocation
+            t = m.start()
+            ok, frame = cap.retrieve()
+        else:
+            t = m.start()
+            ok, frame = cap.retrieve(image=slot)
+            if ok:
+                self._ring.adopt(slot, frame)
+        m.stop("decode", t)
+        if not ok:
+            return False, None, (), now
+        for c in due:
+            self._consumed(c, now)
+        return True, frame, due, now
+
+    def _tee_pipeline(self, width: int | None, record_path: Path | None) -> str:
+        scale = f"videoscale ! video/x-raw,width={width},pixel-aspect-ratio=1/1 ! " if width else ""
+        display = f"{scale}videoconvert ! video/x-raw,format=BGR ! appsink sync=false drop=true max-buffers=1"
+        if record_path is None:
+            return f"uridecodebin uri={self.url} ! {display}"
+        # Split before decode: the record branch muxes the camera's encoded stream untouched
+        return (
+            f"urisourcebin uri={self.url} ! parsebin ! tee name=t "
+            f"t. ! queue ! decodebin ! {display} "
+            f"t. ! queue ! matroskamux streamable=true ! filesink location=\"{record_path}\""
+        )
+
+    def _run_gst_tee(self) -> bool:
+        # Returns False if the first pipeline cannot be opened so run() can fall back to the classic path
+        self._tee_active = True
+        first = True
+        attempt = 0
+        try:
+            while self._running:
+                record_path = self._record_path if self._recording else None
+                self._reopen = False
+                self.status.emit(self.camera_id, "Opening network stream (GStreamer tee)…")
+                cap = cv2.VideoCapture(self._tee_pipeline(self._display_width, record_path), cv2.CAP_GSTREAMER)
+                if not cap.isOpened():
+                    cap.release()
+                    if record_path is not None:
+                        # keep streaming without the record branch
+                        self._recording = False
+                        self._record_path = None
+                        self.status.emit(self.camera_id, "Recording pipeline failed to start")
+                        continue
+                    if first:
+                        return False
+                    attempt += 1
+                    delay = self._backoff_delay(attempt)
+                    self.metrics.count("reconnects")
+                    self.status.emit(self.camera_id, f"Camera open failed; retrying in {delay:.0f}s")
+                    self._sleep(delay)
+                    continue
+                attempt = 0
+                if first:
+                    first = False
+                    self.status.emit(self.camera_id, "Camera started")
+                if record_path is not None:
+                    self.status.emit(self.camera_id, f"Recording: {record_path}")
+                self._rec_bytes.track(record_path)
+                fps = cap.get(cv2.CAP_PROP_FPS)
+                self._fps = float(fps) if fps and fps > 1 else 25.0
+                self._clock.reset()
+                last_ok = time.time()
+                lost = False
+                while self._running and not self._reopen:
+                    ok, frame, due, recv_ts = self._next_frame(cap)
+                    if not ok:
+                        if time.time() - last_ok > self.STALL_TIMEOUT:
+                            lost = True
+                            break
+                        time.sleep(0.1)
+                        continue
+                    last_ok = time.time()
+                    self._rec_bytes.poll()
+                    if frame is None:
+                        continue
+                    h, w = frame.shape[:2]
+                    self._size = (w, h)
+                    self._osd.stamp(frame, self._clock.timestamp(cap.get(cv2.CAP_PROP_POS_MSEC), recv_ts))
+                    if "display" in due or "analytics" in due:
+                        try:
+                            tracing.emitted(self.camera_id, frame)
+                            self.frame_ready.emit(frame, self.camera_id)
+                        except Exception:
+                            pass
+                cap.release()
+                self._rec_bytes.track(None)
+                if lost and self._running:
+                    self.metrics.count("reconnects")
+                    # the record branch (if any) is rebuilt with a new file when the pipeline reopens
+                    if self._recording and self._record_path is not None:
+                        self._record_path = self._record_path.with_name(f"{self._record_path.stem.rsplit('_', 2)[0]}_{time.strftime('%Y%m%d_%H%M%S')}.mkv")
+                    delay = self._backoff_delay(1)
+                    self.status.emit(self.camera_id, f"Stream lost; reconnecting in {delay:.0f}s")
+                    self._sleep(delay)
+        finally:
+            self._ring.clear()
+            self._tee_active = False
+            self._recording = False
+            self._record_path = None
         self.status.emit(self.camera_id, "Camera stopped")
+        return True
+
+    def set_decode_target(self, size):
+        # Only the tee pipeline can scale inside GStreamer; the width is snapped so small resizes are free
+        width = None
+        if size:
+            width = next((w for w in _DISPLAY_WIDTHS if w >= int(size[0])), None)
+        if width != self._display_width:
+            self._display_width = width
+            if self._tee_active:
+                self._reopen = True
 
     def stop(self):
         self._running = False
@@ -160,21 +368,52 @@ class CameraWorker(QThread):
             return
         target_dir = out_dir if out_dir is not None else self.recordings_dir
         target_dir.mkdir(parents=True, exist_ok=True)
+        if self._tee_active:
+            # Encoded pass-through into Matroska; the pipeline is rebuilt with the record branch attached
+            self._record_path = target_dir / f"{name_prefix}_{time.strftime('%Y%m%d_%H%M%S')}.mkv"
+            self._recording = True
+            self._reopen = True
+            return
+        self._rec_args = (name_prefix, codec, target_dir)
+        self._recording = True
+        if self._connected:
+            self._open_writer(*self._rec_args)
+        else:
+            # not streaming right now (connecting/backoff); the segment opens once frames flow
+            self.status.emit(self.camera_id, "Recording armed; waiting for camera")
+
+    def _open_writer(self, name_prefix: str, codec: str, target_dir: Path):
         ts = time.strftime("%Y%m%d_%H%M%S")
         use_avi = (str(codec).lower() == "avi")
         ext = ".avi" if use_avi else ".mp4"
         fourcc = cv2.VideoWriter_fourcc(*("MJPG" if use_avi else "mp4v"))
         out_path = target_dir / f"{name_prefix}_{ts}{ext}"
-        self._writer = cv2.VideoWriter(str(out_path), fourcc, float(self._fps or 25.0), self._size)
-        if self._writer is not None and self._writer.isOpened():
-            self._recording = True
+        fps = float(self._fps or 25.0)
+        if self._rates["record"] > 0:
+            fps = min(fps, self._rates["record"])
+        self._next_due.pop("record", None)
+        writer = cv2.VideoWriter(str(out_path), fourcc, fps, self._size)
+        if writer is not None and writer.isOpened():
+            self._writer = writer
+            self._rec_bytes.track(out_path)
             self.status.emit(self.camera_id, f"Recording: {out_path}")
+        else:
+            self._recording = False
+            self._rec_args = None
+            self.status.emit(self.camera_id, "Recording failed to start")
 
     def stop_recording(self):
         if not self._recording:
             return
         self._recording = False
+        self._rec_args = None
+        if self._tee_active:
+            self._record_path = None
+            self._reopen = True
+            self.status.emit(self.camera_id, "Recording stopped")
+            return
         if self._writer is not None:
             self._writer.release()
             self._writer = None
+            self._rec_bytes.track(None)
         self.status.emit(self.camera_id, "Recording stopped")
@@ -0,0 +1,251 @@
+from PySide6.QtCore import QThread, Signal
+import multiprocessing as mp
+import queue
+import time
+from pathlib import Path
+
+import cv2
+
+from .frame_bus import FrameBus
+from .metrics import metrics_for, FileGrowth
+from . import tracing
+from .osd import CaptureClock, TimestampOverlay
+
+_BUS_SLOTS = 6
+
+
+def _capture_main(camera_id: int, url: str, cam_type: str, lock, msgs, cmds, stop, preferred=None):
+    # Runs in its own process: capture + timestamp + recording, frames published on a FrameBus
+    from .camera_worker import open_capture
+
+    def status(msg: str):
+        msgs.put(("status", msg))
+
+    cap, backend = open_capture(url, cam_type, status, preferred)
+    if cap is None:
+        status("Camera open failed")
+        msgs.put(("stopped",))
+        return
+    status("Camera started")
+    if backend:
+        msgs.put(("backend", backend))
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    fps = float(fps) if fps and fps > 1 else 25.0
+    bus = None
+    seq = 0
+    writer = None
+    pending_record = None
+    osd = TimestampOverlay()
+    clock = CaptureClock()
+    try:
+        while not stop.is_set():
+            try:
+                while True:
+                    cmd = cmds.get_nowait()
+                    if cmd[0] == "record" and writer is None:
+                        pending_record = cmd[1:]
+                    elif cmd[0] == "stop_record":
+                        pending_record = None
+                        if writer is not None:
+                            writer.release()
+                            writer = None
+                            msgs.put(("recording", False))
+                            status("Recording stopped")
+            except queue.Empty:
+                pass
+
+            slot = bus.acquire(bus_shape) if bus is not None else None
+            if bus is not None and slot is None and writer is None and pending_record is None:
+                # every slot is pinned by readers; skip this frame without decoding it
+                if not cap.grab():
+                    time.sleep(0.1)
+                continue
+            ok, frame = cap.read(image=slot[1]) if slot is not None else cap.read()
+            recv_ts = time.time()
+            if not ok:
+                status("Frame read failed; retrying...")
+                time.sleep(0.1)
+                continue
+            if slot is None or frame is not slot[1]:
+                # first frame, resolution change or overflow: copy into the bus, growing it if needed
+                if bus is None or frame.nbytes > bus.frame_bytes:
+                    old = bus
+                    bus = FrameBus(lock, _BUS_SLOTS, frame.nbytes, create=True)
+                    msgs.put(("bus",) + bus.info())
+                    if old is not None:
+                        old.close()
+                bus_shape = frame.shape
+                slot = bus.acquire(bus_shape)
+                if slot is not None:
+                    slot[1][...] = frame
+                    frame = slot[1]
+            bus_shape = frame.shape
+
+            ts = clock.timestamp(cap.get(cv2.CAP_PROP_POS_MSEC), recv_ts)
+            osd.stamp(frame, ts)
+
+            if pending_record is not None:
+                name_prefix, codec, out_dir = pending_record
+                pending_record = None
+                target_dir = Path(out_dir)
+                target_dir.mkdir(parents=True, exist_ok=True)
+                use_avi = (str(codec).lower() == "avi")
+                ext = ".avi" if use_avi else ".mp4"
+                fourcc = cv2.VideoWriter_fourcc(*("MJPG" if use_avi else "mp4v"))
+                out_path = target_dir / f"{name_prefix}_{time.strftime('%Y%m%d_%H%M%S')}{ext}"
+                writer = cv2.VideoWriter(str(out_path), fourcc, fps, (frame.shape[1], frame.shape[0]))
+                if writer.isOpened():
+                    msgs.put(("recording", True, str(out_path)))
+                    status(f"Recording: {out_path}")
+                else:
+                    writer = None
+                    msgs.put(("recording", False))
+                    status("Recording failed to start")
+            if writer is not None:
+                writer.write(frame)
+
+            if slot is not None:
+                seq += 1
+                bus.publish(slot[0], seq, frame.shape, ts)
+    finally:
+        cap.release()
+        if writer is not None:
+            writer.release()
+        slot = frame = None
+        if bus is not None:
+            bus.close()
+        msgs.put(("stopped",))
+
+
+class ProcessCameraWorker(QThread):
+    """
+    CameraWorker counterpart whose capture runs in a separate process (one per camera), so decode and timestamping
+    scale across cores instead of sharing the GUI interpreter's GIL. This thread only maps the newest frame from the
+    camera's FrameBus and emits it; other processes can attach to the same bus via bus_info() and bus_lock.
+    """
+    frame_ready = Signal(object, int)  # (frame: numpy array mapped from shared memory, camera_id)
+    status = Signal(int, str)
+    backend_changed = Signal(int, str)
+
+    def __init__(self, camera_id: int, url: str, recordings_dir: Path, cam_type: str = "rtsp"):
+        super().__init__()
+        self.camera_id = camera_id
+        self.url = url
+        self.recordings_dir = recordings_dir
+        self.cam_type = (cam_type or "rtsp").lower()
+        self._running = False
+        self._recording = False
+        self.preferred_backend = None
+        # spawn: never fork a process that has Qt threads running
+        self._ctx = mp.get_context("spawn")
+        self.bus_lock = self._ctx.Lock()
+        self._cmds = self._ctx.Queue()
+        self._bus_info = None
+        self._emit_interval = 1.0 / 12.0  # UI updates ~12 FPS, same as CameraWorker
+        # capture/decode/write run in the child process; only forwarded frames are counted here
+        self.metrics = metrics_for(camera_id)
+        self._rec_bytes = FileGrowth(self.metrics)  # the writer lives in the capture process; follow the file instead
+
+    def bus_info(self):
+        """(name, slots, frame_bytes) of the current bus, or None before the first frame."""
+        return self._bus_info
+
+    def run(self):
+        self._running = True
+        msgs = self._ctx.Queue()
+        stop = self._ctx.Event()
+        proc = self._ctx.Process(
+            target=_capture_main,
+            args=(self.camera_id, self.url, self.cam_type, self.bus_lock, msgs, self._cmds, stop, self.preferred_backend),
+            name=f"cctv-capture-{self.camera_id}",
+            daemon=True,
+        )
+        self.status.emit(self.camera_id, "Starting capture process…")
+        proc.start()
+        bus = None
+        last_seq = -1
+        stopped = False
+        try:
+            while self._running and not stopped:
+                t0 = time.time()
+                try:
+                    while True:
+                        msg = msgs.get_nowait()
+                        kind = msg[0]
+                        if kind == "status":
+                            self.status.emit(self.camera_id, msg[1])
+                        elif kind == "bus":
+                            if bus is not None:
+                                bus.close()
+                            bus = FrameBus(self.bus_lock, msg[2], msg[3], name=msg[1])
+                            self._bus_info = msg[1:]
+                            last_seq = -1
+                        elif kind == "backend":
+                            if msg[1] != self.preferred_backend:
+                                self.preferred_backend = msg[1]
+                                self.backend_changed.emit(self.camera_id, msg[1])
+                        elif kind == "recording":
+                            self._recording = bool(msg[1])
+                            self._rec_bytes.track(msg[2] if len(msg) > 2 else None)
+                        elif kind == "stopped":
+                            stopped = True
+                except queue.Empty:
+                    pass
+                if bus is not None:
+                    got = bus.latest(last_seq)
+                    if got is not None:
+                        frame, last_seq, ts = got
+                        m = self.metrics
+                        if m.on:
+                            m.count("frames")
+                            # bus timestamps are wall-clock capture times; map onto perf_counter for latency
+                            m.last_capture = time.perf_counter() - max(0.0, time.time() - ts)
+                        if tracing.active:
+                            # captured in the other process: the span covers capture -> shared memory -> this thread
+                            now = time.perf_counter()
+                            tracing.begin(self.camera_id)
+                            tracing.span("bus", now - max(0.0, time.time() - ts), now, self.camera_id)
+                        try:
+                            tracing.emitted(self.camera_id, frame)
+                            self.frame_ready.emit(frame, self.camera_id)
+                        except Exception:
+                            pass
+                        frame = None
+                self._rec_bytes.poll()
+                if not stopped and not proc.is_alive():
+                    self.status.emit(self.camera_id, "Capture process exited")
+                    break
+                dt = time.time() - t0
+                if dt < self._emit_interval:
+                    time.sleep(self._emit_interval - dt)
+        finally:
+            stop.set()
+            proc.join(2.0)
+            if proc.is_alive():
+                proc.terminate()
+                proc.join(1.0)
+            if bus is not None:
+                # the capture process normally unlinks; cover a crashed/terminated one
+                bus.unlink()
+                bus.close()
+            self._bus_info = None
+            self._recording = False
+            self._rec_bytes.track(None)
+        self.status.emit(self.camera_id, "Camera stopped")
+
+    def stop(self):
+        self._running = False
+
+    def start_recording(self, name_prefix: str = "rec", codec: str = "mp4", out_dir: Path | None = None):
+        if self._recording:
+            return
+        target_dir = out_dir if out_dir is not None else self.recordings_dir
+        self._cmds.put(("record", name_prefix, codec, str(target_dir)))
+        # optimistic: the capture process confirms (or reverts) via its message queue
+        self._recording = True
+
+    def stop_recording(self):
+        if not self._recording:
+            return
+        self._cmds.put(("stop_record",))
+        self._recording = False
@@ -44,7 +44,9 @@ class PersonDetector:
         h, w = frame.shape[:2]
         blob = cv2.dnn.blobFromImage(frame, 1/255.0, self.input_size, swapRB=True, crop=False)
         self.net.setInput(blob)
-        preds = self.net.forward()
+        return self._postprocess(self.net.forward(), w, h)
+
+    def _postprocess(self, preds: np.ndarray, w: int, h: int) -> List[Tuple[int, int, int, int, float]]:
         # Post-process for YOLOv5/YOLOv8-like outputs: [N, 85] where 0:4=xywh, 4=obj, 5: classes
         dets = []
         if preds.ndim == 3:
@@ -0,0 +1,145 @@
+import atexit
+import time
+import weakref
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# Per-slot metadata; `pins` counts readers currently mapping the slot
+_SLOT = np.dtype([("seq", "<i8"), ("ts", "<f8"), ("h", "<i4"), ("w", "<i4"), ("c", "<i4"), ("pins", "<i4")])
+_ALIGN = 64
+
+# Segments closed while consumers still held frame views; the mapping can only be closed once those are gone
+_orphans: list = []
+
+
+def _sweep_orphans():
+    for shm in list(_orphans):
+        try:
+            shm.close()
+            _orphans.remove(shm)
+        except BufferError:
+            pass
+        except Exception:
+            _orphans.remove(shm)
+
+
+@atexit.register
+def _drop_orphans():
+    # The OS reclaims the mappings at exit; keep SharedMemory.__del__ from failing on still-exported views
+    _sweep_orphans()
+    for shm in _orphans:
+        shm._buf = None
+        shm._mmap = None
+
+
+class FrameBus:
+    """
+    One camera's frames in a multiprocessing.shared_memory segment: a small control block (latest slot, per-slot
+    seq/timestamp/shape/pins) followed by `slots` fixed-size frame buffers.
+    The capture process writes straight into a slot (cap.read(image=...)) and publishes it; readers in any process
+    map the latest slot as an ndarray without copying. A read pins the slot until the returned array (and every view
+    derived from it) is garbage collected, so the writer never overwrites a frame that is still in use.
+    All control-block updates happen under `lock` (a multiprocessing lock shared by writer and readers).
+    """
+
+    def __init__(self, lock, slots: int = 4, frame_bytes: int = 0, name: str | None = None, create: bool = False):
+        _sweep_orphans()
+        self.lock = lock
+        ctrl = _ALIGN + ((slots * _SLOT.itemsize + _ALIGN - 1) // _ALIGN) * _ALIGN
+        if create:
+            self.slots = int(slots)
+            self.frame_bytes = int(frame_bytes)
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=ctrl + self.slots * self.frame_bytes)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+            self.slots = int(slots)
+            self.frame_bytes = int(frame_bytes)
+        self.name = self.shm.name
+        self.owner = create
+        self._data_off = ctrl
+        self._latest = np.ndarray((1,), dtype="<i8", buffer=self.shm.buf, offset=0)
+        self._meta = np.ndarray((self.slots,), dtype=_SLOT, buffer=self.shm.buf, offset=_ALIGN)
+        self._next = 0
+        if create:
+            self._latest[0] = -1
+            self._meta[:] = 0
+
+    def info(self) -> tuple:
+        """Arguments a reader needs (besides the lock) to attach: (name, slots, frame_bytes)."""
+        return self.name, self.slots, self.frame_bytes
+
+    def _view(self, k: int, shape, dtype=np.uint8):
+        n = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        flat = np.frombuffer(self.shm.buf, dtype=np.uint8, count=n, offset=self._data_off + k * self.frame_bytes)
+        return flat, flat.view(dtype).reshape(shape)
+
+    # writer side
+    def acquire(self, shape):
+        """Return (slot, ndarray view) for the next free slot, or None if every slot is pinned by readers."""
+        if int(np.prod(shape)) > self.frame_bytes:
+            return None
+        with self.lock:
+            latest = int(self._latest[0])
+            for i in range(self.slots):
+                k = (self._next + i) % self.slots
+                if k != latest and self._meta[k]["pins"] == 0:
+                    self._next = (k + 1) % self.slots
+                    return k, self._view(k, shape)[1]
+        return None
+
+    def publish(self, k: int, seq: int, shape, ts: float | None = None):
+        h, w = shape[:2]
+        c = shape[2] if len(shape) > 2 else 1
+        with self.lock:
+            m = self._meta[k]
+            m["seq"] = seq
+            m["ts"] = time.time() if ts is None else ts
+            m["h"], m["w"], m["c"] = h, w, c
+            self._latest[0] = k
+
+    # reader side
+    def latest(self, after_seq: int = -1):
+        """Return (frame, seq, ts) for the newest frame with seq > after_seq, or None. The frame maps shared memory."""
+        with self.lock:
+            k = int(self._latest[0])
+            if k < 0:
+                return None
+            m = self._meta[k]
+            seq = int(m["seq"])
+            if seq <= after_seq:
+                return None
+            m["pins"] += 1
+            shape = (int(m["h"]), int(m["w"]), int(m["c"]))
+            ts = float(m["ts"])
+        flat, frame = self._view(k, shape)
+        weakref.finalize(flat, self._unpin, k)
+        return frame, seq, ts
+
+    def _unpin(self, k: int):
+        try:
+            with self.lock:
+                if self._meta[k]["pins"] > 0:
+                    self._meta[k]["pins"] -= 1
+        except Exception:
+            pass
+
+    def close(self):
+        # Views still held by consumers keep the mapping alive; the segment is released once they are collected
+        self._latest = self._meta = None
+        try:
+            self.shm.close()
+        except BufferError:
+            _orphans.append(self.shm)
+        except Exception:
+            pass
+        if self.owner:
+            self.unlink()
+
+    def unlink(self):
+        try:
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
+        except Exception:
+            pass
@@ -0,0 +1,53 @@
+import sys
+
+import numpy as np
+
+
+class FrameRing:
+    """
+    Fixed set of preallocated frame buffers for one camera.
+    Capture reads into a free slot (cap.read(image=slot)) and hands the slot itself to consumers. A slot is borrowed
+    for as long as anything else holds a reference to it (queued signal, tile, alert queue, numpy views), so the
+    Python refcount is the handle: no explicit release, and a slot is never overwritten while still in use.
+    """
+
+    def __init__(self, slots: int = 4):
+        self._n = max(2, int(slots))
+        self._slots = [np.empty((0,), dtype=np.uint8) for _ in range(self._n)]
+        self._next = 0
+        self.shape = None
+        # references held when nobody borrows a slot: the list entry plus getrefcount's own argument
+        self._free_refs = sys.getrefcount(self._slots[0])
+
+    def acquire(self):
+        """Return a free slot (possibly still unsized before the first frame), or None if all are borrowed."""
+        for i in range(self._n):
+            k = (self._next + i) % self._n
+            if sys.getrefcount(self._slots[k]) <= self._free_refs:
+                self._next = (k + 1) % self._n
+                return self._slots[k]
+        return None
+
+    def adopt(self, slot, frame):
+        """
+        Called when capture returned a new array instead of filling `slot` (first frame or size change):
+        the new array takes the slot's place and the remaining slots are reallocated at the new shape.
+        """
+        if frame is slot or frame is None:
+            return
+        try:
+            k = next(i for i, s in enumerate(self._slots) if s is slot)
+        except StopIteration:
+            return
+        self.shape = frame.shape
+        self._slots[k] = frame
+        for i in range(self._n):
+            if i != k and self._slots[i].shape != frame.shape:
+                self._slots[i] = np.empty(frame.shape, dtype=frame.dtype)
+
+    def borrowed(self) -> int:
+        return sum(1 for i in range(self._n) if sys.getrefcount(self._slots[i]) > self._free_refs)
+
+    def clear(self):
+        self._slots = [np.empty((0,), dtype=np.uint8) for _ in range(self._n)]
+        self.shape = None
@@ -1,37 +1,54 @@
 from PySide6.QtCore import QThread, Signal
 import time
+from pathlib import Path
 from urllib.request import urlopen, Request
 
+from .jpeg import decode_jpeg
+from .metrics import metrics_for
+from . import tracing
+from .mjpeg_parser import MJPEGStreamParser
+from .mjpeg_recorder import MjpegRecorder
+
 
 class HttpMJPEGWorker(QThread):
     frame_ready = Signal(object, int)  # (frame ndarray, camera_id)
     status = Signal(int, str)
 
-    def __init__(self, camera_id: int, url: str):
+    def __init__(self, camera_id: int, url: str, recordings_dir: Path | None = None):
         super().__init__()
         self.camera_id = camera_id
         self.url = url
         self._running = False
+        self._decode_target = None  # (w, h) the consumer displays at; None = full resolution
+        self.recordings_dir = recordings_dir or Path("recordings")
+        self._recorder = None
+        self._recording = False
+        self.metrics = metrics_for(camera_id)
 
     def stop(self):
         self._running = False
 
-    def _readline(self, resp):
-        # Read a single CRLF-terminated line
-        line = b""
-        while True:
-            ch = resp.read(1)
-            if not ch:
-                break
-            line += ch
-            if line.endswith(b"\r\n"):
-                break
-        return line
+    def set_decode_target(self, size):
+        self._decode_target = tuple(size) if size else None
 
-    def run(self):
-        import cv2
-        import numpy as np
+    def start_recording(self, name_prefix: str = "rec", codec: str = "avi", out_dir: Path | None = None):
+        # Pass-through: original JPEG payloads go straight into an MJPG AVI (codec preference does not apply)
+        if self._recorder is not None:
+            return
+        target_dir = out_dir if out_dir is not None else self.recordings_dir
+        self._recorder = MjpegRecorder(target_dir, name_prefix, fps=None, metrics=self.metrics)
+        self._recording = True
+        self.status.emit(self.camera_id, f"Recording: {self._recorder.path}")
+
+    def stop_recording(self):
+        rec, self._recorder = self._recorder, None
+        if rec is None:
+            return
+        self._recording = False
+        rec.close()
+        self.status.emit(self.camera_id, "Recording stopped")
 
+    def run(self):
         self._running = True
         reconnect_delay = 1.0
         while self._running:
@@ -49,79 +66,49 @@ class HttpMJPEGWorker(QThread):
                         boundary = '--' + boundary
                     boundary = boundary.encode('utf-8')
                 else:
-                    # Some servers don't send multipart header; we'll still try to parse parts by headers
+                    # Some servers don't send multipart header; parser falls back to JPEG SOI/EOI scanning
                     boundary = None
             except Exception as e:
                 self.status.emit(self.camera_id, f"HTTP open failed: {e}")
+                self.metrics.count("reconnects")
                 time.sleep(reconnect_delay)
                 reconnect_delay = min(8.0, reconnect_delay * 2)
                 continue
 
             reconnect_delay = 1.0
             last_status = time.time()
+            parser = MJPEGStreamParser(boundary)
+            m = self.metrics
+            t_capture = m.start()
             try:
                 while self._running:
-                    # Find multipart boundary (if provided)
-                    if boundary is not None:
-                        # consume until boundary line
-                        line = self._readline(resp)
-                        while self._running and line and boundary not in line:
-                            line = self._readline(resp)
-                        if not line:
+                    payload = parser.next_part()
+                    if payload is None:
+                        if parser.fill(resp) == 0:
                             raise IOError('Stream ended')
+                        continue
+                    m.captured()
+                    m.stop("capture", t_capture)
+                    m.count("frames")
+                    m.count("bytes", len(payload))
 
-                    # Read part headers
-                    headers = {}
-                    while self._running:
-                        line = self._readline(resp)
-                        if not line:
-                            raise IOError('Stream ended while reading headers')
-                        line = line.strip()
-                        if not line:
-                            break
-                        if b":" in line:
-                            k, v = line.split(b":", 1)
-                            headers[k.strip().lower()] = v.strip()
-
-                    # Determine content length
-                    clen = None
-                    if b'content-length' in headers:
+                    rec = self._recorder
+                    if rec is not None:
+                        t = m.start()
                         try:
-                            clen = int(headers[b'content-length'])
-                        except Exception:
-                            clen = None
-
-                    # Read payload
-                    if clen is not None and clen > 0:
-                        jpg = b""
-                        to_read = clen
-                        while self._running and to_read > 0:
-                            chunk = resp.read(to_read)
-                            if not chunk:
-                                raise IOError('Stream ended during payload')
-                            jpg += chunk
-                            to_read -= len(chunk)
-                    else:
-                        # Fallback: read until JPEG EOI
-                        buf = b""
-                        while self._running:
-                            chunk = resp.read(4096)
-                            if not chunk:
-                                raise IOError('Stream ended during scan')
-                            buf += chunk
-                            start = buf.find(b"\xff\xd8")
-                            end = buf.find(b"\xff\xd9")
-                            if start != -1 and end != -1 and end > start:
-                                jpg = buf[start:end+2]
-                                # leave remainder in buf for next boundary seek by pushing back? Not possible with urllib.
-                                # We'll reset buffer next loop; boundary seek will resync.
-                                break
+                            rec.write(payload)
+                        except Exception as e:
+                            self.status.emit(self.camera_id, f"Recording error: {e}")
+                        m.stop("write", t)
 
-                    # Decode JPEG
+                    # Decode JPEG straight from the parser buffer (no intermediate bytes copy), reduced when the tile is small
                     try:
-                        arr = np.frombuffer(jpg, dtype=np.uint8)
-                        frame = cv2.imdecode(arr, cv2.IMREAD_COLOR)
+                        t = m.start()
+                        frame = decode_jpeg(payload, self._decode_target)
+                        m.stop("decode", t)
+                        t_capture = m.start()
                         if frame is not None:
+                            tracing.emitted(self.camera_id, frame)
                             self.frame_ready.emit(frame, self.camera_id)
                             if time.time() - last_status > 5:
                                 self.status.emit(self.camera_id, "HTTP MJPEG streaming")
@@ -134,6 +121,7 @@ class HttpMJPEGWorker(QThread):
             except Exception as e:
                 if self._running:
                     self.status.emit(self.camera_id, f"HTTP stream error: {e}; reconnecting...")
+                    self.metrics.count("reconnects")
                 time.sleep(reconnect_delay)
                 reconnect_delay = min(8.0, reconnect_delay * 2)
             finally:
@@ -142,3 +130,4 @@ class HttpMJPEGWorker(QThread):
                 except Exception:
                     pass
                 self.status.emit(self.camera_id, "HTTP stream closed")
+        self.stop_recording()
@@ -0,0 +1,159 @@
+import hashlib
+import http.client
+import threading
+from urllib.parse import urlsplit
+
+
+class HttpConnectionPool:
+    """
+    Small per-host pool of persistent HTTP/1.1 connections.
+    Connections are returned to the pool after a fully read, non-closing response and reused by the next request,
+    so snapshot polling pays TCP (and TLS) setup once instead of per frame.
+    Pollers register() their stream with its in-flight depth; a host keeps up to that many idle connections (at
+    least max_idle_per_host), so many cameras on one NVR don't close connections as they come back.
+    """
+
+    def __init__(self, max_idle_per_host: int = 4, user_agent: str = "Mozilla/5.0"):
+        self.max_idle_per_host = max_idle_per_host
+        self.user_agent = user_agent
+        self._idle: dict[tuple, list] = {}
+        self._demand: dict[tuple, int] = {}  # host key -> sum of registered in-flight depths
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(url: str):
+        parts = urlsplit(url)
+        scheme = (parts.scheme or "http").lower()
+        port = parts.port or (443 if scheme == "https" else 80)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        return (scheme, parts.hostname or "", port), path
+
+    def register(self, url: str, inflight: int = 1):
+        key, _path = self._key(url)
+        with self._lock:
+            self._demand[key] = self._demand.get(key, 0) + max(1, int(inflight))
+
+    def unregister(self, url: str, inflight: int = 1):
+        key, _path = self._key(url)
+        with self._lock:
+            left = self._demand.get(key, 0) - max(1, int(inflight))
+            if left > 0:
+                self._demand[key] = left
+            else:
+                self._demand.pop(key, None)
+            # trim connections nobody is going to ask for any more
+            idle = self._idle.get(key) or []
+            cap = max(self.max_idle_per_host, self._demand.get(key, 0))
+            extra, self._idle[key] = idle[cap:], idle[:cap]
+        for c in extra:
+            try:
+                c.close()
+            except Exception:
+                pass
+
+    def _acquire(self, key, timeout: float):
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                conn = idle.pop()
+                conn.timeout = timeout
+                if conn.sock is not None:
+                    conn.sock.settimeout(timeout)
+                return conn, True
+        scheme, host, port = key
+        cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        return cls(host, port, timeout=timeout), False
+
+    def _release(self, key, conn):
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < max(self.max_idle_per_host, self._demand.get(key, 0)):
+                idle.append(conn)
+                return
+        conn.close()
+
+    def get(self, url: str, headers: dict | None = None, timeout: float = 5.0):
+        """Return (status, headers, body). Retries once on a keep-alive connection the server already dropped."""
+        key, path = self._key(url)
+        hdrs = {"User-Agent": self.user_agent, "Connection": "keep-alive"}
+        if headers:
+            hdrs.update(headers)
+        for attempt in range(2):
+            conn, reused = self._acquire(key, timeout)
+            try:
+                conn.request("GET", path, headers=hdrs)
+                resp = conn.getresponse()
+                body = resp.read()
+            except (http.client.RemoteDisconnected, http.client.BadStatusLine, ConnectionError, BrokenPipeError):
+                conn.close()
+                if reused and attempt == 0:
+                    continue
+                raise
+            except Exception:
+                conn.close()
+                raise
+            if resp.will_close:
+                conn.close()
+            else:
+                self._release(key, conn)
+            if resp.status >= 400:
+                raise IOError(f"HTTP Error {resp.status}: {resp.reason}")
+            return resp.status, resp.headers, body
+        raise IOError("HTTP request failed")
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for c in conns:
+                try:
+                    c.close()
+                except Exception:
+                    pass
+
+
+class ConditionalFetch:
+    """
+    Tracks validators and a payload digest for a polled resource.
+    headers() yields If-None-Match / If-Modified-Since for the next request; changed() reports whether a reply
+    carries a new image (False for 304 Not Modified or a byte-identical body), so callers can skip decode entirely.
+    """
+
+    def __init__(self):
+        self.etag = None
+        self.last_modified = None
+        self.digest = None
+
+    def headers(self) -> dict:
+        h = {}
+        if self.etag:
+            h["If-None-Match"] = self.etag
+        if self.last_modified:
+            h["If-Modified-Since"] = self.last_modified
+        return h
+
+    def changed(self, status: int, headers, body: bytes) -> bool:
+        if status == 304:
+            return False
+        try:
+            self.etag = headers.get("ETag") or headers.get("etag")
+            self.last_modified = headers.get("Last-Modified") or headers.get("last-modified")
+        except Exception:
+            self.etag = self.last_modified = None
+        digest = hashlib.blake2b(body, digest_size=16).digest()
+        if digest == self.digest:
+            return False
+        self.digest = digest
+        return True
+
+
+_pool: HttpConnectionPool | None = None
+
+
+def connection_pool() -> HttpConnectionPool:
+    global _pool
+    if _pool is None:
+        _pool = HttpConnectionPool()
+    return _pool
@@ -1,46 +1,165 @@
 from PySide6.QtCore import QThread, Signal
 import time
-from urllib.request import urlopen, Request
-import cv2
-import numpy as np
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from .http_pool import connection_pool, ConditionalFetch
+from .jpeg import decode_jpeg
+from .metrics import metrics_for
+from . import tracing
+from .mjpeg_recorder import MjpegRecorder
 
 
 class HttpSnapshotWorker(QThread):
     frame_ready = Signal(object, int)  # (frame ndarray, camera_id)
     status = Signal(int, str)
+    alive = Signal(int)  # camera_id; source answered but the image is unchanged
 
-    def __init__(self, camera_id: int, url: str, fps: float = 6.0):
+    def __init__(self, camera_id: int, url: str, fps: float = 6.0, inflight: int = 1, recordings_dir: Path | None = None):
         super().__init__()
         self.camera_id = camera_id
         self.url = url
         self._running = False
         self._interval = 1.0 / max(0.5, float(fps))
+        # >1 keeps several requests outstanding so high-RTT cameras still reach the target fps
+        self._inflight = max(1, int(inflight))
+        self._last_status = 0.0
+        self._cond = ConditionalFetch()
+        self._last_alive = 0.0
+        self._decode_target = None  # (w, h) the consumer displays at; None = full resolution
+        self.recordings_dir = recordings_dir or Path("recordings")
+        self._recorder = None
+        self._recording = False
+        self.metrics = metrics_for(camera_id)
 
     def stop(self):
         self._running = False
 
+    def set_decode_target(self, size):
+        self._decode_target = tuple(size) if size else None
+
+    def start_recording(self, name_prefix: str = "rec", codec: str = "avi", out_dir: Path | None = None):
+        # Pass-through: original JPEG payloads go straight into an MJPG AVI (codec preference does not apply)
+        if self._recorder is not None:
+            return
+        target_dir = out_dir if out_dir is not None else self.recordings_dir
+        self._recorder = MjpegRecorder(target_dir, name_prefix, fps=1.0 / self._interval, metrics=self.metrics)
+        self._recording = True
+        self.status.emit(self.camera_id, f"Recording: {self._recorder.path}")
+
+    def stop_recording(self):
+        rec, self._recorder = self._recorder, None
+        if rec is None:
+            return
+        self._recording = False
+        rec.close()
+        self.status.emit(self.camera_id, "Recording stopped")
+
+    def _fetch(self):
+        t = self.metrics.start()
+        reply = connection_pool().get(self.url, headers=self._cond.headers(), timeout=5)
+        self.metrics.captured()
+        self.metrics.stop("capture", t)
+        return reply
+
+    def _handle(self, reply):
+        status, headers, data = reply
+        m = self.metrics
+        m.count("bytes", len(data or b""))
+        if not self._cond.changed(status, headers, data):
+            # Static scene: skip decode/motion/repaint but keep the tile's health check fed
+            now = time.time()
+            if now - self._last_alive >= 1.0:
+                self._last_alive = now
+                self.alive.emit(self.camera_id)
+            return
+        m.count("frames")
+        rec = self._recorder
+        if rec is not None:
+            t = m.start()
+            try:
+                rec.write(data)
+            except Exception as e:
+                self.status.emit(self.camera_id, f"Recording error: {e}")
+            m.stop("write", t)
+        t = m.start()
+        frame = decode_jpeg(data, self._decode_target)
+        m.stop("decode", t)
+        if frame is not None:
+            tracing.emitted(self.camera_id, frame)
+            self.frame_ready.emit(frame, self.camera_id)
+            if time.time() - self._last_status > 5:
+                self.status.emit(self.camera_id, "HTTP snapshot streaming")
+                self._last_status = time.time()
+        else:
+            self.status.emit(self.camera_id, "Snapshot decode failed")
+
     def run(self):
         self._running = True
-        last_status = 0.0
+        self._last_status = 0.0
+        connection_pool().register(self.url, self._inflight)
+        try:
+            self._run()
+        finally:
+            connection_pool().unregister(self.url, self._inflight)
+
+    def _run(self):
+        if self._inflight > 1:
+            self._run_pipelined()
+            self.stop_recording()
+            return
         while self._running:
             t0 = time.time()
             try:
-                req = Request(self.url, headers={'User-Agent': 'Mozilla/5.0'})
-                with urlopen(req, timeout=5) as resp:
-                    data = resp.read()
-                arr = np.frombuffer(data, dtype=np.uint8)
-                frame = cv2.imdecode(arr, cv2.IMREAD_COLOR)
-                if frame is not None:
-                    self.frame_ready.emit(frame, self.camera_id)
-                    if time.time() - last_status > 5:
-                        self.status.emit(self.camera_id, "HTTP snapshot streaming")
-                        last_status = time.time()
-                else:
-                    self.status.emit(self.camera_id, "Snapshot decode failed")
+                self._handle(self._fetch())
             except Exception as e:
                 self.status.emit(self.camera_id, f"HTTP snapshot error: {e}")
+                self.metrics.count("errors")
                 time.sleep(0.5)
             # pacing
             dt = time.time() - t0
             if dt < self._interval:
                 time.sleep(self._interval - dt)
+        self.stop_recording()
+
+    def _run_pipelined(self):
+        # Issue one request per interval while fewer than N are outstanding; emit in request order, drop stale replies
+        pending = {}
+        seq = 0
+        last_emitted = -1
+        next_issue = time.time()
+        pool = ThreadPoolExecutor(max_workers=self._inflight)
+        try:
+            while self._running:
+                now = time.time()
+                if len(pending) < self._inflight and now >= next_issue:
+                    pending[pool.submit(self._fetch)] = seq
+                    seq += 1
+                    next_issue = max(next_issue + self._interval, now)
+                    continue
+                timeout = max(0.0, next_issue - now) if len(pending) < self._inflight else 0.5
+                if not pending:
+                    time.sleep(timeout)
+                    continue
+                done, _ = wait(list(pending), timeout=timeout, return_when=FIRST_COMPLETED)
+                for fut in sorted(done, key=lambda f: pending[f]):
+                    n = pending.pop(fut)
+                    try:
+                        reply = fut.result()
+                    except Exception as e:
+                        self.status.emit(self.camera_id, f"HTTP snapshot error: {e}")
+                        self.metrics.count("errors")
+                        next_issue = max(next_issue, time.time() + 0.5)
+                        continue
+                    if n <= last_emitted:
+                        # a newer reply already went out
+                        self.metrics.count("drops")
+                        continue
+                    last_emitted = n
+                    try:
+                        self._handle(reply)
+                    except Exception as e:
+                        self.status.emit(self.camera_id, f"HTTP snapshot error: {e}")
+        finally:
+            # don't block stop() on requests still waiting for their timeout
+            pool.shutdown(wait=False, cancel_futures=True)
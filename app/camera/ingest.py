@@ -0,0 +1,401 @@
+from PySide6.QtCore import QObject, QThread, Signal
+import asyncio
+import os
+import ssl
+import threading
+import time
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from .http_pool import ConditionalFetch
+from .jpeg import decode_jpeg
+from .metrics import metrics_for
+from . import tracing
+from .mjpeg_parser import MJPEGStreamParser
+from .mjpeg_recorder import MjpegRecorder
+
+
+class IngestStream(QObject):
+    """
+    Handle for one HTTP camera multiplexed on the shared AsyncIngestService loop.
+    Exposes the same surface as the QThread workers (frame_ready/status, start/stop/isRunning/wait)
+    so CameraTile can use it interchangeably.
+    """
+
+    frame_ready = Signal(object, int)  # (frame ndarray, camera_id)
+    status = Signal(int, str)
+    alive = Signal(int)  # camera_id; snapshot answered but unchanged
+
+    def __init__(self, service: "AsyncIngestService", camera_id: int, url: str, kind: str = "mjpeg", fps: float = 6.0,
+                 recordings_dir: Path | None = None):
+        super().__init__()
+        self.service = service
+        self.camera_id = camera_id
+        self.url = url
+        self.kind = kind  # "mjpeg" | "snapshot"
+        self._interval = 1.0 / max(0.5, float(fps))
+        self._future = None
+        self._done = threading.Event()
+        self._done.set()
+        # decode scheduling (touched only on the loop thread)
+        self._decoding = False
+        self._pending = None
+        self._decode_t = 0.0
+        self._decode_fid = 0
+        self.metrics = metrics_for(camera_id)
+        self._cond = ConditionalFetch()
+        self._last_alive = 0.0
+        self._decode_target = None  # (w, h) the consumer displays at; None = full resolution
+        self.recordings_dir = recordings_dir or Path("recordings")
+        self._recorder = None
+        self._recording = False
+
+    def set_decode_target(self, size):
+        self._decode_target = tuple(size) if size else None
+
+    def start_recording(self, name_prefix: str = "rec", codec: str = "avi", out_dir: Path | None = None):
+        # Pass-through: original JPEG payloads go straight into an MJPG AVI (codec preference does not apply)
+        if self._recorder is not None:
+            return
+        target_dir = out_dir if out_dir is not None else self.recordings_dir
+        self._recorder = MjpegRecorder(target_dir, name_prefix, fps=(1.0 / self._interval) if self.kind == "snapshot" else None, metrics=self.metrics)
+        self._recording = True
+        self.status.emit(self.camera_id, f"Recording: {self._recorder.path}")
+
+    def stop_recording(self):
+        rec, self._recorder = self._recorder, None
+        if rec is None:
+            return
+        self._recording = False
+        rec.close()
+        self.status.emit(self.camera_id, "Recording stopped")
+
+    def start(self):
+        if self.isRunning():
+            return
+        self._done.clear()
+        self._future = self.service.attach(self)
+
+    def stop(self):
+        fut = self._future
+        if fut is not None:
+            fut.cancel()
+
+    def isRunning(self) -> bool:
+        return not self._done.is_set()
+
+    def wait(self, msecs: int = -1) -> bool:
+        return self._done.wait(None if msecs is None or msecs < 0 else msecs / 1000.0)
+
+
+class AsyncIngestService(QThread):
+    """
+    Runs every HTTP MJPEG/snapshot camera on one asyncio event loop.
+    Network I/O and multipart parsing stay on the loop; JPEG decode goes to a bounded executor.
+    At most one decode per camera is in flight; newer payloads replace an undecoded pending one.
+    """
+
+    status = Signal(str)
+
+    def __init__(self, decode_workers: int | None = None):
+        super().__init__()
+        n = decode_workers or min(4, max(1, (os.cpu_count() or 2) - 1))
+        self._executor = ThreadPoolExecutor(max_workers=n, thread_name_prefix="jpeg-decode")
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._ready = threading.Event()
+        self._ssl = None
+
+    def run(self):
+        tracing.name_thread("HTTP ingest loop")
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._loop = loop
+        self._ready.set()
+        try:
+            loop.run_forever()
+        finally:
+            try:
+                pending = asyncio.all_tasks(loop)
+                for t in pending:
+                    t.cancel()
+                if pending:
+                    loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            except Exception:
+                pass
+            loop.close()
+            self._loop = None
+            self._ready.clear()
+
+    def ensure_started(self):
+        if not self.isRunning():
+            self.start()
+        self._ready.wait(5.0)
+
+    def shutdown(self):
+        loop = self._loop
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+        self.wait(2000)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def open_stream(self, camera_id: int, url: str, kind: str = "mjpeg", fps: float = 6.0,
+                    recordings_dir: Path | None = None) -> IngestStream:
+        return IngestStream(self, camera_id, url, kind, fps, recordings_dir)
+
+    def attach(self, stream: IngestStream):
+        self.ensure_started()
+        coro = self._run_mjpeg(stream) if stream.kind == "mjpeg" else self._run_snapshot(stream)
+        return asyncio.run_coroutine_threadsafe(self._guard(stream, coro), self._loop)
+
+    async def _guard(self, stream: IngestStream, coro):
+        try:
+            await coro
+        except asyncio.CancelledError:
+            pass
+        finally:
+            stream._pending = None
+            stream.stop_recording()
+            stream._done.set()
+
+    # --- payload handling ---
+    def _ingest(self, stream: IngestStream, data: bytes):
+        # Every payload is recorded as-is; decode may still coalesce to the newest one
+        m = stream.metrics
+        m.captured()
+        m.count("frames")
+        m.count("bytes", len(data))
+        rec = stream._recorder
+        if rec is not None:
+            t = m.start()
+            try:
+                rec.write(data)
+            except Exception as e:
+                stream.status.emit(stream.camera_id, f"Recording error: {e}")
+            m.stop("write", t)
+        self._submit(stream, data)
+
+    def _submit(self, stream: IngestStream, data: bytes):
+        if stream._decoding:
+            if stream._pending is not None:
+                # coalesced: the older undecoded payload is dropped
+                stream.metrics.count("drops")
+            stream._pending = data
+            return
+        stream._decoding = True
+        stream._decode_t = stream.metrics.start()  # includes executor queueing
+        stream._decode_fid = tracing.current(stream.camera_id) if tracing.active else 0
+        fut = self._loop.run_in_executor(self._executor, decode_jpeg, data, stream._decode_target)
+        fut.add_done_callback(lambda f: self._on_decoded(stream, f))
+
+    def _on_decoded(self, stream: IngestStream, fut):
+        stream._decoding = False
+        tracing.resume(stream.camera_id, stream._decode_fid)
+        stream.metrics.stop("decode", stream._decode_t)
+        if stream._done.is_set():
+            return
+        try:
+            frame = fut.result()
+        except Exception as e:
+            frame = None
+            stream.status.emit(stream.camera_id, f"Decode error: {e}")
+        if frame is not None:
+            try:
+                tracing.emitted(stream.camera_id, frame)
+                stream.frame_ready.emit(frame, stream.camera_id)
+            except Exception:
+                pass
+        nxt, stream._pending = stream._pending, None
+        if nxt is not None:
+            self._submit(stream, nxt)
+
+    # --- minimal HTTP/1.1 client ---
+    async def _connect(self, url: str, timeout: float):
+        parts = urlsplit(url)
+        secure = parts.scheme.lower() == "https"
+        port = parts.port or (443 if secure else 80)
+        if secure and self._ssl is None:
+            self._ssl = ssl.create_default_context()
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(parts.hostname, port, ssl=self._ssl if secure else None), timeout
+        )
+        return reader, writer
+
+    async def _request(self, reader, writer, url: str, timeout: float, extra_headers: dict | None = None):
+        parts = urlsplit(url)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        host = parts.hostname or ""
+        if parts.port:
+            host += f":{parts.port}"
+        req = (
+            f"GET {path} HTTP/1.1\r\n"
+            f"Host: {host}\r\n"
+            "User-Agent: Mozilla/5.0\r\n"
+            "Connection: keep-alive\r\n"
+            + "".join(f"{k}: {v}\r\n" for k, v in (extra_headers or {}).items())
+            + "\r\n"
+        )
+        writer.write(req.encode("latin-1"))
+        await writer.drain()
+        head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout)
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            code = int(lines[0].split(" ", 2)[1])
+        except Exception:
+            raise IOError(f"Bad HTTP status line: {lines[0]!r}")
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                k, v = line.split(":", 1)
+                headers[k.strip().lower()] = v.strip()
+        if code >= 400:
+            raise IOError(f"HTTP Error {code}")
+        return code, headers
+
+    async def _iter_body(self, reader, headers: dict, timeout: float, code: int = 200):
+        if code in (204, 304):
+            return
+        if "chunked" in headers.get("transfer-encoding", "").lower():
+            while True:
+                size_line = await asyncio.wait_for(reader.readline(), timeout)
+                size = int(size_line.split(b";", 1)[0].strip() or b"0", 16)
+                if size == 0:
+                    await asyncio.wait_for(reader.readline(), timeout)
+                    return
+                yield await asyncio.wait_for(reader.readexactly(size), timeout)
+                await asyncio.wait_for(reader.readexactly(2), timeout)
+        elif "content-length" in headers:
+            yield await asyncio.wait_for(reader.readexactly(int(headers["content-length"])), timeout)
+        else:
+            while True:
+                chunk = await asyncio.wait_for(reader.read(65536), timeout)
+                if not chunk:
+                    return
+                yield chunk
+
+    @staticmethod
+    async def _close(writer):
+        if writer is None:
+            return
+        try:
+            writer.close()
+            await asyncio.wait_for(writer.wait_closed(), 1.0)
+        except Exception:
+            pass
+
+    # --- per-camera tasks ---
+    async def _run_mjpeg(self, stream: IngestStream):
+        reconnect_delay = 1.0
+        while True:
+            stream.status.emit(stream.camera_id, "Opening HTTP MJPEG stream...")
+            writer = None
+            try:
+                reader, writer = await self._connect(stream.url, 10)
+                _, headers = await self._request(reader, writer, stream.url, 10)
+            except asyncio.CancelledError:
+                await self._close(writer)
+                raise
+            except Exception as e:
+                await self._close(writer)
+                stream.status.emit(stream.camera_id, f"HTTP open failed: {e}")
+                stream.metrics.count("reconnects")
+                await asyncio.sleep(reconnect_delay)
+                reconnect_delay = min(8.0, reconnect_delay * 2)
+                continue
+
+            ct = headers.get("content-type", "")
+            boundary = None
+            if "multipart" in ct and "boundary=" in ct:
+                b = ct.split("boundary=")[-1].strip().strip('"')
+                boundary = (b if b.startswith("--") else "--" + b).encode("utf-8")
+            parser = MJPEGStreamParser(boundary)
+            reconnect_delay = 1.0
+            last_status = time.time()
+            try:
+                async for chunk in self._iter_body(reader, headers, 10):
+                    parser.feed(chunk)
+                    while True:
+                        payload = parser.next_part()
+                        if payload is None:
+                            break
+                        # parser buffer is reused on the next feed; hand the executor its own copy
+                        self._ingest(stream, bytes(payload))
+                    if time.time() - last_status > 5:
+                        stream.status.emit(stream.camera_id, "HTTP MJPEG streaming")
+                        last_status = time.time()
+                raise IOError("Stream ended")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                stream.status.emit(stream.camera_id, f"HTTP stream error: {e}; reconnecting...")
+                stream.metrics.count("reconnects")
+                await asyncio.sleep(reconnect_delay)
+                reconnect_delay = min(8.0, reconnect_delay * 2)
+            finally:
+                await self._close(writer)
+                stream.status.emit(stream.camera_id, "HTTP stream closed")
+
+    async def _run_snapshot(self, stream: IngestStream):
+        reader = writer = None
+        last_status = 0.0
+        try:
+            while True:
+                t0 = time.time()
+                try:
+                    if writer is None:
+                        reader, writer = await self._connect(stream.url, 5)
+                    code, headers = await self._request(reader, writer, stream.url, 5, stream._cond.headers())
+                    data = b"".join([c async for c in self._iter_body(reader, headers, 5, code)])
+                    # keep the connection only when the body was length-delimited and server allows it
+                    if headers.get("connection", "").lower() == "close" or not (
+                        code in (204, 304) or "content-length" in headers
+                        or "chunked" in headers.get("transfer-encoding", "").lower()
+                    ):
+                        await self._close(writer)
+                        reader = writer = None
+                    if not stream._cond.changed(code, headers, data):
+                        # unchanged image: no decode, just liveness for the tile health check
+                        if time.time() - stream._last_alive >= 1.0:
+                            stream._last_alive = time.time()
+                            stream.alive.emit(stream.camera_id)
+                    elif data:
+                        self._ingest(stream, data)
+                        if time.time() - last_status > 5:
+                            stream.status.emit(stream.camera_id, "HTTP snapshot streaming")
+                            last_status = time.time()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    await self._close(writer)
+                    reader = writer = None
+                    stream.status.emit(stream.camera_id, f"HTTP snapshot error: {e}")
+                    stream.metrics.count("errors")
+                    await asyncio.sleep(0.5)
+                # pacing
+                dt = time.time() - t0
+                if dt < stream._interval:
+                    await asyncio.sleep(stream._interval - dt)
+        finally:
+            await self._close(writer)
+
+
+_service: AsyncIngestService | None = None
+
+
+def ingest_service() -> AsyncIngestService:
+    global _service
+    if _service is None:
+        _service = AsyncIngestService()
+    return _service
+
+
+def shutdown_ingest_service():
+    global _service
+    if _service is not None:
+        try:
+            _service.shutdown()
+        except Exception:
+            pass
+        _service = None
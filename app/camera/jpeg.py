@@ -0,0 +1,65 @@
+import cv2
+import numpy as np
+
+# libjpeg can scale by 1/2, 1/4, 1/8 during IDCT; largest reduction first
+_REDUCED = (
+    (8, cv2.IMREAD_REDUCED_COLOR_8),
+    (4, cv2.IMREAD_REDUCED_COLOR_4),
+    (2, cv2.IMREAD_REDUCED_COLOR_2),
+)
+# SOF markers carrying frame dimensions (excludes DHT 0xC4, JPG 0xC8, DAC 0xCC)
+_SOF = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+
+def jpeg_size(buf) -> tuple[int, int] | None:
+    """Return (width, height) from the JPEG SOF header without decoding, or None if not found."""
+    mv = memoryview(buf)
+    n = len(mv)
+    if n < 4 or mv[0] != 0xFF or mv[1] != 0xD8:
+        return None
+    i = 2
+    while i + 4 <= n:
+        if mv[i] != 0xFF:
+            i += 1
+            continue
+        marker = mv[i + 1]
+        if marker == 0xFF:
+            i += 1
+            continue
+        if marker == 0xD8 or 0xD0 <= marker <= 0xD7 or marker == 0x01:
+            i += 2
+            continue
+        seg_len = (mv[i + 2] << 8) | mv[i + 3]
+        if marker in _SOF:
+            if i + 9 > n:
+                return None
+            h = (mv[i + 5] << 8) | mv[i + 6]
+            w = (mv[i + 7] << 8) | mv[i + 8]
+            return (w, h) if w and h else None
+        if marker in (0xD9, 0xDA):  # EOI / start of scan before any SOF
+            return None
+        i += 2 + seg_len
+    return None
+
+
+def decode_flag(src_size, target_size) -> int:
+    """Pick the strongest IMREAD_REDUCED_COLOR_* that still yields at least target_size pixels."""
+    if not src_size or not target_size:
+        return cv2.IMREAD_COLOR
+    sw, sh = src_size
+    tw, th = target_size
+    if tw <= 0 or th <= 0:
+        return cv2.IMREAD_COLOR
+    for factor, flag in _REDUCED:
+        if sw // factor >= tw and sh // factor >= th:
+            return flag
+    return cv2.IMREAD_COLOR
+
+
+def decode_jpeg(payload, target_size=None):
+    """
+    Decode a JPEG payload (bytes/bytearray/memoryview) without copying it.
+    With target_size=(w, h) the image is decoded at a reduced scale when the consumer only needs that much.
+    """
+    flag = decode_flag(jpeg_size(payload), target_size) if target_size else cv2.IMREAD_COLOR
+    return cv2.imdecode(np.frombuffer(payload, dtype=np.uint8), flag)
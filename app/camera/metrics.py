@@ -0,0 +1,224 @@
+import os
+import threading
+import time
+
+from . import tracing
+
+# Hot-path stages, in pipeline order (diagnostics columns follow this order)
+STAGES = ("capture", "decode", "write", "motion", "detection", "conversion", "paint")
+
+_enabled = False  # set from AppConfig.metrics at startup, toggled from the diagnostics panel
+_registry = {}
+_registry_lock = threading.Lock()
+_gauges = {}  # name -> (help, fn() -> number); process-wide values such as the alert queue depth
+
+
+class CameraMetrics:
+    """
+    Per-camera stage timers and counters. Call sites bracket a stage with `t = m.start()` / `m.stop("decode", t)`
+    and bump counters with `m.count("frames")`; while disabled start() returns 0 and everything else returns
+    immediately, so instrumented code pays a couple of no-op calls per frame.
+    Values are aggregated over one-second windows; window() returns the last completed one, totals() the running
+    sums since the last reset (for scrapers that compute their own rates).
+    """
+
+    def __init__(self, camera_id: int, enabled: bool = False):
+        self.camera_id = camera_id
+        self.on = enabled
+        self._lock = threading.Lock()
+        self._t0 = time.perf_counter()
+        self._stages = {}  # stage -> [count, total secs, max secs]
+        self._counters = {}  # name -> amount
+        self._tot_stages = {}  # stage -> [count, total secs]; not cleared by the window roll
+        self._tot_counters = {}
+        self._last = {"secs": 0.0, "stages": {}, "counters": {}}
+        self.last_capture = 0.0  # perf_counter() of the newest captured frame (for capture->paint latency)
+
+    def start(self) -> float:
+        return time.perf_counter() if self.on or tracing.active else 0.0
+
+    def stop(self, stage: str, t0: float):
+        if not t0:
+            return
+        now = time.perf_counter()
+        if tracing.active:
+            tracing.span(stage, t0, now, self.camera_id)
+        self.observe(stage, now - t0, now)
+
+    def observe(self, stage: str, secs: float, now: float | None = None):
+        if not self.on:
+            return
+        now = time.perf_counter() if now is None else now
+        with self._lock:
+            self._roll(now)
+            s = self._stages.get(stage)
+            if s is None:
+                self._stages[stage] = [1, secs, secs]
+            else:
+                s[0] += 1
+                s[1] += secs
+                if secs > s[2]:
+                    s[2] = secs
+            t = self._tot_stages.get(stage)
+            if t is None:
+                self._tot_stages[stage] = [1, secs]
+            else:
+                t[0] += 1
+                t[1] += secs
+
+    def count(self, name: str, n: int = 1):
+        if not self.on:
+            return
+        with self._lock:
+            self._roll(time.perf_counter())
+            self._counters[name] = self._counters.get(name, 0) + n
+            self._tot_counters[name] = self._tot_counters.get(name, 0) + n
+
+    def captured(self):
+        # newest frame's capture time; the paint stage turns it into end-to-end latency
+        if tracing.active:
+            tracing.begin(self.camera_id)
+        if self.on:
+            self.last_capture = time.perf_counter()
+
+    def _roll(self, now: float):
+        dt = now - self._t0
+        if dt < 1.0:
+            return
+        self._last = {
+            "secs": dt,
+            "stages": {
+                k: {"count": c, "rate": c / dt, "avg_ms": 1000.0 * t / c, "max_ms": 1000.0 * m}
+                for k, (c, t, m) in self._stages.items()
+            },
+            "counters": {k: v / dt for k, v in self._counters.items()},  # per second
+        }
+        self._t0 = now
+        self._stages = {}
+        self._counters = {}
+
+    def window(self) -> dict:
+        """Last completed window: {"secs", "stages": {stage: count/rate/avg_ms/max_ms}, "counters": {name: per sec}}."""
+        with self._lock:
+            now = time.perf_counter()
+            if now - self._t0 >= 2.0:
+                # camera went quiet: close the window so readers see the drop instead of the last busy second
+                self._roll(now)
+            return self._last
+
+    def totals(self) -> dict:
+        """{"stages": {stage: (count, total secs)}, "counters": {name: amount}} since the last reset."""
+        with self._lock:
+            return {
+                "stages": {k: tuple(v) for k, v in self._tot_stages.items()},
+                "counters": dict(self._tot_counters),
+            }
+
+    def reset(self):
+        with self._lock:
+            self._t0 = time.perf_counter()
+            self._stages = {}
+            self._counters = {}
+            self._tot_stages = {}
+            self._tot_counters = {}
+            self._last = {"secs": 0.0, "stages": {}, "counters": {}}
+            self.last_capture = 0.0
+
+
+class FileGrowth:
+    """
+    Turns a growing file into a byte counter for writers that don't report what they wrote (cv2.VideoWriter,
+    GStreamer filesink). poll() is called from the write loop and stats the file at most once a second; buffered
+    writers show up in steps, and the tail is counted when the file is untracked. Only growth seen while
+    instrumentation is on counts: the size is re-seeded on the first poll after it was off.
+    """
+
+    def __init__(self, metrics: CameraMetrics, name: str = "rec_bytes"):
+        self.metrics = metrics
+        self.name = name
+        self.path = None
+        self._size = 0
+        self._next = 0.0
+        self._seeded = False  # _size reflects the file as of a poll made with instrumentation on
+
+    def track(self, path):
+        # account for the tail of the previous file before switching
+        if self.path is not None:
+            self._next = 0.0
+            self.poll()
+        self.path = str(path) if path else None
+        self._size = 0
+        self._next = 0.0
+        # a new recording starts empty; counting from 0 is right as long as instrumentation is on now
+        self._seeded = self.metrics.on
+
+    def poll(self, now: float | None = None):
+        path = self.path
+        if path is None:
+            return
+        if not self.metrics.on:
+            self._seeded = False
+            return
+        now = time.perf_counter() if now is None else now
+        if now < self._next:
+            return
+        self._next = now + 1.0
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return
+        if not self._seeded:
+            # instrumentation was switched on mid-recording: what was written before isn't ours to count
+            self._seeded = True
+            self._size = size
+            return
+        if size > self._size:
+            self.metrics.count(self.name, size - self._size)
+            self._size = size
+
+
+def metrics_for(camera_id: int) -> CameraMetrics:
+    with _registry_lock:
+        m = _registry.get(camera_id)
+        if m is None:
+            m = _registry[camera_id] = CameraMetrics(camera_id, _enabled)
+        return m
+
+
+def drop(camera_id: int):
+    with _registry_lock:
+        _registry.pop(camera_id, None)
+
+
+def all_metrics() -> dict:
+    with _registry_lock:
+        return dict(_registry)
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def set_enabled(flag: bool):
+    global _enabled
+    _enabled = bool(flag)
+    with _registry_lock:
+        for m in _registry.values():
+            m.on = _enabled
+            m.reset()
+
+
+def register_gauge(name: str, fn, help: str = ""):
+    """Export a process-wide value (e.g. a queue depth) next to the per-camera metrics; fn is called per scrape."""
+    with _registry_lock:
+        _gauges[name] = (help, fn)
+
+
+def unregister_gauge(name: str):
+    with _registry_lock:
+        _gauges.pop(name, None)
+
+
+def gauges() -> dict:
+    with _registry_lock:
+        return dict(_gauges)
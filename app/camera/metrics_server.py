@@ -0,0 +1,121 @@
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from . import metrics
+
+# counter name (CameraMetrics.count) -> (exported name, help)
+_COUNTERS = {
+    "frames": ("cctv_frames_total", "Frames received from the camera."),
+    "painted": ("cctv_painted_frames_total", "Frames painted in the camera tile."),
+    "drops": ("cctv_dropped_frames_total", "Frames dropped because downstream was still busy."),
+    "reconnects": ("cctv_reconnects_total", "Times the stream was lost or failed to open and a reconnect was scheduled."),
+    "errors": ("cctv_request_errors_total", "Failed snapshot requests (HTTP snapshot cameras)."),
+    "bytes": ("cctv_received_bytes_total", "Compressed bytes received (HTTP cameras)."),
+    "rec_bytes": ("cctv_recorded_bytes_total", "Bytes written to recordings."),
+}
+
+# windowed rates (last completed second) exported as gauges
+_RATES = {
+    "frames": ("cctv_ingest_fps", "Frames received per second over the last second."),
+    "painted": ("cctv_display_fps", "Frames painted per second over the last second."),
+    "drops": ("cctv_drops_per_second", "Frames dropped per second over the last second."),
+    "rec_bytes": ("cctv_record_bytes_per_second", "Recording bytes written per second over the last second."),
+}
+
+
+def _num(v) -> str:
+    if isinstance(v, int):
+        return str(v)
+    return repr(float(v))
+
+
+def render() -> str:
+    """Prometheus text exposition (format 0.0.4) of every registered camera plus the process-wide gauges."""
+    out = []
+    cams = sorted(metrics.all_metrics().items())
+    snap = [(str(cid), m.totals(), m.window()) for cid, m in cams]
+
+    def family(name, kind, help, samples):
+        if not samples:
+            return
+        out.append(f"# HELP {name} {help}")
+        out.append(f"# TYPE {name} {kind}")
+        for labels, value in samples:
+            lab = ",".join(f'{k}="{v}"' for k, v in labels)
+            out.append(f"{name}{{{lab}}} {_num(value)}" if lab else f"{name} {_num(value)}")
+
+    for key, (name, help) in _COUNTERS.items():
+        family(name, "counter", help, [((("camera", cid),), tot["counters"][key]) for cid, tot, _ in snap if key in tot["counters"]])
+    for key, (name, help) in _RATES.items():
+        family(name, "gauge", help, [((("camera", cid),), win["counters"].get(key, 0.0)) for cid, tot, win in snap if key in tot["counters"]])
+
+    stage_sum, stage_count, stage_max = [], [], []
+    for cid, tot, win in snap:
+        for stage, (count, secs) in sorted(tot["stages"].items()):
+            labels = (("camera", cid), ("stage", stage))
+            stage_sum.append((labels, secs))
+            stage_count.append((labels, count))
+            w = win["stages"].get(stage)
+            stage_max.append((labels, w["max_ms"] / 1000.0 if w else 0.0))
+    if stage_sum:
+        # summary without quantiles: rate(_sum) / rate(_count) is the mean stage time (decode, detection, latency, ...)
+        out.append("# HELP cctv_stage_seconds Time spent per frame in each pipeline stage.")
+        out.append("# TYPE cctv_stage_seconds summary")
+        for (labels, secs), (_, count) in zip(stage_sum, stage_count):
+            lab = ",".join(f'{k}="{v}"' for k, v in labels)
+            out.append(f"cctv_stage_seconds_sum{{{lab}}} {_num(secs)}")
+            out.append(f"cctv_stage_seconds_count{{{lab}}} {_num(count)}")
+    family("cctv_stage_max_seconds", "gauge", "Slowest frame per stage over the last second.", stage_max)
+
+    for name, (help, fn) in sorted(metrics.gauges().items()):
+        try:
+            value = fn()
+        except Exception:
+            continue
+        if value is not None:
+            family(name, "gauge", help or name, [((), value)])
+    out.append("")
+    return "\n".join(out)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "cctv-metrics/1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        try:
+            data = render().encode("utf-8")
+        except Exception as e:
+            self.send_error(500, str(e))
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class MetricsServer(ThreadingHTTPServer):
+    """
+    Scrape endpoint for the pipeline metrics: GET /metrics on 127.0.0.1:<CCTV_METRICS_PORT>.
+    Values come from app.camera.metrics, so instrumentation has to be enabled for cameras to show up.
+    """
+    daemon_threads = True
+
+    def __init__(self, port: int, host: str = "127.0.0.1"):
+        super().__init__((host, port), _Handler)
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, name="cctv-metrics-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
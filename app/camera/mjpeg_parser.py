@@ -0,0 +1,135 @@
+class MJPEGStreamParser:
+    """
+    Incremental multipart/x-mixed-replace parser for MJPEG streams.
+    - Bytes are appended into one reusable bytearray; leftover bytes after a part stay buffered for the next one.
+    - Boundary, header and SOI/EOI searches resume where the previous scan stopped (no rescans of old data).
+    - next_part() returns a memoryview into the buffer; it stays valid until the next feed()/fill().
+    """
+
+    SOI = b"\xff\xd8"
+    EOI = b"\xff\xd9"
+
+    def __init__(self, boundary: bytes | None = None, capacity: int = 256 * 1024, max_part: int = 16 * 1024 * 1024):
+        self.boundary = boundary or None
+        self.max_part = int(max_part)
+        self._buf = bytearray(max(4096, int(capacity)))
+        self._view = memoryview(self._buf)
+        self._start = 0  # first unconsumed byte
+        self._end = 0  # end of valid data
+        self._scan = 0  # resume position for the current search
+        self._clen = None
+        self._state = "boundary" if self.boundary else "soi"
+
+    def reset(self):
+        self._start = self._end = self._scan = 0
+        self._clen = None
+        self._state = "boundary" if self.boundary else "soi"
+
+    def buffered(self) -> int:
+        return self._end - self._start
+
+    def fill(self, reader, size: int = 65536) -> int:
+        # Prefer read1() so we never block waiting for a full chunk on a live stream
+        read = getattr(reader, "read1", None) or reader.read
+        chunk = read(size)
+        if not chunk:
+            return 0
+        self.feed(chunk)
+        return len(chunk)
+
+    def feed(self, data):
+        n = len(data)
+        if n == 0:
+            return
+        self._reserve(n)
+        self._view[self._end:self._end + n] = data
+        self._end += n
+
+    def _reserve(self, n: int):
+        if self._start == self._end:
+            self._start = self._end = self._scan = 0
+        if self._end + n <= len(self._buf):
+            return
+        live = self._end - self._start
+        if live + n > self.max_part:
+            raise IOError(f"MJPEG part exceeds {self.max_part} bytes")
+        shift = self._start
+        if shift > 0 and live + n <= len(self._buf):
+            # Slide pending bytes to the front (memmove, no reallocation)
+            self._view[0:live] = self._view[shift:self._end]
+        else:
+            # Grow; payload views handed out earlier keep the old buffer alive
+            new_buf = bytearray(max(len(self._buf) * 2, live + n))
+            new_buf[0:live] = self._view[shift:self._end]
+            self._buf = new_buf
+            self._view = memoryview(new_buf)
+        self._start = 0
+        self._end = live
+        self._scan = max(0, self._scan - shift)
+
+    def next_part(self) -> memoryview | None:
+        buf = self._buf
+        while True:
+            if self._state == "boundary":
+                b = self.boundary
+                i = buf.find(b, self._scan, self._end)
+                if i == -1:
+                    # Drop garbage but keep a possible partial boundary at the tail
+                    self._start = self._scan = max(self._start, self._end - len(b) + 1)
+                    return None
+                j = buf.find(b"\n", i + len(b), self._end)
+                if j == -1:
+                    self._start = self._scan = i
+                    return None
+                self._start = self._scan = j + 1
+                self._state = "headers"
+            elif self._state == "headers":
+                if self._end - self._start >= 2 and buf[self._start] == 0x0D and buf[self._start + 1] == 0x0A:
+                    hdr_end, body = self._start, self._start + 2
+                else:
+                    k = buf.find(b"\r\n\r\n", self._scan, self._end)
+                    if k == -1:
+                        self._scan = max(self._start, self._end - 3)
+                        return None
+                    hdr_end, body = k, k + 4
+                self._clen = self._content_length(bytes(self._view[self._start:hdr_end]))
+                self._start = self._scan = body
+                self._state = "body" if self._clen else "soi"
+            elif self._state == "body":
+                if self._end - self._start < self._clen:
+                    return None
+                s = self._start
+                self._start = self._scan = s + self._clen
+                self._state = "boundary"
+                return self._view[s:self._start]
+            elif self._state == "soi":
+                i = buf.find(self.SOI, self._start, self._end)
+                if i == -1:
+                    self._start = self._scan = max(self._start, self._end - 1)
+                    return None
+                self._start = i
+                self._scan = i + 2
+                self._state = "eoi"
+            else:  # "eoi"
+                e = buf.find(self.EOI, self._scan, self._end)
+                if e == -1:
+                    self._scan = max(self._start + 2, self._end - 1)
+                    return None
+                s = self._start
+                self._start = self._scan = e + 2
+                self._state = "boundary" if self.boundary else "soi"
+                return self._view[s:self._start]
+
+    @staticmethod
+    def _content_length(raw: bytes) -> int | None:
+        for line in raw.split(b"\r\n"):
+            if b":" not in line:
+                continue
+            k, v = line.split(b":", 1)
+            if k.strip().lower() == b"content-length":
+                try:
+                    n = int(v.strip())
+                    return n if n > 0 else None
+                except Exception:
+                    return None
+        return None
@@ -0,0 +1,188 @@
+import struct
+import threading
+import time
+from array import array
+from pathlib import Path
+
+from .jpeg import jpeg_size
+
+_AVIF_HASINDEX = 0x10
+_AVIIF_KEYFRAME = 0x10
+_MAX_SEGMENT_BYTES = 1900 * 1024 * 1024  # stay below the 2 GB AVI 1.0 limit
+_MAX_GAP_SLOTS = 600  # cap on empty chunks inserted for a single stall
+
+
+class MjpegAviWriter:
+    """
+    Writes already-encoded JPEG frames into an MJPG AVI without decoding or re-encoding.
+    - fps given: frames are placed on a constant-rate timeline from their timestamps; missed slots become
+      zero-length '00dc' chunks (players hold the previous frame), so pauses and deduped frames keep wall-clock timing.
+    - fps None: frames are stored back to back and the rate is set to the measured average when the file is closed.
+    """
+
+    def __init__(self, path: Path, size: tuple[int, int], fps: float | None = None):
+        self.path = Path(path)
+        self.size = (int(size[0]), int(size[1]))
+        self.fps = float(fps) if fps else None
+        self._f = open(self.path, "wb")
+        self._index = array("I")  # (offset, size) pairs relative to the 'movi' fourcc
+        self._frames = 0
+        self._max_chunk = 0
+        self._t0 = None
+        self._t_last = None
+        self._slot = -1
+        self._write_headers()
+
+    def isOpened(self) -> bool:
+        return self._f is not None
+
+    @property
+    def bytes_written(self) -> int:
+        return self._f.tell() if self._f is not None else 0
+
+    def _write_headers(self):
+        w, h = self.size
+        avih = struct.pack("<14I", 0, 0, 0, _AVIF_HASINDEX, 0, 0, 1, 0, w, h, 0, 0, 0, 0)
+        strh = b"vidsMJPG" + struct.pack("<IHHIIIIIIIIhhhh", 0, 0, 0, 0, 1, 25, 0, 0, 0, 0xFFFFFFFF, 0, 0, 0, w, h)
+        strf = struct.pack("<IiiHH4sIiiII", 40, w, h, 1, 24, b"MJPG", w * h * 3, 0, 0, 0, 0)
+        strl = b"strl" + self._chunk(b"strh", strh) + self._chunk(b"strf", strf)
+        hdrl = b"hdrl" + self._chunk(b"avih", avih) + b"LIST" + struct.pack("<I", len(strl)) + strl
+        f = self._f
+        f.write(b"RIFF\0\0\0\0AVI ")
+        self._avih_pos = f.tell() + 8 + 4 + 8  # RIFF payload -> LIST hdrl -> 'avih' data
+        f.write(b"LIST" + struct.pack("<I", len(hdrl)) + hdrl)
+        self._strh_pos = self._avih_pos + 56 + 8 + 4 + 8  # after avih -> LIST strl -> 'strh' data
+        self._movi_pos = f.tell() + 8  # offset of the 'movi' fourcc
+        f.write(b"LIST\0\0\0\0movi")
+
+    @staticmethod
+    def _chunk(fourcc: bytes, data: bytes) -> bytes:
+        pad = b"\0" if len(data) & 1 else b""
+        return fourcc + struct.pack("<I", len(data)) + data + pad
+
+    def _append(self, payload):
+        f = self._f
+        n = len(payload)
+        self._index.append(f.tell() - self._movi_pos)
+        self._index.append(n)
+        f.write(b"00dc" + struct.pack("<I", n))
+        if n:
+            f.write(payload)
+            if n & 1:
+                f.write(b"\0")
+        self._frames += 1
+        self._max_chunk = max(self._max_chunk, n)
+
+    def _fill_until(self, slot: int):
+        gap = min(slot - self._slot - 1, _MAX_GAP_SLOTS)
+        for _ in range(max(0, gap)):
+            self._append(b"")
+        self._slot = slot - 1
+
+    def write(self, payload, ts: float | None = None):
+        if self._f is None:
+            return
+        ts = time.time() if ts is None else ts
+        if self._t0 is None:
+            self._t0 = ts
+        self._t_last = ts
+        if self.fps:
+            slot = int(round((ts - self._t0) * self.fps))
+            if slot <= self._slot:
+                return  # faster than the nominal rate; keep timeline constant
+            self._fill_until(slot)
+            self._slot = slot
+        self._append(payload)
+
+    def close(self):
+        f = self._f
+        if f is None:
+            return
+        try:
+            if self.fps and self._t0 is not None:
+                self._fill_until(int(round((time.time() - self._t0) * self.fps)))
+                rate = self.fps
+            elif self._frames > 1 and self._t_last > self._t0:
+                rate = (self._frames - 1) / (self._t_last - self._t0)
+            else:
+                rate = 25.0
+            movi_end = f.tell()
+            flags = array("I")
+            for i in range(0, len(self._index), 2):
+                flags.extend((_AVIIF_KEYFRAME if self._index[i + 1] else 0, self._index[i], self._index[i + 1]))
+            f.write(b"idx1" + struct.pack("<I", self._frames * 16))
+            for i in range(0, len(flags), 3):
+                f.write(b"00dc" + struct.pack("<III", flags[i], flags[i + 1], flags[i + 2]))
+            end = f.tell()
+            scale, rate_i = 1000, max(1, int(round(rate * 1000)))
+            f.seek(4)
+            f.write(struct.pack("<I", end - 8))
+            f.seek(self._movi_pos - 4)
+            f.write(struct.pack("<I", movi_end - self._movi_pos))
+            f.seek(self._avih_pos)
+            f.write(struct.pack("<II", int(round(1e6 / rate)), int(self._max_chunk * rate)))
+            f.seek(self._avih_pos + 16)
+            f.write(struct.pack("<I", self._frames))
+            f.seek(self._avih_pos + 28)
+            f.write(struct.pack("<I", self._max_chunk))
+            f.seek(self._strh_pos + 20)
+            f.write(struct.pack("<II", scale, rate_i))
+            f.seek(self._strh_pos + 32)
+            f.write(struct.pack("<II", self._frames, self._max_chunk))
+        finally:
+            f.close()
+            self._f = None
+
+
+class MjpegRecorder:
+    """
+    Pass-through recorder for HTTP JPEG sources. Opens the AVI lazily on the first payload (size comes from the
+    JPEG header), and rolls to a new segment on resolution change or when nearing the AVI size limit.
+    Safe to start/stop from the UI thread while the worker thread writes. Bytes written (chunk headers included)
+    are counted as "rec_bytes" on `metrics` when one is given.
+    """
+
+    def __init__(self, out_dir: Path, name_prefix: str, fps: float | None = None, metrics=None):
+        self.out_dir = Path(out_dir)
+        self.name_prefix = name_prefix
+        self.fps = fps
+        self.metrics = metrics
+        self._writer: MjpegAviWriter | None = None
+        self._lock = threading.Lock()
+        self._closed = False
+        self.path = self._next_path()
+
+    def _next_path(self) -> Path:
+        ts = time.strftime("%Y%m%d_%H%M%S")
+        p = self.out_dir / f"{self.name_prefix}_{ts}.avi"
+        k = 1
+        while p.exists():
+            p = self.out_dir / f"{self.name_prefix}_{ts}_{k}.avi"
+            k += 1
+        return p
+
+    def write(self, payload, ts: float | None = None):
+        with self._lock:
+            if self._closed:
+                return
+            size = jpeg_size(payload)
+            if size is None:
+                return
+            w = self._writer
+            if w is None or size != w.size or w.bytes_written > _MAX_SEGMENT_BYTES:
+                if w is not None:
+                    w.close()
+                    self.path = self._next_path()
+                self.out_dir.mkdir(parents=True, exist_ok=True)
+                w = self._writer = MjpegAviWriter(self.path, size, self.fps)
+            before = w.bytes_written
+            w.write(payload, ts)
+            if self.metrics is not None:
+                self.metrics.count("rec_bytes", w.bytes_written - before)
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
@@ -0,0 +1,89 @@
+import time
+
+import cv2
+import numpy as np
+
+
+class CaptureClock:
+    """
+    Wall-clock timestamp for a captured frame. Uses the stream position (CAP_PROP_POS_MSEC) anchored to the receive
+    time of the first frame, so jitter between the camera and this process doesn't move the stamp; falls back to the
+    receive time when the backend reports no position or the position jumps (reconnect, looping file).
+    """
+
+    def __init__(self, max_drift: float = 2.0):
+        self.max_drift = max_drift
+        self._anchor = None
+
+    def reset(self):
+        self._anchor = None
+
+    def timestamp(self, pos_msec, recv_ts: float) -> float:
+        try:
+            pos = float(pos_msec)
+        except Exception:
+            pos = 0.0
+        if not pos or pos != pos or pos < 0:
+            return recv_ts
+        ts = (self._anchor + pos / 1000.0) if self._anchor is not None else None
+        if ts is None or abs(ts - recv_ts) > self.max_drift:
+            self._anchor = recv_ts - pos / 1000.0
+            ts = recv_ts
+        return ts
+
+
+class TimestampOverlay:
+    """
+    Timestamp OSD: the text is rendered once per second into a small alpha mask, and each frame only blends that
+    ROI (bottom-left, same placement/style as the old per-frame cv2.putText).
+    """
+
+    def __init__(self, fmt: str = "%Y-%m-%d %H:%M:%S", scale: float = 0.6, color=(0, 200, 255), thickness: int = 2, margin: int = 10):
+        self.fmt = fmt
+        self.scale = scale
+        self.color = color
+        self.thickness = thickness
+        self.margin = margin
+        self._second = None
+        self._inv = None  # 255 - alpha, (h, w, 3) uint8
+        self._fg = None  # color premultiplied by alpha, (h, w, 3) uint8
+        self._origin = (0, 0)  # text origin (x, baseline y) inside the mask
+
+    def _render(self, second: int):
+        text = time.strftime(self.fmt, time.localtime(second))
+        (tw, th), baseline = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, self.scale, self.thickness)
+        pad = self.thickness
+        h, w = th + baseline + 2 * pad, tw + 2 * pad
+        mask = np.zeros((h, w), dtype=np.uint8)
+        cv2.putText(mask, text, (pad, pad + th), cv2.FONT_HERSHEY_SIMPLEX, self.scale, 255, self.thickness, cv2.LINE_AA)
+        alpha = cv2.merge([mask, mask, mask])
+        color = np.empty_like(alpha)
+        color[:] = self.color
+        self._inv = 255 - alpha
+        self._fg = cv2.multiply(color, alpha, scale=1.0 / 255)
+        self._origin = (pad, pad + th)
+        self._second = second
+
+    def stamp(self, frame, ts: float | None = None):
+        """Blend the timestamp for `ts` (seconds since epoch; default now) into `frame` in place."""
+        if frame is None or frame.ndim != 3 or frame.shape[2] != 3:
+            return frame
+        second = int(ts if ts is not None else time.time())
+        if second != self._second:
+            self._render(second)
+        mh, mw = self._inv.shape[:2]
+        fh, fw = frame.shape[:2]
+        # same anchor as putText(..., (margin, h - margin)): text origin at the bottom-left baseline
+        ox, oy = self._origin
+        y0 = fh - self.margin - oy
+        x0 = self.margin - ox
+        if y0 < 0 or x0 < 0:
+            return frame
+        h = min(mh, fh - y0)
+        w = min(mw, fw - x0)
+        if h <= 0 or w <= 0:
+            return frame
+        roi = frame[y0:y0 + h, x0:x0 + w]
+        # roi = roi * (1 - a) + color * a, written back in place
+        cv2.add(cv2.multiply(roi, self._inv[:h, :w], scale=1.0 / 255), self._fg[:h, :w], dst=roi)
+        return frame
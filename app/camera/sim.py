@@ -0,0 +1,250 @@
+import time
+import zlib
+from urllib.parse import urlsplit, parse_qs
+
+import cv2
+import numpy as np
+
+# Frame counter code: 32 bits as black/white blocks along the top-left edge, readable after JPEG/scaling.
+# A second row carries the render time (wall-clock ms, low 32 bits) for end-to-end latency measurements.
+_BITS = 32
+_BLOCK = 8
+
+
+def parse_sim_url(url: str) -> dict:
+    """
+    sim://<name>?w=1280&h=720&fps=25&pattern=moving&file=/path/clip.mp4
+    pattern: moving (bouncing box over a gradient; triggers motion), static, bars (scrolling), noise (worst case
+    for encoders). With `file` the clip is looped instead (resized only if w/h are given).
+    """
+    parts = urlsplit(url)
+    q = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+
+    def num(key, default, cast=int):
+        try:
+            return cast(q[key])
+        except Exception:
+            return default
+
+    return {
+        "name": parts.netloc or parts.path.strip("/") or "sim",
+        "width": num("w", 0),
+        "height": num("h", 0),
+        "fps": num("fps", 0.0, float),  # 0: the file's own rate, else 25
+        "pattern": q.get("pattern", "moving").lower(),
+        "file": q.get("file") or None,
+        "counter": q.get("counter", "1") != "0",
+    }
+
+
+def _write_bits(frame, row: int, value: int):
+    y0 = row * _BLOCK
+    for b in range(_BITS):
+        frame[y0:y0 + _BLOCK, b * _BLOCK:(b + 1) * _BLOCK] = 255 if (value >> b) & 1 else 0
+
+
+def _read_bits(frame, row: int, width: int | None):
+    try:
+        w = frame.shape[1]
+        scale = w / float(width) if width else 1.0
+        y = int((row * _BLOCK + _BLOCK / 2) * scale)
+        n = 0
+        for b in range(_BITS):
+            x = int((b * _BLOCK + _BLOCK / 2) * scale)
+            if float(np.mean(frame[y, x])) > 127:
+                n |= 1 << b
+        return n
+    except Exception:
+        return None
+
+
+def stamp_counter(frame, n: int, ts: float | None = None):
+    h, w = frame.shape[:2]
+    if w < _BITS * _BLOCK or h < 4 * _BLOCK:
+        return
+    _write_bits(frame, 0, n)
+    _write_bits(frame, 1, int((time.time() if ts is None else ts) * 1000) & 0xFFFFFFFF)
+    cv2.putText(frame, f"#{n}", (4, 4 * _BLOCK + 12), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1, cv2.LINE_8)
+
+
+def read_counter(frame, width: int | None = None):
+    """Decode the counter stamped by stamp_counter; `width` is the source width if `frame` was scaled."""
+    return _read_bits(frame, 0, width)
+
+
+def frame_age_ms(frame, width: int | None = None, now: float | None = None):
+    """Milliseconds since the frame was rendered (same host clock), or None if it carries no stamp."""
+    stamped = _read_bits(frame, 1, width)
+    if stamped is None:
+        return None
+    now_ms = int((time.time() if now is None else now) * 1000) & 0xFFFFFFFF
+    return (now_ms - stamped) & 0xFFFFFFFF
+
+
+class SimSource:
+    """Generates synthetic frames (or loops a local file) with an embedded frame counter."""
+
+    def __init__(self, width: int = 0, height: int = 0, fps: float = 25.0, pattern: str = "moving", file: str | None = None,
+                 counter: bool = True, seed: int = 0):
+        self.fps = float(fps) if fps and fps > 0 else 0.0
+        self.pattern = pattern
+        self.counter = counter
+        self.count = 0
+        self._file = None
+        if file:
+            self._file = cv2.VideoCapture(file)
+            if not self._file.isOpened():
+                raise IOError(f"cannot open {file}")
+            src_fps = self._file.get(cv2.CAP_PROP_FPS)
+            if not self.fps and src_fps and src_fps > 1:
+                self.fps = float(src_fps)
+            width = width or int(self._file.get(cv2.CAP_PROP_FRAME_WIDTH) or 0)
+            height = height or int(self._file.get(cv2.CAP_PROP_FRAME_HEIGHT) or 0)
+        self.fps = self.fps or 25.0
+        self.width = int(width) or 1280
+        self.height = int(height) or 720
+        self._rng = np.random.default_rng(seed)
+        # per-source offset so many cameras with the same pattern don't look identical
+        self._phase = int(self._rng.integers(0, 1000))
+        ramp = np.linspace(40, 200, self.width, dtype=np.float32)
+        base = np.repeat(ramp[None, :], self.height, axis=0).astype(np.uint8)
+        self._base = cv2.merge([base, np.flipud(base), np.full_like(base, 90)])
+        self._bars = None
+
+    @classmethod
+    def from_url(cls, url: str, seed: int = 0):
+        p = parse_sim_url(url)
+        return cls(p["width"], p["height"], p["fps"], p["pattern"], p["file"], p["counter"], seed=seed)
+
+    @property
+    def shape(self):
+        return self.height, self.width, 3
+
+    def next_frame(self, out=None):
+        """Render the next frame into `out` (reused when it has the right shape) and return it."""
+        if out is None or out.shape != self.shape or out.dtype != np.uint8:
+            out = np.empty(self.shape, dtype=np.uint8)
+        n = self.count
+        ts = time.time()  # capture time as far as latency measurements are concerned
+        if self._file is not None:
+            self._read_file(out)
+        elif self.pattern == "noise":
+            cv2.randu(out, 0, 256)
+        elif self.pattern == "bars":
+            if self._bars is None:
+                colors = np.array([[255, 255, 255], [0, 255, 255], [255, 255, 0], [0, 255, 0],
+                                   [255, 0, 255], [0, 0, 255], [255, 0, 0], [0, 0, 0]], dtype=np.uint8)
+                idx = (np.arange(self.width) * len(colors) // self.width)
+                self._bars = np.repeat(colors[idx][None, :, :], self.height, axis=0)
+            shift = (n * 4 + self._phase) % self.width
+            out[:, :self.width - shift] = self._bars[:, shift:]
+            out[:, self.width - shift:] = self._bars[:, :shift]
+        else:
+            np.copyto(out, self._base)
+            if self.pattern != "static":
+                bw, bh = max(8, self.width // 8), max(8, self.height // 8)
+                t = n + self._phase
+                span_x, span_y = max(1, self.width - bw), max(1, self.height - bh)
+                x = abs((t * 7) % (2 * span_x) - span_x)
+                y = abs((t * 5) % (2 * span_y) - span_y)
+                cv2.rectangle(out, (x, y), (x + bw, y + bh), (30, 30, 230), -1)
+        if self.counter:
+            stamp_counter(out, n, ts)
+        self.count += 1
+        return out
+
+    def _read_file(self, out):
+        ok, frame = self._file.read()
+        if not ok:
+            # loop the clip
+            self._file.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ok, frame = self._file.read()
+        if not ok or frame is None:
+            out[:] = 0
+        elif frame.shape == out.shape:
+            out[...] = frame
+        else:
+            cv2.resize(frame, (self.width, self.height), dst=out)
+
+    def release(self):
+        if self._file is not None:
+            self._file.release()
+            self._file = None
+
+
+class SimCapture:
+    """
+    cv2.VideoCapture stand-in for "sim" cameras: the subset CameraWorker and the capture process use
+    (grab/retrieve/read with image=, get, isOpened, release), paced at the configured fps like a live camera.
+    """
+
+    def __init__(self, url: str, seed: int | None = None):
+        self.url = url
+        try:
+            self._src = SimSource.from_url(url, seed=zlib.crc32(url.encode()) if seed is None else seed)
+        except Exception:
+            self._src = None
+        self._t0 = None
+        self._pos = 0  # frames grabbed; the "camera" keeps its pace even when frames aren't retrieved
+        self._grabbed = False
+
+    def isOpened(self) -> bool:
+        return self._src is not None
+
+    def getBackendName(self) -> str:
+        return "SIM"
+
+    def grab(self) -> bool:
+        if self._src is None:
+            return False
+        now = time.time()
+        if self._t0 is None:
+            self._t0 = now
+        # frame n is due at t0 + n / fps; sleep like a blocking camera read would
+        due = self._t0 + self._pos / self._src.fps
+        if due > now:
+            time.sleep(due - now)
+        elif now - due > 1.0:
+            # consumer fell far behind; drop the backlog instead of bursting
+            self._t0 = now - self._pos / self._src.fps
+        self._pos += 1
+        self._grabbed = True
+        return True
+
+    def retrieve(self, image=None, flag: int = 0):
+        if self._src is None or not self._grabbed:
+            return False, None
+        self._grabbed = False
+        if self._src._file is None:
+            # synthetic frames are a function of the frame number, so skipped grabs show up in the counter
+            self._src.count = self._pos - 1
+        return True, self._src.next_frame(image)
+
+    def read(self, image=None):
+        if not self.grab():
+            return False, None
+        return self.retrieve(image)
+
+    def get(self, prop: int) -> float:
+        src = self._src
+        if src is None:
+            return 0.0
+        if prop == cv2.CAP_PROP_FPS:
+            return float(src.fps)
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(src.width)
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(src.height)
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            return float(self._pos)
+        if prop == cv2.CAP_PROP_POS_MSEC:
+            return self._pos * 1000.0 / src.fps
+        return 0.0
+
+    def set(self, prop: int, value) -> bool:
+        return False
+
+    def release(self):
+        if self._src is not None:
+            self._src.release()
+            self._src = None
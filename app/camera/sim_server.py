@@ -0,0 +1,174 @@
+import argparse
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit
+
+import cv2
+
+from .sim import SimSource, parse_sim_url
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "cctv-sim/1"
+
+    def log_message(self, *args):
+        pass
+
+    def _source_args(self, name: str, query: str) -> dict:
+        p = parse_sim_url(f"sim://{name}?{query}")
+        d = self.server.defaults
+        return {
+            "width": p["width"] or d["width"],
+            "height": p["height"] or d["height"],
+            "fps": p["fps"] or d["fps"],
+            "pattern": p["pattern"] if "pattern=" in query else d["pattern"],
+            "file": p["file"] or d["file"],
+            "counter": p["counter"],
+        }
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        segs = [s for s in parts.path.split("/") if s]
+        if len(segs) != 3 or segs[0] != "cam" or segs[2] not in ("video", "shot.jpg"):
+            self.send_error(404)
+            return
+        name = segs[1]
+        try:
+            args = self._source_args(name, parts.query)
+            if segs[2] == "shot.jpg":
+                self._snapshot(name, parts.query, args)
+            else:
+                self._stream(name, args)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        except Exception as e:
+            try:
+                self.send_error(500, str(e))
+            except Exception:
+                pass
+
+    def _jpeg(self, frame) -> bytes:
+        ok, buf = cv2.imencode(".jpg", frame, [int(cv2.IMWRITE_JPEG_QUALITY), self.server.quality])
+        return buf.tobytes() if ok else b""
+
+    def _snapshot(self, name: str, query: str, args: dict):
+        src = self.server.snapshot_source(name, query, args)
+        with src.lock:
+            # frame number follows wall time, like polling a live camera
+            src.count = int((time.time() - src.t0) * src.fps)
+            data = self._jpeg(src.next_frame(src.buf))
+        self.send_response(200)
+        self.send_header("Content-Type", "image/jpeg")
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _stream(self, name: str, args: dict):
+        src = SimSource(seed=self.server.seed_for(name), **args)
+        self.send_response(200)
+        self.send_header("Content-Type", "multipart/x-mixed-replace; boundary=frame")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        buf = None
+        t0 = time.time()
+        try:
+            while not self.server.stopping:
+                buf = src.next_frame(buf)
+                data = self._jpeg(buf)
+                self.wfile.write(b"--frame\r\nContent-Type: image/jpeg\r\nContent-Length: %d\r\n\r\n" % len(data) + data + b"\r\n")
+                delay = t0 + src.count / src.fps - time.time()
+                if delay > 0:
+                    time.sleep(delay)
+        finally:
+            src.release()
+
+
+class SimServer(ThreadingHTTPServer):
+    """
+    Local MJPEG/snapshot stand-in for HTTP cameras, serving synthetic frames from SimSource:
+
+        python -m app.camera.sim_server --port 8090 --cameras 64 --w 640 --h 360 --fps 15
+
+      GET /cam/<name>/video      multipart MJPEG stream (one SimSource per connection)
+      GET /cam/<name>/shot.jpg   single JPEG (one SimSource per camera name, advancing in real time)
+
+    Query parameters (w, h, fps, pattern, file, counter) override the server defaults per URL, as in sim:// URLs.
+    """
+    daemon_threads = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8090, width: int = 640, height: int = 360, fps: float = 15.0,
+                 pattern: str = "moving", file: str | None = None, quality: int = 80):
+        super().__init__((host, port), _Handler)
+        self.defaults = {"width": width, "height": height, "fps": fps, "pattern": pattern, "file": file}
+        self.quality = int(quality)
+        self.stopping = False
+        self._snapshots = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def seed_for(self, name: str) -> int:
+        return sum(name.encode()) * 7919
+
+    def snapshot_source(self, name: str, query: str, args: dict):
+        key = (name, query)
+        with self._lock:
+            src = self._snapshots.get(key)
+            if src is None:
+                src = SimSource(seed=self.seed_for(name), **args)
+                src.lock = threading.Lock()
+                src.t0 = time.time()
+                src.buf = None
+                self._snapshots[key] = src
+        return src
+
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def urls(self, count: int) -> list:
+        """[(mjpeg_url, snapshot_url)] for cameras 1..count."""
+        base = self.base_url()
+        return [(f"{base}/cam/{i}/video", f"{base}/cam/{i}/shot.jpg") for i in range(1, count + 1)]
+
+    def start(self):
+        """Serve in a background thread (for tests/benchmarks in the same process)."""
+        self._thread = threading.Thread(target=self.serve_forever, name="cctv-sim-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.stopping = True
+        self.shutdown()
+        self.server_close()
+        for src in self._snapshots.values():
+            src.release()
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Synthetic MJPEG/snapshot camera server")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8090)
+    ap.add_argument("--cameras", type=int, default=4, help="number of camera URLs to print")
+    ap.add_argument("--w", type=int, default=640)
+    ap.add_argument("--h", type=int, default=360)
+    ap.add_argument("--fps", type=float, default=15.0)
+    ap.add_argument("--pattern", default="moving", choices=["moving", "static", "bars", "noise"])
+    ap.add_argument("--file", default=None, help="loop this clip instead of generating frames")
+    ap.add_argument("--quality", type=int, default=80)
+    a = ap.parse_args(argv)
+    srv = SimServer(a.host, a.port, a.w, a.h, a.fps, a.pattern, a.file, a.quality)
+    for mjpeg, shot in srv.urls(a.cameras):
+        print(f"{mjpeg}  {shot}")
+    try:
+        srv.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        srv.server_close()
+
+
+if __name__ == "__main__":
+    main()
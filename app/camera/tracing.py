@@ -0,0 +1,147 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from pathlib import Path
+
+# Per-frame lifecycle tracing in Chrome trace event format (chrome://tracing, ui.perfetto.dev).
+# A frame gets an id when its capture completes (CameraMetrics.captured); stage spans recorded through
+# CameraMetrics.stop on the same thread carry that id. The frame object is tagged when the worker emits it and
+# looked up again when the tile receives it, which yields a "queued" span (signal delivery) and a flow arrow
+# from the worker thread to the UI thread.
+
+active = False  # read on the hot path; set_enabled() flips it
+_MAX_EVENTS = 200_000  # ring buffer: long sessions keep the most recent events
+_QUEUE_TID = 1_000_000  # pseudo-thread per camera for the signal queue track
+
+_events = deque(maxlen=_MAX_EVENTS)
+_lock = threading.Lock()
+_next_id = 0
+_current = {}  # (thread ident, camera_id) -> frame id being processed on that thread
+_latest = {}  # camera_id -> newest frame id (threads that never saw a capture, e.g. executor callbacks)
+_emitted = {}  # camera_id -> OrderedDict(id(frame) -> (frame id, emit perf_counter))
+_threads = {}  # thread ident -> track name
+_pid = os.getpid()
+
+
+def enabled() -> bool:
+    return active
+
+
+def set_enabled(flag: bool):
+    global active
+    active = bool(flag)
+
+
+def name_thread(name: str):
+    """Track name for the calling thread (threads shared by several cameras, where the default would mislead)."""
+    _threads[threading.get_ident()] = name
+
+
+def _us(t: float) -> float:
+    return t * 1e6
+
+
+def _tid(camera_id: int) -> int:
+    tid = threading.get_ident()
+    if tid not in _threads:
+        th = threading.current_thread()
+        if th is threading.main_thread():
+            name = "UI thread"
+        elif th.name.startswith("Dummy"):
+            # QThread workers are unnamed to the threading module; name the track after the first camera seen
+            name = f"camera {camera_id} worker"
+        else:
+            name = th.name
+        _threads[tid] = name
+    return tid
+
+
+def begin(camera_id: int) -> int:
+    """Start a new frame on this thread; returns its id."""
+    global _next_id
+    with _lock:
+        _next_id += 1
+        fid = _next_id
+    _current[(threading.get_ident(), camera_id)] = fid
+    _latest[camera_id] = fid
+    return fid
+
+
+def current(camera_id: int) -> int:
+    return _current.get((threading.get_ident(), camera_id)) or _latest.get(camera_id, 0)
+
+
+def resume(camera_id: int, fid: int):
+    """Continue frame `fid` on this thread (work handed over outside a signal, e.g. an executor future)."""
+    if fid:
+        _current[(threading.get_ident(), camera_id)] = fid
+
+
+def span(name: str, t0: float, t1: float, camera_id: int, **args):
+    """Complete event for [t0, t1] (perf_counter seconds) on the calling thread, tagged with the current frame."""
+    if not active or not t0:
+        return
+    args["camera"] = camera_id
+    args["frame"] = current(camera_id)
+    _events.append({"name": name, "cat": "frame", "ph": "X", "ts": _us(t0), "dur": _us(max(0.0, t1 - t0)),
+                    "pid": _pid, "tid": _tid(camera_id), "args": args})
+
+
+def emitted(camera_id: int, frame):
+    """Tag a frame object right before frame_ready.emit so the receiving tile can pick up its id."""
+    if not active or frame is None:
+        return
+    fid = current(camera_id)
+    now = time.perf_counter()
+    with _lock:
+        tags = _emitted.get(camera_id)
+        if tags is None:
+            tags = _emitted[camera_id] = OrderedDict()
+        # keyed by object identity: ring slots are reused only after the consumer let go of them
+        tags[id(frame)] = (fid, now)
+        tags.move_to_end(id(frame))
+        while len(tags) > 64:
+            tags.popitem(last=False)
+    _events.append({"name": "emit", "cat": "frame", "ph": "s", "id": fid, "ts": _us(now), "pid": _pid,
+                    "tid": _tid(camera_id)})
+
+
+def delivered(camera_id: int, frame) -> int:
+    """Called by the receiver: adopts the frame id on this thread and records the time spent in the signal queue."""
+    if not active or frame is None:
+        return 0
+    now = time.perf_counter()
+    with _lock:
+        tags = _emitted.get(camera_id)
+        tag = tags.pop(id(frame), None) if tags else None
+    if tag is None:
+        return 0
+    fid, t_emit = tag
+    _current[(threading.get_ident(), camera_id)] = fid
+    tid = _tid(camera_id)
+    qtid = _QUEUE_TID + int(camera_id)
+    _threads.setdefault(qtid, f"camera {camera_id} signal queue")
+    _events.append({"name": "queued", "cat": "frame", "ph": "X", "ts": _us(t_emit), "dur": _us(now - t_emit),
+                    "pid": _pid, "tid": qtid, "args": {"camera": camera_id, "frame": fid}})
+    _events.append({"name": "emit", "cat": "frame", "ph": "f", "bp": "e", "id": fid, "ts": _us(now), "pid": _pid,
+                    "tid": tid})
+    return fid
+
+
+def dump(path) -> int:
+    """Write the buffered events as Chrome trace JSON; returns the number of events written."""
+    events = list(_events)
+    meta = [{"name": "process_name", "ph": "M", "pid": _pid, "args": {"name": "cctv"}}]
+    meta += [{"name": "thread_name", "ph": "M", "pid": _pid, "tid": tid, "args": {"name": name}}
+             for tid, name in list(_threads.items())]
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": meta + events, "displayTimeUnit": "ms"}, f)
+    return len(events)
+
+
+def default_path(base_dir) -> Path:
+    return Path(base_dir) / "traces" / f"trace_{time.strftime('%Y%m%d_%H%M%S')}.json"
@@ -0,0 +1,222 @@
+from PySide6.QtCore import QThread, Signal
+import os
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+_SYSFS = "/sys/class/video4linux"
+
+# V4L2 ioctls (linux/videodev2.h), encoded like the kernel's _IOR/_IOWR macros
+_IOC_READ, _IOC_WRITE = 2, 1
+
+
+def _ioc(direction: int, nr: int, size: int) -> int:
+    return (direction << 30) | (size << 16) | (ord("V") << 8) | nr
+
+
+_CAPABILITY = struct.Struct("16s32s32sIII12x")  # driver, card, bus_info, version, capabilities, device_caps
+_FMTDESC = struct.Struct("III32sII12x")  # index, type, flags, description, pixelformat, mbus_code
+_FRMSIZE = struct.Struct("III6I8x")  # index, pixel_format, type, discrete{w,h} | stepwise{min_w,max_w,step_w,min_h,max_h,step_h}
+_FRMIVAL = struct.Struct("IIIII6I8x")  # index, pixel_format, width, height, type, discrete{num,den} | stepwise{min,max,step}
+
+VIDIOC_QUERYCAP = _ioc(_IOC_READ, 0, _CAPABILITY.size)
+VIDIOC_ENUM_FMT = _ioc(_IOC_READ | _IOC_WRITE, 2, _FMTDESC.size)
+VIDIOC_ENUM_FRAMESIZES = _ioc(_IOC_READ | _IOC_WRITE, 74, _FRMSIZE.size)
+VIDIOC_ENUM_FRAMEINTERVALS = _ioc(_IOC_READ | _IOC_WRITE, 75, _FRMIVAL.size)
+
+_CAP_VIDEO_CAPTURE = 0x00000001
+_CAP_DEVICE_CAPS = 0x80000000
+_BUF_TYPE_VIDEO_CAPTURE = 1
+_FRMSIZE_DISCRETE = 1
+_FRMIVAL_DISCRETE = 1
+
+# Probed device info keyed by (device node, sysfs identity); a replug on another port gets probed again
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def _cstr(raw: bytes) -> str:
+    return raw.split(b"\0", 1)[0].decode("utf-8", "replace").strip()
+
+
+def _fourcc(code: int) -> str:
+    return "".join(chr((code >> (8 * i)) & 0xFF) for i in range(4)).strip()
+
+
+def _read(path: str) -> str:
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            return f.read().strip()
+    except Exception:
+        return ""
+
+
+def list_video_nodes() -> list:
+    """[(index, /dev/videoN, sysfs identity, sysfs name)] from /sys/class/video4linux; empty if unavailable."""
+    nodes = []
+    try:
+        entries = os.listdir(_SYSFS)
+    except Exception:
+        return nodes
+    for entry in entries:
+        if not entry.startswith("video") or not entry[5:].isdigit():
+            continue
+        base = os.path.join(_SYSFS, entry)
+        try:
+            ident = os.path.realpath(os.path.join(base, "device"))
+        except Exception:
+            ident = ""
+        nodes.append((int(entry[5:]), f"/dev/{entry}", ident, _read(os.path.join(base, "name"))))
+    return sorted(nodes)
+
+
+def _ioctl(fd, req: int, st: struct.Struct, *fields):
+    import fcntl
+    buf = bytearray(st.pack(*fields))
+    fcntl.ioctl(fd, req, buf, True)
+    return st.unpack(bytes(buf))
+
+
+def _enum_formats(fd) -> dict:
+    """{fourcc: [(width, height, [fps, ...]), ...]} for the capture queue (discrete sizes; stepwise -> max size)."""
+    formats = {}
+    i = 0
+    while True:
+        try:
+            _idx, _t, _flags, _desc, pixfmt, _mbus = _ioctl(fd, VIDIOC_ENUM_FMT, _FMTDESC, i, _BUF_TYPE_VIDEO_CAPTURE, 0, b"", 0, 0)
+        except OSError:
+            break
+        sizes = []
+        j = 0
+        while True:
+            try:
+                fs = _ioctl(fd, VIDIOC_ENUM_FRAMESIZES, _FRMSIZE, j, pixfmt, 0, 0, 0, 0, 0, 0, 0)
+            except OSError:
+                break
+            if fs[2] == _FRMSIZE_DISCRETE:
+                w, h = fs[3], fs[4]
+            else:
+                w, h = fs[4], fs[7]  # stepwise/continuous: report the largest size
+            sizes.append((w, h, _enum_fps(fd, pixfmt, w, h)))
+            if fs[2] != _FRMSIZE_DISCRETE:
+                break
+            j += 1
+        formats[_fourcc(pixfmt)] = sizes
+        i += 1
+    return formats
+
+
+def _enum_fps(fd, pixfmt: int, w: int, h: int) -> list:
+    rates = []
+    k = 0
+    while True:
+        try:
+            fi = _ioctl(fd, VIDIOC_ENUM_FRAMEINTERVALS, _FRMIVAL, k, pixfmt, w, h, 0, 0, 0, 0, 0, 0, 0)
+        except OSError:
+            break
+        if fi[4] == _FRMIVAL_DISCRETE:
+            num, den = fi[5], fi[6]
+            if num:
+                rates.append(round(den / num, 2))
+        else:
+            # stepwise: the fastest rate is the minimum interval
+            num, den = fi[5], fi[6]
+            if num:
+                rates.append(round(den / num, 2))
+            break
+        k += 1
+    return sorted(set(rates), reverse=True)
+
+
+def query_device(index: int, dev: str, ident: str = "", sysfs_name: str = ""):
+    """V4L2 capabilities/formats of one node, or None if it isn't a video capture device (e.g. UVC metadata node)."""
+    key = (dev, ident)
+    with _cache_lock:
+        if key in _cache:
+            return _cache[key]
+    info = None
+    fd = None
+    try:
+        fd = os.open(dev, os.O_RDWR | os.O_NONBLOCK)
+        driver, card, bus, _ver, caps, dev_caps = _ioctl(fd, VIDIOC_QUERYCAP, _CAPABILITY, b"", b"", b"", 0, 0, 0)
+        effective = dev_caps if caps & _CAP_DEVICE_CAPS else caps
+        if effective & _CAP_VIDEO_CAPTURE:
+            info = {
+                "index": index,
+                "device": dev,
+                "name": _cstr(card) or sysfs_name or f"USB Camera {index}",
+                "driver": _cstr(driver),
+                "bus": _cstr(bus),
+                "formats": _enum_formats(fd),
+            }
+    except Exception:
+        info = None
+    finally:
+        if fd is not None:
+            try:
+                os.close(fd)
+            except Exception:
+                pass
+    with _cache_lock:
+        _cache[key] = info
+    return info
+
+
+def _probe_index_opencv(index: int):
+    # Fallback without sysfs/V4L2 (other platforms): open the index with OpenCV
+    import cv2
+    cap = None
+    try:
+        cap = cv2.VideoCapture(index, cv2.CAP_V4L2) if hasattr(cv2, "CAP_V4L2") else None
+        if cap is None or not cap.isOpened():
+            if cap is not None:
+                cap.release()
+            cap = cv2.VideoCapture(index)
+        if not cap.isOpened():
+            return None
+        w = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH) or 0)
+        h = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT) or 0)
+        fps = float(cap.get(cv2.CAP_PROP_FPS) or 0)
+        return {"index": index, "device": str(index), "name": f"USB Camera {index}", "driver": "", "bus": "",
+                "formats": {"": [(w, h, [fps] if fps > 0 else [])]}}
+    except Exception:
+        return None
+    finally:
+        try:
+            if cap is not None:
+                cap.release()
+        except Exception:
+            pass
+
+
+class UsbDiscoveryWorker(QThread):
+    """
+    Finds USB/V4L2 cameras off the UI thread: enumerates /sys/class/video4linux, queries each node's V4L2
+    capabilities in parallel (results cached per device), and emits every capture device as soon as it is known.
+    Without sysfs it falls back to opening indices 0..max_index with OpenCV, also in parallel.
+    """
+    device_found = Signal(dict)  # index, device, name, driver, bus, formats
+    scan_done = Signal(list)  # all devices found, sorted by index
+
+    def __init__(self, max_index: int = 10, parallel: int = 4):
+        super().__init__()
+        self.max_index = max_index
+        self.parallel = max(1, parallel)
+
+    def run(self):
+        found = []
+        nodes = list_video_nodes()
+        with ThreadPoolExecutor(max_workers=self.parallel, thread_name_prefix="usb-probe") as pool:
+            if nodes:
+                futs = [pool.submit(query_device, *n) for n in nodes]
+            else:
+                futs = [pool.submit(_probe_index_opencv, i) for i in range(self.max_index + 1)]
+            for fut in as_completed(futs):
+                try:
+                    info = fut.result()
+                except Exception:
+                    info = None
+                if info is not None:
+                    found.append(info)
+                    self.device_found.emit(info)
+        self.scan_done.emit(sorted(found, key=lambda d: d["index"]))
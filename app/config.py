@@ -10,6 +10,36 @@ class AppConfig:
         self.recordings_dir = self.root / "recordings"
         self.resources_dir = self.root / "resources"
         self.theme = os.environ.get("CCTV_THEME", "dark")  # "dark" or "light"
+        # HTTP camera ingest: "thread" (one QThread per camera) or "async" (shared asyncio loop)
+        self.http_ingest = os.environ.get("CCTV_HTTP_INGEST", "thread").lower()
+        # Outstanding requests per HTTP snapshot camera (1 = classic request/response polling)
+        try:
+            self.snapshot_inflight = max(1, int(os.environ.get("CCTV_SNAPSHOT_INFLIGHT", "1")))
+        except ValueError:
+            self.snapshot_inflight = 1
+        # GStreamer network cameras: scale the display branch in-pipeline and record the encoded stream via tee
+        self.gst_tee = os.environ.get("CCTV_GST_TEE", "0") == "1"
+        # Non-HTTP cameras: "thread" (capture in a QThread) or "process" (one capture process per camera, shared-memory frames)
+        self.capture_mode = os.environ.get("CCTV_CAPTURE_MODE", "thread").lower()
+        # Cameras connecting at the same time during Start All / launch (the rest wait for a first frame or timeout)
+        try:
+            self.startup_concurrency = max(1, int(os.environ.get("CCTV_STARTUP_CONCURRENCY", "4")))
+        except ValueError:
+            self.startup_concurrency = 4
+
+        # Per-stage hot-path timers/counters (tile overlay + diagnostics panel); off by default
+        self.metrics = os.environ.get("CCTV_METRICS", "0") == "1"
+        # Prometheus scrape endpoint on 127.0.0.1:<port> (0 = off); turns instrumentation on
+        try:
+            self.metrics_port = max(0, int(os.environ.get("CCTV_METRICS_PORT", "0")))
+        except ValueError:
+            self.metrics_port = 0
+        # Start in video wall mode (one composited widget paints all cameras); toggled from the toolbar
+        self.video_wall = os.environ.get("CCTV_VIDEO_WALL", "0") == "1"
+        # Per-frame Chrome trace: "1" writes recordings/traces/trace_<ts>.json on exit, any other value is the output path
+        trace = os.environ.get("CCTV_TRACE", "").strip()
+        self.trace = trace not in ("", "0")
+        self.trace_path = Path(trace) if self.trace and trace != "1" else None
 
         self.recordings_dir.mkdir(parents=True, exist_ok=True)
         (self.resources_dir / "sounds").mkdir(parents=True, exist_ok=True)
@@ -18,6 +18,9 @@ class Database:
         self._maybe_add_sort_order()
         self._maybe_add_record_policy()
         self._maybe_add_global_record_policy()
+        self._maybe_add_capture_rates()
+        self._maybe_add_sub_url()
+        self._maybe_add_last_backend()
         if first_time:
             self.conn.commit()
 
@@ -65,6 +68,43 @@ class Database:
         except Exception:
             pass
 
+    def _maybe_add_capture_rates(self):
+        # Per-camera consumer rates (fps); NULL = default, 0 = every source frame
+        try:
+            cur = self.conn.execute("PRAGMA table_info(cameras)")
+            cols = [r[1] for r in cur.fetchall()]
+            changed = False
+            for col in ("display_fps", "analytics_fps", "record_fps"):
+                if col not in cols:
+                    self.conn.execute(f"ALTER TABLE cameras ADD COLUMN {col} REAL")
+                    changed = True
+            if changed:
+                self.conn.commit()
+        except Exception:
+            pass
+
+    def _maybe_add_sub_url(self):
+        # Add sub_url (low-res sub-stream used for the grid; url stays the main stream) if missing
+        try:
+            cur = self.conn.execute("PRAGMA table_info(cameras)")
+            cols = [r[1] for r in cur.fetchall()]
+            if "sub_url" not in cols:
+                self.conn.execute("ALTER TABLE cameras ADD COLUMN sub_url TEXT")
+                self.conn.commit()
+        except Exception:
+            pass
+
+    def _maybe_add_last_backend(self):
+        # Add last_backend (capture backend that last opened the camera) if missing
+        try:
+            cur = self.conn.execute("PRAGMA table_info(cameras)")
+            cols = [r[1] for r in cur.fetchall()]
+            if "last_backend" not in cols:
+                self.conn.execute("ALTER TABLE cameras ADD COLUMN last_backend TEXT")
+                self.conn.commit()
+        except Exception:
+            pass
+
     def validate_user(self, username: str, password: str) -> bool:
         cur = self.conn.execute("SELECT 1 FROM users WHERE username=? AND password=?", (username, password))
         return cur.fetchone() is not None
@@ -86,7 +126,11 @@ class Database:
         self.conn.commit()
 
     def update_camera(self, cam_id: int, name: str, url: str, type_: str):
-        self.conn.execute("UPDATE cameras SET name=?, url=?, type=? WHERE id=?", (name, url, type_, cam_id))
+        # a new URL/type invalidates the remembered capture backend
+        self.conn.execute(
+            "UPDATE cameras SET last_backend=CASE WHEN url=? AND type=? THEN last_backend ELSE NULL END, name=?, url=?, type=? WHERE id=?",
+            (url, type_, name, url, type_, cam_id),
+        )
         self.conn.commit()
 
     def get_camera_policy(self, cam_id: int) -> str:
@@ -103,6 +147,47 @@ class Database:
         self.conn.execute("UPDATE cameras SET record_policy=? WHERE id=?", (policy, cam_id))
         self.conn.commit()
 
+    def get_camera_sub_url(self, cam_id: int) -> str:
+        try:
+            cur = self.conn.execute("SELECT COALESCE(sub_url, '') FROM cameras WHERE id=?", (cam_id,))
+            row = cur.fetchone()
+            return row[0] if row and row[0] else ''
+        except Exception:
+            return ''
+
+    def set_camera_sub_url(self, cam_id: int, sub_url: Optional[str]):
+        self.conn.execute("UPDATE cameras SET sub_url=? WHERE id=?", ((sub_url or '').strip() or None, cam_id))
+        self.conn.commit()
+
+    def get_camera_backend(self, cam_id: int) -> str:
+        try:
+            cur = self.conn.execute("SELECT COALESCE(last_backend, '') FROM cameras WHERE id=?", (cam_id,))
+            row = cur.fetchone()
+            return row[0] if row and row[0] else ''
+        except Exception:
+            return ''
+
+    def set_camera_backend(self, cam_id: int, backend: Optional[str]):
+        self.conn.execute("UPDATE cameras SET last_backend=? WHERE id=?", (backend or None, cam_id))
+        self.conn.commit()
+
+    DEFAULT_RATES = (12.0, 12.0, 0.0)  # display, analytics, record
+
+    def get_camera_rates(self, cam_id: int) -> Tuple[float, float, float]:
+        try:
+            cur = self.conn.execute("SELECT display_fps, analytics_fps, record_fps FROM cameras WHERE id=?", (cam_id,))
+            row = cur.fetchone()
+            if not row:
+                return self.DEFAULT_RATES
+            return tuple(float(v) if v is not None else d for v, d in zip(row, self.DEFAULT_RATES))
+        except Exception:
+            return self.DEFAULT_RATES
+
+    def set_camera_rates(self, cam_id: int, display_fps: float, analytics_fps: float, record_fps: float):
+        vals = [max(0.0, float(v)) for v in (display_fps, analytics_fps, record_fps)]
+        self.conn.execute("UPDATE cameras SET display_fps=?, analytics_fps=?, record_fps=? WHERE id=?", (*vals, cam_id))
+        self.conn.commit()
+
     def update_order(self, ordered_ids: List[int]):
         # assign incremental sort_order based on list order
         for idx, cid in enumerate(ordered_ids, start=1):
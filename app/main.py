@@ -29,6 +29,9 @@ def main():
             cv2.setNumThreads(1)
         except Exception:
             pass
+        # capture backend capabilities are parsed once here and cached for every camera
+        from .camera.backends import probe_capabilities
+        probe_capabilities()
     except Exception:
         pass
 
@@ -48,4 +51,7 @@ def main():
 
 
 if __name__ == "__main__":
+    # capture processes (CCTV_CAPTURE_MODE=process) are spawned; required for frozen builds
+    import multiprocessing
+    multiprocessing.freeze_support()
     main()
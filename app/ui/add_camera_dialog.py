@@ -11,12 +11,16 @@ class AddCameraDialog(QDialog):
         self.name_edit = QLineEdit()
         self.url_edit = QLineEdit()
         self.type_combo = QComboBox()
-        self.type_combo.addItems(["rtsp", "http", "http-snapshot", "usb"]) 
+        self.type_combo.addItems(["rtsp", "http", "http-snapshot", "usb", "sim"]) 
 
         layout.addWidget(QLabel("Name"))
         layout.addWidget(self.name_edit)
-        layout.addWidget(QLabel("URL or Index (e.g., rtsp://..., http://.../video or /shot.jpg, or 0 for USB)"))
+        layout.addWidget(QLabel("URL or Index (e.g., rtsp://..., http://.../video or /shot.jpg, 0 for USB, or sim://name?w=1280&h=720&fps=25)"))
         layout.addWidget(self.url_edit)
+        self.sub_url_edit = QLineEdit()
+        self.sub_url_edit.setPlaceholderText("Optional: low-res sub-stream for the grid (main URL is used for recording/fullscreen/AI)")
+        layout.addWidget(QLabel("Sub-stream URL (optional)"))
+        layout.addWidget(self.sub_url_edit)
         layout.addWidget(QLabel("Type"))
         layout.addWidget(self.type_combo)
 
@@ -31,3 +35,6 @@ class AddCameraDialog(QDialog):
 
     def get_values(self):
         return self.name_edit.text().strip(), self.url_edit.text().strip(), self.type_combo.currentText()
+
+    def get_sub_url(self):
+        return self.sub_url_edit.text().strip()
@@ -0,0 +1,129 @@
+from PySide6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QCheckBox, QLabel, QTableWidget, QTableWidgetItem, QHeaderView, QPushButton, QFileDialog, QMessageBox
+from PySide6.QtCore import Qt, QTimer
+
+from ..camera import metrics, tracing
+
+
+class DiagnosticsPanel(QDialog):
+    """Live per-camera pipeline numbers from app.camera.metrics: rates, drops, bitrate, latency and stage timings."""
+
+    _FIXED = ("Camera", "In fps", "Shown fps", "Drops/s", "Bitrate", "Latency ms")
+
+    def __init__(self, names=None, parent=None, trace_dir=None, metrics_port: int = 0):
+        super().__init__(parent)
+        self.setWindowTitle("Diagnostics")
+        self.setModal(False)
+        self.resize(980, 360)
+        self._names = dict(names or {})  # camera_id -> display name
+        self._trace_dir = trace_dir
+
+        layout = QVBoxLayout(self)
+        top = QHBoxLayout()
+        self.chk_enabled = QCheckBox("Enable instrumentation")
+        self.chk_enabled.setChecked(metrics.enabled())
+        if metrics_port:
+            # the /metrics endpoint reads the same collectors; switching them off would reset every series it exports
+            self.chk_enabled.setChecked(True)
+            self.chk_enabled.setEnabled(False)
+            self.chk_enabled.setToolTip(f"Always on while the metrics endpoint is served on port {metrics_port} (CCTV_METRICS_PORT)")
+        else:
+            self.chk_enabled.setToolTip("Collect per-camera stage timings and counters (small per-frame cost)")
+        self.chk_enabled.toggled.connect(self._on_toggled)
+        top.addWidget(self.chk_enabled)
+        self.chk_trace = QCheckBox("Trace frames")
+        self.chk_trace.setToolTip("Record per-frame spans (capture, decode, signal queue, analysis, paint) for chrome://tracing or Perfetto")
+        self.chk_trace.setChecked(tracing.enabled())
+        self.chk_trace.toggled.connect(tracing.set_enabled)
+        top.addWidget(self.chk_trace)
+        top.addStretch(1)
+        self.lbl_hint = QLabel("Stage columns: average / max ms over the last second")
+        self.lbl_hint.setStyleSheet("color:#888;")
+        top.addWidget(self.lbl_hint)
+        layout.addLayout(top)
+
+        cols = list(self._FIXED) + [s.capitalize() for s in metrics.STAGES]
+        self.table = QTableWidget(0, len(cols))
+        self.table.setHorizontalHeaderLabels(cols)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        layout.addWidget(self.table)
+
+        row = QHBoxLayout()
+        btn_trace = QPushButton("Save Trace…")
+        btn_trace.clicked.connect(self.save_trace)
+        row.addWidget(btn_trace)
+        row.addStretch(1)
+        btn_close = QPushButton("Close")
+        btn_close.clicked.connect(self.close)
+        row.addWidget(btn_close)
+        layout.addLayout(row)
+
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self.refresh)
+        self._timer.start(1000)
+        self.refresh()
+
+    def set_names(self, names: dict):
+        self._names = dict(names or {})
+
+    def _on_toggled(self, on: bool):
+        metrics.set_enabled(on)
+        self.refresh()
+
+    def save_trace(self):
+        default = str(tracing.default_path(self._trace_dir)) if self._trace_dir else "trace.json"
+        path, _ = QFileDialog.getSaveFileName(self, "Save Trace", default, "Chrome trace (*.json)")
+        if not path:
+            return
+        try:
+            n = tracing.dump(path)
+        except Exception as e:
+            QMessageBox.warning(self, "Save Trace", f"Could not write trace: {e}")
+            return
+        if not n:
+            QMessageBox.information(self, "Save Trace", "No frames traced yet; enable \"Trace frames\" first.")
+
+    @staticmethod
+    def _bitrate(bps: float) -> str:
+        if not bps:
+            return ""
+        return f"{bps / 1e6:.2f} Mb/s" if bps >= 1e6 else f"{bps / 1e3:.0f} kb/s"
+
+    def refresh(self):
+        if not metrics.enabled():
+            self.table.setRowCount(0)
+            return
+        items = sorted(metrics.all_metrics().items())
+        self.table.setRowCount(len(items))
+        for r, (cid, m) in enumerate(items):
+            win = m.window()
+            st = win["stages"]
+            ct = win["counters"]
+            lat = st.get("latency")
+            values = [
+                self._names.get(cid, str(cid)),
+                f"{ct.get('frames', 0.0):.1f}",
+                f"{ct.get('painted', 0.0):.1f}",
+                f"{ct.get('drops', 0.0):.1f}",
+                self._bitrate(ct.get("bytes", 0.0) * 8),
+                f"{lat['avg_ms']:.0f} / {lat['max_ms']:.0f}" if lat else "",
+            ]
+            for s in metrics.STAGES:
+                v = st.get(s)
+                values.append(f"{v['avg_ms']:.2f} / {v['max_ms']:.1f}" if v else "")
+            for c, text in enumerate(values):
+                item = self.table.item(r, c)
+                if item is None:
+                    item = QTableWidgetItem()
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter if c else Qt.AlignLeft | Qt.AlignVCenter)
+                    self.table.setItem(r, c, item)
+                item.setText(text)
+
+    def closeEvent(self, event):
+        self._timer.stop()
+        return super().closeEvent(event)
+
+    def showEvent(self, event):
+        self._timer.start(1000)
+        return super().showEvent(event)
@@ -0,0 +1,116 @@
+import sys
+
+import numpy as np
+from PySide6.QtWidgets import QLabel
+from PySide6.QtGui import QImage, QPainter
+from PySide6.QtCore import QRectF
+
+
+def wrap_bgr(frame) -> QImage:
+    """
+    QImage over a BGR (or grayscale) ndarray without copying. The binding keeps a reference to the array for as
+    long as the image lives, so the memory can't go away under it; what the caller must avoid is writing to the
+    array while the image is shown (DisplayBufferPool does that by refcount).
+    """
+    if not frame.flags.c_contiguous:
+        frame = np.ascontiguousarray(frame)
+    h, w = frame.shape[:2]
+    fmt = QImage.Format_BGR888 if frame.ndim == 3 else QImage.Format_Grayscale8
+    return QImage(frame.data, w, h, frame.strides[0], fmt)
+
+
+class DisplayBufferPool:
+    """
+    A few reusable display-sized buffers for one view, in the spirit of FrameRing: the widget resizes/copies into a
+    free buffer, draws overlays on it and shows it through wrap_bgr(). A QImage wrapping a buffer holds a reference
+    to it, so a buffer is pinned for exactly as long as an image over it is alive and acquire() skips it.
+    """
+
+    def __init__(self, slots: int = 3):
+        self._n = max(2, int(slots))
+        self._slots = [np.empty((0,), dtype=np.uint8) for _ in range(self._n)]
+        self._next = 0
+        self._free_refs = sys.getrefcount(self._slots[0])
+
+    def acquire(self, shape, dtype=np.uint8):
+        """Return a free buffer of `shape`; allocates a fresh (unpooled) one if every buffer is pinned."""
+        shape = tuple(shape)
+        for i in range(self._n):
+            k = (self._next + i) % self._n
+            if sys.getrefcount(self._slots[k]) <= self._free_refs:
+                self._next = (k + 1) % self._n
+                if self._slots[k].shape != shape or self._slots[k].dtype != dtype:
+                    self._slots[k] = np.empty(shape, dtype=dtype)
+                return self._slots[k]
+        return np.empty(shape, dtype=dtype)
+
+    def pinned(self) -> int:
+        return sum(1 for i in range(self._n) if sys.getrefcount(self._slots[i]) > self._free_refs)
+
+    def clear(self):
+        self._slots = [np.empty((0,), dtype=np.uint8) for _ in range(self._n)]
+
+
+class ImageView(QLabel):
+    """
+    QLabel that paints a QImage directly instead of going through QPixmap.fromImage (a second full-frame copy,
+    plus a third when the pixmap is scaled). The image is drawn centered, fitted to the widget keeping the aspect
+    ratio, or at `scale` when one is given; `source` selects a sub-rectangle (zoom/pan without cropping the frame).
+    Text and pixmaps set through QLabel still work and clear the image.
+    """
+
+    def __init__(self, text: str = "", parent=None):
+        super().__init__(text, parent)
+        self._image = None
+        self._source = None
+        self._scale = None
+        self._smooth = False
+
+    def set_image(self, image: QImage, source: QRectF | None = None, scale: float | None = None, smooth: bool = False):
+        self._image = image
+        self._source = source
+        self._scale = scale
+        self._smooth = smooth
+        if self.text():
+            super().clear()
+        self.update()
+
+    def image(self):
+        return self._image
+
+    def clear_image(self):
+        self._image = None
+        self.update()
+
+    def setText(self, text):
+        self._image = None
+        super().setText(text)
+
+    def setPixmap(self, pm):
+        self._image = None
+        super().setPixmap(pm)
+
+    def clear(self):
+        self._image = None
+        super().clear()
+
+    def paintEvent(self, e):
+        img = self._image
+        if img is None or img.isNull():
+            return super().paintEvent(e)
+        src = self._source or QRectF(0, 0, img.width(), img.height())
+        sw, sh = src.width(), src.height()
+        if sw <= 0 or sh <= 0:
+            return
+        if self._scale is not None:
+            s = self._scale
+        else:
+            s = min(self.width() / sw, self.height() / sh)
+        tw, th = sw * s, sh * s
+        target = QRectF((self.width() - tw) / 2.0, (self.height() - th) / 2.0, tw, th)
+        p = QPainter(self)
+        self.drawFrame(p)
+        if self._smooth and abs(s - 1.0) > 1e-3:
+            p.setRenderHint(QPainter.SmoothPixmapTransform, True)
+        p.drawImage(target, img, src)
+        p.end()
@@ -1,4 +1,4 @@
-from PySide6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QComboBox, QPushButton, QFrame
+from PySide6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QComboBox, QPushButton, QFrame, QDoubleSpinBox
 from PySide6.QtCore import Qt
 from urllib.request import urlopen, Request
 import cv2
@@ -6,7 +6,7 @@ import numpy as np
 
 
 class EditCameraDialog(QDialog):
-    def __init__(self, name: str, url: str, type_: str, parent=None, policy: str = "manual"):
+    def __init__(self, name: str, url: str, type_: str, parent=None, policy: str = "manual", rates=None, sub_url: str = ""):
         super().__init__(parent)
         self.setWindowTitle("Edit Camera")
         self.resize(520, 360)
@@ -18,7 +18,7 @@ class EditCameraDialog(QDialog):
         self.name_edit = QLineEdit(name)
         self.url_edit = QLineEdit(url)
         self.type_combo = QComboBox()
-        self.type_combo.addItems(["rtsp", "http", "http-snapshot", "usb"]) 
+        self.type_combo.addItems(["rtsp", "http", "http-snapshot", "usb", "sim"]) 
         # select current
         idx = self.type_combo.findText((type_ or "rtsp").lower())
         if idx >= 0:
@@ -28,6 +28,10 @@ class EditCameraDialog(QDialog):
         lay.addWidget(self.name_edit)
         lay.addWidget(QLabel("URL or Index"))
         lay.addWidget(self.url_edit)
+        self.sub_url_edit = QLineEdit(sub_url or "")
+        self.sub_url_edit.setPlaceholderText("Optional: low-res sub-stream for the grid")
+        lay.addWidget(QLabel("Sub-stream URL (optional)"))
+        lay.addWidget(self.sub_url_edit)
         lay.addWidget(QLabel("Type"))
         lay.addWidget(self.type_combo)
 
@@ -41,6 +45,20 @@ class EditCameraDialog(QDialog):
             pass
         lay.addWidget(self.policy_combo)
 
+        # Per-consumer frame rates (0 = every frame from the camera)
+        lay.addWidget(QLabel("Frame rates (fps, 0 = every frame): Display / Analytics / Record"))
+        rates_row = QHBoxLayout()
+        self.rate_spins = []
+        for val in (rates or (12.0, 12.0, 0.0)):
+            sp = QDoubleSpinBox()
+            sp.setRange(0.0, 60.0)
+            sp.setDecimals(1)
+            sp.setSingleStep(1.0)
+            sp.setValue(float(val))
+            rates_row.addWidget(sp)
+            self.rate_spins.append(sp)
+        lay.addLayout(rates_row)
+
         # Preview area
         self.preview = QLabel("No preview")
         self.preview.setAlignment(Qt.AlignCenter)
@@ -70,6 +88,12 @@ class EditCameraDialog(QDialog):
             self.policy_combo.currentText().strip().lower(),
         )
 
+    def get_sub_url(self):
+        return self.sub_url_edit.text().strip()
+
+    def get_rates(self):
+        return tuple(float(sp.value()) for sp in self.rate_spins)
+
     def test_connection(self):
         url = self.url_edit.text().strip()
         type_ = self.type_combo.currentText().strip().lower()
@@ -91,6 +115,11 @@ class EditCameraDialog(QDialog):
                 if start != -1 and end != -1:
                     arr = np.frombuffer(data[start:end+2], np.uint8)
                     frame = cv2.imdecode(arr, cv2.IMREAD_COLOR)
+            elif type_ == "sim" or url.lower().startswith("sim://"):
+                from ..camera.sim import SimCapture
+                cap = SimCapture(url)
+                ok, frame = cap.read()
+                cap.release()
             else:
                 # usb or rtsp via OpenCV
                 cap = cv2.VideoCapture(int(url) if type_ == "usb" else url)
@@ -1,8 +1,7 @@
-from PySide6.QtWidgets import QMainWindow, QWidget, QGridLayout, QLabel, QToolBar, QFileDialog, QMessageBox, QScrollArea, QComboBox, QSplitter, QVBoxLayout, QToolButton, QLineEdit, QStyle, QListWidget, QListWidgetItem
+from PySide6.QtWidgets import QMainWindow, QWidget, QGridLayout, QLabel, QToolBar, QFileDialog, QMessageBox, QScrollArea, QComboBox, QSplitter, QVBoxLayout, QToolButton, QLineEdit, QStyle, QListWidget, QListWidgetItem, QStackedWidget
 from PySide6.QtGui import QAction, QIcon, QPainter, QBrush, QColor, QPixmap
-from PySide6.QtCore import Qt, QSettings, QTimer
+from PySide6.QtCore import Qt, QSettings, QTimer, QEvent
 import math
-import cv2
 
 from ..config import AppConfig
 from ..alert_system import AlertSystem
@@ -11,6 +10,9 @@ from .add_camera_dialog import AddCameraDialog
 from .settings_dialog import SettingsDialog
 from .about_dialog import AboutDialog
 from .recording_manager import RecordingManagerDialog
+from .startup_scheduler import StartupScheduler
+from .video_wall import VideoWall
+from ..camera import metrics, tracing
 
 
 class MainWindow(QMainWindow):
@@ -24,6 +26,7 @@ class MainWindow(QMainWindow):
         self._start_after_add_id = None
         self._fixed_cols = 0  # 0 = Auto
         self._broadcast_on = False
+        self._wall_on = bool(cfg.video_wall)
         self._prev_sidebar_open = None
         self._selected_camera_id = None
         self._active_icon = None
@@ -36,6 +39,23 @@ class MainWindow(QMainWindow):
         except Exception:
             self.alerts = None
 
+        metrics.set_enabled(self.cfg.metrics or self.cfg.metrics_port > 0)
+        tracing.set_enabled(self.cfg.trace)
+        self._diagnostics = None
+        # Local Prometheus endpoint for fleet scraping (CCTV_METRICS_PORT)
+        self._metrics_server = None
+        if self.cfg.metrics_port:
+            try:
+                from ..camera.metrics_server import MetricsServer
+                self._metrics_server = MetricsServer(self.cfg.metrics_port).start()
+            except Exception as e:
+                QTimer.singleShot(0, lambda e=e: self.statusBar().showMessage(f"Metrics endpoint unavailable: {e}", 8000))
+
+        # Bounded-concurrency camera startup (Start All, grid rebuilds)
+        self.startup = StartupScheduler(self.cfg.startup_concurrency, parent=self)
+        self.startup.ttff.connect(self._on_camera_ttff)
+        self.startup.finished.connect(lambda n, secs: self.statusBar().showMessage(f"Started {n} camera(s) in {secs:.1f}s", 5000))
+
         self._build_toolbar()
         self._build_central()
         self.statusBar().showMessage("Ready")
@@ -100,6 +120,11 @@ class MainWindow(QMainWindow):
         act_recs.triggered.connect(self.open_recordings)
         tb.addAction(act_recs)
 
+        act_diag = QAction("Diagnostics", self)
+        act_diag.setToolTip("Per-camera FPS, drops, bitrate, latency and stage timings")
+        act_diag.triggered.connect(self.open_diagnostics)
+        tb.addAction(act_diag)
+
         act_about = QAction("About", self)
         act_about.triggered.connect(self.open_about)
         tb.addAction(act_about)
@@ -109,6 +134,13 @@ class MainWindow(QMainWindow):
         self.act_broadcast.triggered.connect(self.toggle_broadcast)
         tb.addAction(self.act_broadcast)
 
+        self.act_wall = QAction("Video Wall", self)
+        self.act_wall.setCheckable(True)
+        self.act_wall.setChecked(self._wall_on)
+        self.act_wall.setToolTip("Paint all cameras in one composited view (lighter on the UI thread with many cameras)")
+        self.act_wall.triggered.connect(self.toggle_video_wall)
+        tb.addAction(self.act_wall)
+
     def _build_central(self):
         # Left sidebar
         self.sidebar = QWidget()
@@ -160,9 +192,19 @@ class MainWindow(QMainWindow):
         # Keep a reference for sizing
         self.scroll = scroll
 
+        # Video wall: the tiles stay in the (hidden) grid and keep running the pipeline, the wall paints
+        self.wall = VideoWall()
+        self.wall.selected.connect(self.on_tile_selected)
+        self.wall.activated.connect(self._on_wall_activated)
+        self.wall.layout_changed.connect(self._on_wall_layout_changed)
+        self.view_stack = QStackedWidget()
+        self.view_stack.addWidget(scroll)
+        self.view_stack.addWidget(self.wall)
+        self.view_stack.setCurrentWidget(self.wall if self._wall_on else scroll)
+
         self.splitter = QSplitter()
         self.splitter.addWidget(self.sidebar)
-        self.splitter.addWidget(scroll)
+        self.splitter.addWidget(self.view_stack)
         self.splitter.setStretchFactor(0, 0)
         self.splitter.setStretchFactor(1, 1)
         self.setCentralWidget(self.splitter)
@@ -199,6 +241,17 @@ class MainWindow(QMainWindow):
         except Exception:
             pass
 
+        # Tiles whose picture isn't on screen drop their display work; re-evaluated on scroll and window state
+        # changes, and periodically because fullscreen viewers open and close on their own
+        self._vis_timer = QTimer(self)
+        self._vis_timer.timeout.connect(self._update_visibility)
+        self._vis_timer.start(500)
+        try:
+            self.scroll.verticalScrollBar().valueChanged.connect(lambda _v: self._update_visibility())
+            self.scroll.horizontalScrollBar().valueChanged.connect(lambda _v: self._update_visibility())
+        except Exception:
+            pass
+
         # Initial fit after UI build
         QTimer.singleShot(0, self._fit_grid_to_viewport)
 
@@ -241,6 +294,9 @@ class MainWindow(QMainWindow):
             w = item.widget()
             if w and hasattr(w, "worker") and getattr(w.worker, "isRunning", lambda: False)():
                 prev_running.add(getattr(w, "camera_id", -1))
+        # cameras still waiting in the startup queue count as running
+        prev_running |= self.startup.pending_ids()
+        self.startup.cancel()
         # clear grid safely
         while self.grid.count():
             item = self.grid.takeAt(0)
@@ -261,9 +317,12 @@ class MainWindow(QMainWindow):
                 cid, name, url, type_ = row
                 return q in (name or '').lower() or q in (url or '').lower() or q in (type_ or '').lower()
             cams = [row for row in cams if match(row)]
+        self.wall.set_cameras([(cid, name) for cid, name, _url, _type in cams], self._fixed_cols)
         if not cams:
             self.grid.addWidget(QLabel("No cameras. Use 'Add Camera' to create one."), 0, 0)
+            self.view_stack.setCurrentWidget(self.scroll)
             return
+        self.view_stack.setCurrentWidget(self.wall if self._wall_on else self.scroll)
 
         from .ui_components.camera_tile import CameraTile
         # Determine columns based on viewport to avoid scrolling
@@ -271,6 +330,7 @@ class MainWindow(QMainWindow):
             cols = self._fixed_cols
         else:
             cols = self._suggest_cols(len(cams))
+        to_start = []
         for idx, (cid, name, url, type_) in enumerate(cams):
             tile = CameraTile(cid, name, url, type_, self.cfg, self.db)
             # hand over alerts reference for motion notifications
@@ -291,6 +351,8 @@ class MainWindow(QMainWindow):
             except Exception:
                 pass
             tile.deleted.connect(self.on_tile_deleted)
+            if self._wall_on:
+                tile.set_wall(self.wall)
             # DnD reorder signal
             if hasattr(tile, 'reorder_request'):
                 tile.reorder_request.connect(self.on_reorder_request)
@@ -298,7 +360,7 @@ class MainWindow(QMainWindow):
             self.grid.addWidget(tile, r, c)
             # auto-start if it was previously running or is the newly added one
             if cid in prev_running or (self._start_after_add_id is not None and cid == self._start_after_add_id):
-                tile.start()
+                to_start.append(tile)
             try:
                 if self._selected_camera_id is not None and hasattr(tile, 'set_selected'):
                     tile.set_selected(tile.camera_id == int(self._selected_camera_id))
@@ -306,8 +368,11 @@ class MainWindow(QMainWindow):
                 pass
         # Fit sizes once tiles are placed
         self._fit_grid_to_viewport()
+        if to_start:
+            self.startup.start_tiles(to_start, self._selected_camera_id, self.scroll.viewport())
         # reset the one-time autostart id after refresh
         self._start_after_add_id = None
+        QTimer.singleShot(0, self._update_visibility)
         try:
             self._update_sidebar_active_indicator()
         except Exception:
@@ -421,8 +486,75 @@ class MainWindow(QMainWindow):
         except Exception:
             pass
 
+    def toggle_video_wall(self, checked: bool):
+        self._wall_on = bool(checked)
+        if self.act_wall.isChecked() != self._wall_on:
+            self.act_wall.setChecked(self._wall_on)
+        self.wall.clear()
+        for tile in self._iter_tiles():
+            try:
+                tile.set_wall(self.wall if self._wall_on else None)
+            except Exception:
+                pass
+        self.view_stack.setCurrentWidget(self.wall if self._wall_on else self.scroll)
+        if not self._wall_on:
+            self._fit_grid_to_viewport()
+        QTimer.singleShot(0, self._update_visibility)
+
+    def _update_visibility(self):
+        # Publish where each tile's picture ends up (CameraTile.VISIBILITY_STATES); filtered-out cameras have no tile
+        tiles = list(self._iter_tiles())
+        if not tiles:
+            return
+        minimized = self.isMinimized() or not self.isVisible()
+        screen = self.screen()
+        covered = False
+        for t in tiles:
+            fs = t.fullscreen
+            if fs is not None and fs.isVisible() and fs.isFullScreen() and fs.screen() == screen:
+                covered = True
+                break
+        for tile in tiles:
+            fs = tile.fullscreen is not None and tile.fullscreen.isVisible()
+            if minimized:
+                state = "minimized"
+            elif covered:
+                state = "obscured"
+            elif self._wall_on or not tile.visibleRegion().isEmpty():
+                state = "visible"
+            else:
+                state = "offscreen"
+            if fs and state != "visible":
+                state = "fullscreen"
+            try:
+                tile.set_visibility(state)
+            except Exception:
+                pass
+
+    def changeEvent(self, event):
+        if event.type() == QEvent.WindowStateChange:
+            QTimer.singleShot(0, self._update_visibility)
+        return super().changeEvent(event)
+
+    def _on_wall_activated(self, cam_id: int):
+        for tile in self._iter_tiles():
+            if tile.camera_id == cam_id:
+                tile.open_fullscreen()
+                break
+
+    def _on_wall_layout_changed(self):
+        # cells resized: tiles re-request their decode size from the workers
+        if not self._wall_on:
+            return
+        for tile in self._iter_tiles():
+            try:
+                tile._update_decode_target()
+            except Exception:
+                pass
+
     def on_tile_deleted(self, cam_id: int):
         self.statusBar().showMessage(f"Camera deleted: {cam_id}", 3000)
+        metrics.drop(cam_id)
         self.refresh_grid()
 
     def add_camera(self):
@@ -431,6 +563,11 @@ class MainWindow(QMainWindow):
             name, url, type_ = dlg.get_values()
             if name and url:
                 new_id = self.db.add_camera(name, url, type_)
+                if dlg.get_sub_url():
+                    try:
+                        self.db.set_camera_sub_url(new_id, dlg.get_sub_url())
+                    except Exception:
+                        pass
                 self._start_after_add_id = new_id
                 self.statusBar().showMessage(f"Camera added: {name}", 3000)
                 self.refresh_grid()
@@ -458,6 +595,16 @@ class MainWindow(QMainWindow):
         dlg = RecordingManagerDialog(self.cfg.recordings_dir, self)
         dlg.exec()
 
+    def open_diagnostics(self):
+        from .diagnostics_panel import DiagnosticsPanel
+        names = {t.camera_id: t.name for t in self._iter_tiles()}
+        if self._diagnostics is None:
+            self._diagnostics = DiagnosticsPanel(names, self, trace_dir=self.cfg.recordings_dir, metrics_port=self.cfg.metrics_port)
+        else:
+            self._diagnostics.set_names(names)
+        self._diagnostics.show()
+        self._diagnostics.raise_()
+
     def _iter_tiles(self):
         for i in range(self.grid.count()):
             item = self.grid.itemAt(i)
@@ -466,13 +613,14 @@ class MainWindow(QMainWindow):
                 yield w
 
     def start_all(self):
-        for tile in self._iter_tiles():
-            try:
-                tile.start()
-            except Exception:
-                pass
+        self.startup.start_tiles(list(self._iter_tiles()), self._selected_camera_id, self.scroll.viewport())
+
+    def _on_camera_ttff(self, cam_id: int, secs: float):
+        name = next((t.name for t in self._iter_tiles() if t.camera_id == cam_id), str(cam_id))
+        self.statusBar().showMessage(f"{name}: first frame in {secs:.1f}s", 3000)
 
     def stop_all(self):
+        self.startup.cancel()
         for tile in self._iter_tiles():
             try:
                 tile.stop()
@@ -487,46 +635,47 @@ class MainWindow(QMainWindow):
                 pass
 
     def scan_usb_cameras(self):
-        # Probe indices 0..10 and add as USB cameras if not present
+        # Discovery runs off the UI thread; devices are added as they are reported
+        if getattr(self, "_usb_scan", None) is not None and self._usb_scan.isRunning():
+            return
+        from ..camera.usb_discovery import UsbDiscoveryWorker
         try:
-            existing = {(str(url), (type_ or '').lower()) for (_, _, url, type_) in self.db.list_cameras()}
+            self._usb_existing = {(str(url), (type_ or '').lower()) for (_, _, url, type_) in self.db.list_cameras()}
         except Exception:
-            existing = set()
-        found = []
-        added = 0
-        for idx in range(0, 11):
-            cap = None
-            try:
-                cap = cv2.VideoCapture(idx, cv2.CAP_V4L2)
-                if not cap or not cap.isOpened():
-                    if cap:
-                        cap.release()
-                    cap = cv2.VideoCapture(idx)
-                ok = bool(cap and cap.isOpened())
-            except Exception:
-                ok = False
-            try:
-                if cap:
-                    cap.release()
-            except Exception:
-                pass
-            if ok:
-                found.append(idx)
-                key = (str(idx), 'usb')
-                if key not in existing:
-                    try:
-                        name = f"USB Camera {idx}"
-                        self.db.add_camera(name, str(idx), 'usb')
-                        existing.add(key)
-                        added += 1
-                    except Exception:
-                        pass
-        msg = "No USB cameras found" if not found else f"Found: {found}. Added {added} new camera(s)."
+            self._usb_existing = set()
+        self._usb_added = 0
+        self._usb_scan = UsbDiscoveryWorker()
+        self._usb_scan.device_found.connect(self._on_usb_found)
+        self._usb_scan.scan_done.connect(self._on_usb_scan_done)
+        self.statusBar().showMessage("Scanning for USB cameras…")
+        self._usb_scan.start()
+
+    def _on_usb_found(self, info: dict):
+        idx = info.get("index")
+        key = (str(idx), 'usb')
+        sizes = [s for v in (info.get("formats") or {}).values() for s in v]
+        best = max(sizes, key=lambda s: s[0] * s[1], default=None)
+        detail = f" ({best[0]}x{best[1]})" if best and best[0] else ""
+        self.statusBar().showMessage(f"Found {info.get('name')}{detail} at {info.get('device')}", 3000)
+        if key in self._usb_existing:
+            return
+        try:
+            self.db.add_camera(info.get("name") or f"USB Camera {idx}", str(idx), 'usb')
+            self._usb_existing.add(key)
+            self._usb_added += 1
+        except Exception:
+            pass
+
+    def _on_usb_scan_done(self, found: list):
+        idxs = [d.get("index") for d in found]
+        msg = "No USB cameras found" if not found else f"Found: {idxs}. Added {self._usb_added} new camera(s)."
+        # one rebuild for the whole scan: refresh_grid restarts every running tile
+        if self._usb_added > 0:
+            self.refresh_grid()
         try:
             QMessageBox.information(self, "USB Scan", msg)
         except Exception:
             pass
-        self.refresh_grid()
 
     def _on_cols_changed(self):
         txt = self.cols_combo.currentText()
@@ -634,7 +783,15 @@ class MainWindow(QMainWindow):
                 pol = self.db.get_camera_policy(cid)
             except Exception:
                 pol = 'manual'
-            dlg = EditCameraDialog(name, url, type_, self, policy=pol)
+            try:
+                rates = self.db.get_camera_rates(cid)
+            except Exception:
+                rates = None
+            try:
+                sub_url = self.db.get_camera_sub_url(cid)
+            except Exception:
+                sub_url = ""
+            dlg = EditCameraDialog(name, url, type_, self, policy=pol, rates=rates, sub_url=sub_url)
             if dlg.exec():
                 new_name, new_url, new_type, new_policy = dlg.get_values()
                 # Save updates
@@ -643,6 +800,10 @@ class MainWindow(QMainWindow):
                         self.db.update_camera(cid, new_name, new_url, new_type)
                     if hasattr(self.db, 'set_camera_policy'):
                         self.db.set_camera_policy(cid, new_policy)
+                    if hasattr(self.db, 'set_camera_rates'):
+                        self.db.set_camera_rates(cid, *dlg.get_rates())
+                    if hasattr(self.db, 'set_camera_sub_url'):
+                        self.db.set_camera_sub_url(cid, dlg.get_sub_url())
                 except Exception:
                     pass
                 # Reflect changes
@@ -673,6 +834,7 @@ class MainWindow(QMainWindow):
     def on_tile_selected(self, cam_id: int):
         try:
             self._selected_camera_id = int(cam_id)
+            self.wall.set_selected(self._selected_camera_id)
             # mark tiles
             for i in range(self.grid.count()):
                 it = self.grid.itemAt(i)
@@ -740,6 +902,7 @@ class MainWindow(QMainWindow):
 
     def closeEvent(self, event):
         try:
+            self.startup.cancel()
             # Stop all camera tiles
             for tile in self._iter_tiles():
                 try:
@@ -748,10 +911,32 @@ class MainWindow(QMainWindow):
                     pass
         except Exception:
             pass
+        # Stop shared HTTP ingest loop (no-op if never started)
+        try:
+            from ..camera.ingest import shutdown_ingest_service
+            shutdown_ingest_service()
+        except Exception:
+            pass
+        try:
+            from ..camera.http_pool import connection_pool
+            connection_pool().close()
+        except Exception:
+            pass
         # Stop alerts system
         try:
             if hasattr(self, 'alerts') and self.alerts is not None:
                 self.alerts.stop()
         except Exception:
             pass
+        if tracing.enabled() and self.cfg.trace:
+            try:
+                tracing.dump(self.cfg.trace_path or tracing.default_path(self.cfg.recordings_dir))
+            except Exception:
+                pass
+        try:
+            if self._metrics_server is not None:
+                self._metrics_server.stop()
+                self._metrics_server = None
+        except Exception:
+            pass
         return super().closeEvent(event)
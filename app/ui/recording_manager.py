@@ -1,5 +1,5 @@
 from PySide6.QtWidgets import QDialog, QVBoxLayout, QListWidget, QPushButton, QHBoxLayout, QLabel, QMessageBox, QSplitter, QWidget, QFormLayout, QSpinBox, QDialogButtonBox
-from PySide6.QtCore import Qt, QUrl, QTimer, QPoint
+from PySide6.QtCore import Qt, QUrl, QTimer, QPoint, QRectF
 from PySide6.QtGui import QDesktopServices, QPixmap, QImage
 from pathlib import Path
 import os
@@ -7,6 +7,8 @@ import cv2
 import math
 import time
 
+from .display_buffers import DisplayBufferPool, ImageView, wrap_bgr
+
 
 class RecordingManagerDialog(QDialog):
     def __init__(self, recordings_dir: Path, parent=None):
@@ -260,7 +262,7 @@ class RecordingManagerDialog(QDialog):
             QMessageBox.information(self, "Cleanup", "No files were deleted.")
 
 
-class _VideoView(QLabel):
+class _VideoView(ImageView):
     def __init__(self, parent):
         super().__init__("No Video")
         self.setAlignment(Qt.AlignCenter)
@@ -309,6 +311,7 @@ class VideoPlayerDialog(QDialog):
         self._pan_x = 0
         self._pan_y = 0
         self._last_frame = None
+        self._buffers = DisplayBufferPool()  # decode targets; the shown frame stays pinned by its QImage
 
         v = QVBoxLayout(self)
         self.view = _VideoView(self)
@@ -356,10 +359,17 @@ class VideoPlayerDialog(QDialog):
             pass
         return super().closeEvent(e)
 
+    def _read(self):
+        # decode into a free pooled buffer once the frame size is known instead of allocating per frame
+        if self._last_frame is None:
+            return self._cap.read()
+        buf = self._buffers.acquire(self._last_frame.shape, self._last_frame.dtype)
+        return self._cap.read(buf)
+
     def _on_tick(self):
         if not self._playing:
             return
-        ok, frame = self._cap.read()
+        ok, frame = self._read()
         if not ok:
             self.pause()
             return
@@ -368,14 +378,11 @@ class VideoPlayerDialog(QDialog):
 
     def _draw(self, frame):
         try:
-            # Convert BGR->RGB
-            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            h, w, ch = rgb.shape
-            # Apply zoom and pan by cropping from a scaled image
+            h, w = frame.shape[:2]
+            # Zoom and pan pick the visible window of the scaled frame; the painter scales just that part
             scale = max(0.25, min(6.0, float(self._zoom)))
             sw = int(w * scale)
             sh = int(h * scale)
-            rgb_s = cv2.resize(rgb, (sw, sh), interpolation=cv2.INTER_LINEAR)
             view_w = max(1, self.view.width())
             view_h = max(1, self.view.height())
             cx = sw // 2 + int(self._pan_x)
@@ -389,12 +396,10 @@ class VideoPlayerDialog(QDialog):
                 y0 = max(0, sh - view_h)
                 x1 = min(sw, x0 + view_w)
                 y1 = min(sh, y0 + view_h)
-            crop = rgb_s[y0:y1, x0:x1]
-            if crop.size == 0:
-                crop = rgb_s
-            ch = crop.shape[2]
-            qi = QImage(crop.data, crop.shape[1], crop.shape[0], ch * crop.shape[1], QImage.Format_RGB888).copy()
-            self.view.setPixmap(QPixmap.fromImage(qi))
+            if x1 <= x0 or y1 <= y0:
+                x0, y0, x1, y1 = 0, 0, sw, sh
+            src = QRectF(x0 / scale, y0 / scale, (x1 - x0) / scale, (y1 - y0) / scale)
+            self.view.set_image(wrap_bgr(frame), source=src, scale=scale, smooth=True)
         except Exception:
             pass
 
@@ -410,7 +415,7 @@ class VideoPlayerDialog(QDialog):
 
     def step(self):
         self.pause()
-        ok, frame = self._cap.read()
+        ok, frame = self._read()
         if ok:
             self._last_frame = frame
             self._draw(frame)
@@ -0,0 +1,112 @@
+from PySide6.QtCore import QObject, QTimer, Qt, Signal
+import time
+
+
+class StartupScheduler(QObject):
+    """
+    Starts camera tiles a few at a time instead of all at once, so Start All / app launch don't hit the NVR with
+    every connect simultaneously. A tile holds a slot until its first frame arrives, its worker gives up, or
+    `slot_timeout` passes (a camera still retrying shouldn't block the rest of the queue).
+    Tiles are started in priority order: selected first, then visible in the viewport, then grid order.
+    """
+    ttff = Signal(int, float)  # (camera_id, seconds from start() to first frame)
+    finished = Signal(int, float)  # (cameras started, seconds for the whole batch)
+
+    def __init__(self, concurrency: int = 4, slot_timeout: float = 10.0, parent=None):
+        super().__init__(parent)
+        self.concurrency = max(1, int(concurrency))
+        self.slot_timeout = slot_timeout
+        self._queue = []  # tiles waiting to start
+        self._active = {}  # camera_id -> (tile, started_at)
+        self._late = set()  # started, slot released on timeout, first frame still pending (TTFF still reported)
+        self._batch_ts = 0.0
+        self._batch_count = 0
+        self._timer = QTimer(self)
+        self._timer.setInterval(250)
+        self._timer.timeout.connect(self._pump)
+
+    def pending_ids(self) -> set:
+        return {t.camera_id for t in self._queue}
+
+    def start_tiles(self, tiles, selected_id=None, viewport=None):
+        """Queue `tiles` for starting. `viewport` (a QWidget) is used to put visible tiles first."""
+        queued = self.pending_ids() | set(self._active)
+        new = [t for t in tiles if t.camera_id not in queued and not (t.worker and t.worker.isRunning())]
+        if not new:
+            return
+
+        def rank(item):
+            idx, t = item
+            if selected_id is not None and t.camera_id == selected_id:
+                return (0, idx)
+            return (1 if self._is_visible(t, viewport) else 2, idx)
+
+        new = [t for _i, t in sorted(enumerate(new), key=rank)]
+        if not self._queue and not self._active:
+            self._batch_ts = time.time()
+            self._batch_count = 0
+        self._queue.extend(new)
+        self._pump()
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def cancel(self, camera_id=None):
+        """Drop queued tiles (all, or one camera) and forget in-flight ones; started workers keep running."""
+        if camera_id is None:
+            self._queue.clear()
+            self._active.clear()
+            self._late.clear()
+        else:
+            self._queue = [t for t in self._queue if t.camera_id != camera_id]
+            self._active.pop(camera_id, None)
+            self._late.discard(camera_id)
+        if not self._queue and not self._active:
+            self._timer.stop()
+
+    @staticmethod
+    def _is_visible(tile, viewport) -> bool:
+        try:
+            if not tile.isVisible():
+                return False
+            if viewport is None:
+                return True
+            top_left = tile.mapTo(viewport, tile.rect().topLeft())
+            return viewport.rect().intersects(tile.rect().translated(top_left))
+        except Exception:
+            return False
+
+    def _on_first_frame(self, cam_id: int, secs: float):
+        if self._active.pop(cam_id, None) is not None:
+            self.ttff.emit(cam_id, secs)
+            self._pump()
+        elif cam_id in self._late:
+            self._late.discard(cam_id)
+            self.ttff.emit(cam_id, secs)
+
+    def _pump(self):
+        now = time.time()
+        # free slots of tiles that gave up (worker ended) or are taking too long
+        for cid, (tile, started) in list(self._active.items()):
+            running = bool(tile.worker and tile.worker.isRunning())
+            if not running:
+                self._active.pop(cid, None)
+            elif now - started > self.slot_timeout:
+                self._active.pop(cid, None)
+                self._late.add(cid)
+        while self._queue and len(self._active) < self.concurrency:
+            tile = self._queue.pop(0)
+            try:
+                tile.first_frame.connect(self._on_first_frame, Qt.UniqueConnection)
+            except Exception:
+                pass
+            try:
+                tile.start()
+            except Exception:
+                continue
+            self._active[tile.camera_id] = (tile, now)
+            self._batch_count += 1
+        if not self._queue and not self._active:
+            self._timer.stop()
+            if self._batch_count:
+                self.finished.emit(self._batch_count, now - self._batch_ts)
+                self._batch_count = 0
@@ -1,5 +1,5 @@
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QHBoxLayout, QPushButton, QDialog, QToolButton, QStyle, QMessageBox
-from PySide6.QtGui import QImage, QPixmap, QIcon, QGuiApplication, QColor, QPainter, QPen, QBrush
+from PySide6.QtGui import QPixmap, QIcon, QGuiApplication, QColor, QPainter, QPen, QBrush
 from PySide6.QtCore import Qt, Signal, QEasingCurve, QPropertyAnimation, QTimer, QSize
 from PySide6.QtWidgets import QGraphicsDropShadowEffect
 import numpy as np
@@ -8,16 +8,25 @@ from pathlib import Path
 import time
 
 from ...camera.camera_worker import CameraWorker
+from ...camera.capture_process import ProcessCameraWorker
 from ...camera.http_mjpeg_worker import HttpMJPEGWorker
 from ...camera.http_snapshot_worker import HttpSnapshotWorker
+from ...camera.ingest import ingest_service
+from ...camera.metrics import metrics_for
+from ...camera import tracing
 from ...camera.motion import SimpleMotionDetector
 from ...config import AppConfig
+from ..display_buffers import DisplayBufferPool, ImageView, wrap_bgr
+
+# HOG people detector settings shared by the alert check and the overlay (and benchmarks/micro.py)
+HOG_PARAMS = {"winStride": (8, 8), "padding": (8, 8), "scale": 1.05}
 
 
 class CameraTile(QWidget):
     deleted = Signal(int)  # camera_id
     reorder_request = Signal(int, int)  # (source_id, target_id)
     selected = Signal(int)  # camera_id
+    first_frame = Signal(int, float)  # (camera_id, seconds from start() to the first frame)
 
     def __init__(self, camera_id: int, name: str, url: str, cam_type: str, cfg: AppConfig, db):
         super().__init__()
@@ -29,21 +38,33 @@ class CameraTile(QWidget):
         self.db = db
         self.worker = None
         self._last_frame = None
+        # Optional low-res sub-stream for the grid; the main stream (self.url) is opened on demand for
+        # recording, fullscreen and AI
+        try:
+            self.sub_url = (self.db.get_camera_sub_url(self.camera_id) or "").strip()
+        except Exception:
+            self.sub_url = ""
+        self._main_worker = None
+        self._main_live = False  # main stream has delivered a frame since it was opened
+        self._main_frame = None
+        self._main_frame_ts = 0.0
+        self._pending_main_record = None  # (name_prefix, codec) waiting for the main stream's first frame
+        self._retiring = set()  # stopped main-stream workers kept referenced until their thread finishes
         self._motion = SimpleMotionDetector()
         self._last_motion_ts = 0.0
         self._motion_record = False  # whether current recording was auto-started by motion
         self._enable_motion_autorec = False  # disable by default for stability; can be toggled later
         self._last_paint_ts = 0.0
-        # Tile-level recording (for HTTP workers)
-        self._tile_recording = False
-        self._tile_writer = None
-        self._tile_writer_fps = 8.0
-        self._tile_writer_size = None
         self._rec_start_ts = 0.0  # for recording timer
         self._last_status_kind = ""  # LIVE/REC/ERR
         self.fullscreen = None
+        self._wall = None  # VideoWall that paints this camera instead of self.label (video wall mode)
         self._hovered = False
         self._last_frame_ts = 0.0
+        self._start_ts = 0.0  # set by start() until the first frame arrives (time-to-first-frame)
+        self.metrics = metrics_for(camera_id)
+        self._fps_count = 0
+        self._fps_ts = 0.0
         self._retry_count = 0
         self._next_retry_ts = 0.0
         self._detect_people = False
@@ -57,15 +78,25 @@ class CameraTile(QWidget):
         # AI throttling to avoid UI hangs when enabled on many tiles
         self._ai_last_ts = 0.0
         self._ai_min_interval = 0.6  # seconds between AI runs per tile
+        # Per-camera consumer rates (display, analytics, record) in fps; 0 = every frame
+        try:
+            self._rates = tuple(self.db.get_camera_rates(self.camera_id))
+        except Exception:
+            self._rates = (12.0, 12.0, 0.0)
+        self._analytics_last_ts = 0.0
+        self._motion_last = False
         self.setProperty("class", "camera-tile")
         self._last_alert_ts = 0.0
         self._broadcast_ui = False
         self._selected = False
+        self._disp_pool = DisplayBufferPool()  # tile-sized frames shown by self.label (pinned while displayed)
+        # where this tile's picture currently ends up; published by MainWindow (see set_visibility)
+        self._visibility = "visible"
 
         layout = QVBoxLayout(self)
         layout.setContentsMargins(6, 6, 6, 6)
         layout.setSpacing(4)
-        self.label = QLabel("No Signal")
+        self.label = ImageView("No Signal")
         self.label.setAlignment(Qt.AlignCenter)
         self.label.setMinimumHeight(220)
         layout.addWidget(self.label)
@@ -209,47 +240,212 @@ class CameraTile(QWidget):
         except Exception:
             pass
 
-    def start(self):
-        if self.worker and self.worker.isRunning():
-            return
+    def _make_worker(self, url: str):
         # Choose worker based on type/URL
-        if self.cam_type == "http-snapshot" or self.url.lower().endswith("shot.jpg"):
-            self.worker = HttpSnapshotWorker(self.camera_id, self.url)
-            self.btn_record.setEnabled(True)
-            self.btn_record.setToolTip("Tile recording enabled for HTTP Snapshot source")
-            self._tile_writer_fps = 6.0
-        elif self.cam_type == "http" or self.url.lower().startswith("http"):
-            self.worker = HttpMJPEGWorker(self.camera_id, self.url)
-            self.btn_record.setEnabled(True)
-            self.btn_record.setToolTip("Tile recording enabled for HTTP MJPEG source")
-            self._tile_writer_fps = 10.0
+        use_async = (self.cfg.http_ingest == "async")
+        if self.cam_type == "http-snapshot" or url.lower().endswith("shot.jpg"):
+            if use_async:
+                worker = ingest_service().open_stream(self.camera_id, url, "snapshot", fps=6.0, recordings_dir=self.cfg.recordings_dir)
+            else:
+                worker = HttpSnapshotWorker(self.camera_id, url, inflight=self.cfg.snapshot_inflight, recordings_dir=self.cfg.recordings_dir)
+            self.btn_record.setToolTip("Records original JPEG snapshots to MJPEG AVI")
+        elif self.cam_type == "http" or url.lower().startswith("http"):
+            if use_async:
+                worker = ingest_service().open_stream(self.camera_id, url, "mjpeg", recordings_dir=self.cfg.recordings_dir)
+            else:
+                worker = HttpMJPEGWorker(self.camera_id, url, recordings_dir=self.cfg.recordings_dir)
+            self.btn_record.setToolTip("Records the original MJPEG stream to AVI")
         else:
-            self.worker = CameraWorker(self.camera_id, self.url, self.cfg.recordings_dir, self.cam_type)
-            self.btn_record.setEnabled(True)
+            if self.cfg.capture_mode == "process":
+                worker = ProcessCameraWorker(self.camera_id, url, self.cfg.recordings_dir, self.cam_type)
+            else:
+                worker = CameraWorker(self.camera_id, url, self.cfg.recordings_dir, self.cam_type, gst_tee=self.cfg.gst_tee)
             self.btn_record.setToolTip("")
+        self.btn_record.setEnabled(True)
+        if hasattr(worker, "backend_changed") and url == self.url:
+            # only the main stream's backend is remembered; the sub-stream would overwrite it with its own
+            try:
+                worker.preferred_backend = self.db.get_camera_backend(self.camera_id) or None
+            except Exception:
+                pass
+            worker.backend_changed.connect(self._on_backend_changed)
+        if hasattr(worker, "set_rates"):
+            try:
+                worker.set_rates(*self._rates)
+            except Exception:
+                pass
+        return worker
+
+    def _on_backend_changed(self, cam_id: int, backend: str):
+        # Remember which capture backend works for this camera so the next open goes straight to it
+        try:
+            self.db.set_camera_backend(self.camera_id, backend)
+        except Exception:
+            pass
+
+    def start(self):
+        if self.worker and self.worker.isRunning():
+            return
+        # Grid display uses the sub-stream when the camera has one
+        self.worker = self._make_worker(self.sub_url or self.url)
         self.worker.frame_ready.connect(self.on_frame)
         self.worker.status.connect(self.on_status)
+        if hasattr(self.worker, "alive"):
+            self.worker.alive.connect(self.on_alive)
+        self._update_decode_target()
+        self._apply_visibility()
+        self._start_ts = time.time()
         self.worker.start()
 
+    def _update_fps_label(self):
+        # Painted frames per second, refreshed once a second; with instrumentation on also bitrate and latency
+        self._fps_count += 1
+        now = time.time()
+        if not self._fps_ts:
+            self._fps_ts = now
+            return
+        dt = now - self._fps_ts
+        if dt < 1.0:
+            return
+        parts = [f"{self._fps_count / dt:.1f} fps"]
+        self._fps_count = 0
+        self._fps_ts = now
+        if self.metrics.on:
+            win = self.metrics.window()
+            bps = win["counters"].get("bytes", 0.0) * 8
+            if bps:
+                parts.append(f"{bps / 1e6:.1f} Mb/s" if bps >= 1e6 else f"{bps / 1e3:.0f} kb/s")
+            lat = win["stages"].get("latency")
+            if lat:
+                parts.append(f"{lat['avg_ms']:.0f} ms")
+        self.lbl_fps.setText(" · ".join(parts))
+
+    def _note_first_frame(self):
+        if self._start_ts:
+            secs = time.time() - self._start_ts
+            self._start_ts = 0.0
+            self.first_frame.emit(self.camera_id, secs)
+
     def stop(self):
+        self._start_ts = 0.0
+        self._pending_main_record = None
+        self._stop_main_worker()
         if self.worker:
             self.worker.stop()
             self.worker.wait(1000)
-        # stop tile-level writer
-        if self._tile_recording:
-            self._tile_recording = False
-        if self._tile_writer is not None:
-            try:
-                self._tile_writer.release()
-            except Exception:
-                pass
-            self._tile_writer = None
+        self._rec_start_ts = 0.0
         self._update_chip(kind="IDLE")
         self.controls_row.setVisible(False)
         if hasattr(self, "btn_reconnect"):
             self.btn_reconnect.setVisible(True)
         self._schedule_health_timer()
 
+    # Main stream (only used when a sub-stream is configured)
+    def _record_worker(self):
+        # Recording always uses the full-resolution stream
+        return self._main_worker if self.sub_url else self.worker
+
+    def _is_recording(self) -> bool:
+        return bool(getattr(self._record_worker(), "_recording", False)) or self._pending_main_record is not None
+
+    def _start_recording(self, name_prefix: str, codec: str = "mp4"):
+        if not self.sub_url:
+            if self.worker is not None:
+                self.worker.start_recording(name_prefix=name_prefix, codec=codec)
+            return
+        # The main stream may still be connecting; recording starts on its first frame
+        self._pending_main_record = (name_prefix, codec)
+        self._update_main_demand()
+        if self._main_live:
+            self._apply_pending_record()
+
+    def _stop_recording(self):
+        self._pending_main_record = None
+        w = self._record_worker()
+        if w is not None and getattr(w, "_recording", False):
+            w.stop_recording()
+        self._update_main_demand()
+
+    def _apply_pending_record(self):
+        pending, self._pending_main_record = self._pending_main_record, None
+        if pending is not None and self._main_worker is not None:
+            self._main_worker.start_recording(name_prefix=pending[0], codec=pending[1])
+
+    def _main_needed(self) -> bool:
+        if not self.sub_url or self.worker is None:
+            return False
+        fullscreen = bool(self.fullscreen is not None and self.fullscreen.isVisible())
+        return fullscreen or self._detect_people or self._is_recording()
+
+    def _update_main_demand(self):
+        need = self._main_needed()
+        running = self._main_worker is not None
+        if need and not running:
+            self._main_live = False
+            self._main_worker = self._make_worker(self.url)
+            self._main_worker.frame_ready.connect(self.on_main_frame)
+            self._main_worker.status.connect(self.on_status)
+            self._main_worker.status.connect(self._on_main_status)
+            if hasattr(self._main_worker, "finished"):
+                self._main_worker.finished.connect(self._on_main_finished)
+            self._main_worker.start()
+        elif running and not need:
+            self._stop_main_worker()
+
+    def _stop_main_worker(self):
+        w, self._main_worker = self._main_worker, None
+        self._main_live = False
+        self._main_frame = None
+        self._drop_pending_record("Main stream stopped before recording started")
+        if w is not None:
+            for sig, slot in ((w.frame_ready, self.on_main_frame), (w.status, self._on_main_status)):
+                try:
+                    sig.disconnect(slot)
+                except Exception:
+                    pass
+            w.stop()
+            # don't block the UI thread on the join: keep it referenced until the thread ends, then delete it
+            if hasattr(w, "finished") and w.isRunning():
+                self._retiring.add(w)
+                w.finished.connect(lambda w=w: self._retiring.discard(w))
+                w.finished.connect(w.deleteLater)
+
+    def _drop_pending_record(self, reason: str):
+        if self._pending_main_record is None:
+            return
+        self._pending_main_record = None
+        self.status_lbl.setText(f"{reason}; not recording")
+        self._update_chip(kind="LIVE" if self.worker is not None else "IDLE")
+
+    def _on_main_status(self, cam_id: int, msg: str):
+        # a main stream that can't open would otherwise leave a queued recording showing REC forever
+        if self._main_live or self._pending_main_record is None:
+            return
+        low = (msg or "").lower()
+        if any(k in low for k in ("open failed", "error", "stopped")):
+            self._drop_pending_record("Main stream unavailable")
+            self._update_main_demand()
+
+    def _on_main_finished(self):
+        if self.sender() is self._main_worker and not self._main_live:
+            self._drop_pending_record("Main stream ended")
+
+    def on_main_frame(self, frame, cam_id: int):
+        self._main_frame = frame
+        self._main_frame_ts = time.time()
+        if not self._main_live:
+            # switch fullscreen over from the sub-stream and start any recording that was waiting
+            self._main_live = True
+            self._apply_pending_record()
+        if self.fullscreen is not None and self.fullscreen.isVisible():
+            self.fullscreen.on_frame(frame, cam_id)
+
+    def _analysis_frame(self):
+        # Full-resolution frame for AI/alerts when the main stream is live, else the grid frame
+        if self._main_frame is not None and (time.time() - self._main_frame_ts) < 2.0:
+            return self._main_frame
+        return self._last_frame
+
     def snapshot(self):
         if self._last_frame is None:
             return
@@ -263,39 +459,17 @@ class CameraTile(QWidget):
     def toggle_record(self):
         if not self.worker:
             return
-        # Only CameraWorker supports recording
-        if isinstance(self.worker, CameraWorker):
-            if getattr(self.worker, "_recording", False):
-                self.worker.stop_recording()
-                self._rec_start_ts = 0.0
-            else:
-                # get preferred codec from preferences
-                try:
-                    rp, th, vc = self.db.get_preferences()
-                except Exception:
-                    vc = "mp4"
-                self.worker.start_recording(name_prefix=f"cam{self.camera_id}", codec=vc or "mp4")
-                self._rec_start_ts = time.time()
-            
+        if self._is_recording():
+            self._stop_recording()
+            self._rec_start_ts = 0.0
         else:
-            # Tile-level recording for HTTP workers
-            if self._tile_recording:
-                self._tile_recording = False
-                if self._tile_writer is not None:
-                    try:
-                        self._tile_writer.release()
-                    except Exception:
-                        pass
-                    self._tile_writer = None
-                self.status_lbl.setText("Recording stopped")
-                self._rec_start_ts = 0.0
-            else:
-                # Open writer lazily on first frame to know size
-                self._tile_recording = True
-                self._tile_writer = None
-                self._tile_writer_size = None
-                self.status_lbl.setText("Recording starting...")
-                self._rec_start_ts = time.time()
+            # get preferred codec from preferences (HTTP sources always record pass-through AVI)
+            try:
+                rp, th, vc = self.db.get_preferences()
+            except Exception:
+                vc = "mp4"
+            self._start_recording(f"cam{self.camera_id}", vc or "mp4")
+            self._rec_start_ts = time.time()
 
     def on_status(self, cam_id: int, msg: str):
         self.setToolTip(msg)
@@ -309,16 +483,83 @@ class CameraTile(QWidget):
             if hasattr(self, "btn_reconnect"):
                 self.btn_reconnect.setVisible(False)
 
-    def on_frame(self, frame, cam_id: int):
-        self._last_frame = frame.copy()
+    def on_alive(self, cam_id: int):
+        # Source is up but the image hasn't changed (deduped snapshot); counts as a frame for health checks
         self._last_frame_ts = time.time()
-        # Motion detection
+        self._note_first_frame()
+
+    def _apply_rates(self):
+        for w in (self.worker, self._main_worker):
+            if w is not None and hasattr(w, "set_rates"):
+                try:
+                    w.set_rates(*self._rates)
+                except Exception:
+                    pass
+
+    # visible: painted in the grid or the video wall; fullscreen: only the fullscreen viewer shows it;
+    # offscreen: scrolled out of the viewport; obscured: another camera's fullscreen viewer covers the window;
+    # minimized: the main window is minimized or hidden
+    VISIBILITY_STATES = ("visible", "fullscreen", "offscreen", "obscured", "minimized")
+
+    def visibility(self) -> str:
+        return self._visibility
+
+    def set_visibility(self, state: str):
+        """Display-only work (worker display frames, resize, conversion, paint) stops unless the picture is shown."""
+        if state not in self.VISIBILITY_STATES or state == self._visibility:
+            return
+        self._visibility = state
+        self._apply_visibility()
+
+    def _apply_visibility(self):
+        # Recording and analytics keep their own rates; only the display consumer is switched off
+        if self.worker is not None and hasattr(self.worker, "set_display_enabled"):
+            try:
+                self.worker.set_display_enabled(self._visibility in ("visible", "fullscreen"))
+            except Exception:
+                pass
+
+    @staticmethod
+    def _rate_due(last_ts: float, fps: float, now: float) -> bool:
+        # small tolerance so frames the worker paced for this consumer aren't rejected on timer jitter
+        return fps <= 0 or (now - last_ts) >= 0.8 / fps
+
+    def on_frame(self, frame, cam_id: int):
+        if not tracing.active:
+            self._process_frame(frame, cam_id)
+            return
+        t0 = time.perf_counter()
+        tracing.delivered(self.camera_id, frame)
         try:
-            motion, _ = self._motion.detect(frame)
-        except Exception:
-            motion = False
+            self._process_frame(frame, cam_id)
+        finally:
+            tracing.span("on_frame", t0, time.perf_counter(), self.camera_id)
+
+    def _process_frame(self, frame, cam_id: int):
+        # Frames are borrowed from the worker's ring (or freshly decoded); keep a reference, never draw on it
+        self._last_frame = frame
+        self._last_frame_ts = time.time()
+        if self._start_ts:
+            self._note_first_frame()
+        if not self._main_live and self.fullscreen is not None and self.fullscreen.isVisible():
+            self.fullscreen.on_frame(frame, cam_id)
+        display_fps, analytics_fps, _record_fps = self._rates
+        m = self.metrics
+        # Motion detection at the camera's analytics rate; in between, the last result stands
+        analytics_due = self._rate_due(self._analytics_last_ts, analytics_fps, self._last_frame_ts)
+        if analytics_due:
+            self._analytics_last_ts = self._last_frame_ts
+            t = m.start()
+            try:
+                motion, _ = self._motion.detect(frame)
+            except Exception:
+                motion = False
+            m.stop("motion", t)
+            self._motion_last = motion
+        else:
+            motion = self._motion_last
         now = time.time()
-        if motion:
+        if motion and analytics_due:
             self._last_motion_ts = now
             self.status_lbl.setText("Motion detected")
             # For alerting, require a person detection (lightweight HOG check here, no drawing)
@@ -330,15 +571,17 @@ class CameraTile(QWidget):
                     self._hog.setSVMDetector(cv2.HOGDescriptor_getDefaultPeopleDetector())
                 target_w = max(1, self.label.width())
                 target_h = max(1, self.label.height())
-                disp_small = self._last_frame
+                disp_small = self._analysis_frame()
                 if disp_small is not None:
                     # respect AI throttle
                     if (now - self._ai_last_ts) >= self._ai_min_interval:
                         self._ai_last_ts = now
                         scale = 0.5 if max(target_w, target_h) > 640 else 1.0
                         if scale != 1.0:
-                            disp_small = cv2.resize(self._last_frame, (int(self._last_frame.shape[1]*scale), int(self._last_frame.shape[0]*scale)), interpolation=cv2.INTER_AREA)
-                        rects_tmp, _ = self._hog.detectMultiScale(disp_small, winStride=(8,8), padding=(8,8), scale=1.05)
+                            disp_small = cv2.resize(disp_small, (int(disp_small.shape[1]*scale), int(disp_small.shape[0]*scale)), interpolation=cv2.INTER_AREA)
+                        t = m.start()
+                        rects_tmp, _ = self._hog.detectMultiScale(disp_small, **HOG_PARAMS)
+                        m.stop("detection", t)
                         person_present = len(rects_tmp) > 0
                     else:
                         person_present = (self._person_count_last > 0)
@@ -366,38 +609,60 @@ class CameraTile(QWidget):
                     # bypass local throttle for emergency
                     if sev == "emergency" or (now - self._last_alert_ts) > 5.0:
                         self._last_alert_ts = now
-                        self.alerts.notify_motion(self.camera_id, frame=self._last_frame, severity=sev)
+                        self.alerts.notify_motion(self.camera_id, frame=self._analysis_frame(), severity=sev)
             except Exception:
                 pass
-            # Auto-record start for CameraWorker (optional)
-            if self._enable_motion_autorec and isinstance(self.worker, CameraWorker) and not getattr(self.worker, "_recording", False):
+            # Auto-record start (optional)
+            if self._enable_motion_autorec and self.worker is not None and not self._is_recording():
                 try:
                     rp, th, vc = self.db.get_preferences()
                 except Exception:
                     vc = "mp4"
-                self.worker.start_recording(name_prefix=f"cam{self.camera_id}_motion", codec=vc or "mp4")
+                self._start_recording(f"cam{self.camera_id}_motion", vc or "mp4")
                 self._motion_record = True
-        else:
+        elif not motion:
             # stop auto recording 10s after last motion
-            if self._motion_record and isinstance(self.worker, CameraWorker):
+            if self._motion_record and self.worker is not None:
                 if now - self._last_motion_ts > 10:
-                    self.worker.stop_recording()
+                    self._stop_recording()
                     self._motion_record = False
 
-        # Throttle painting to ~15 FPS
-        if time.time() - self._last_paint_ts < (1.0/15.0):
+        if self._visibility != "visible":
+            # nothing of the tile is on screen: skip resize/conversion/paint, keep the recording policy running
+            eff_policy = self._record_policy if self._record_policy != 'manual' else self._global_policy
+            if eff_policy == 'person':
+                self._count_people()
+            self._apply_record_policy(motion)
+            return
+
+        # Throttle painting to the camera's display rate
+        if not self._rate_due(self._last_paint_ts, display_fps, time.time()):
             return
         self._last_paint_ts = time.time()
+        t_conv = m.start()
 
+        # Determine effective policy (camera override; if manual, use global)
+        eff_policy = self._record_policy if self._record_policy != 'manual' else self._global_policy
+        need_person = (eff_policy == 'person') or self._detect_people
+        wall = self._wall
         # Downscale to label size before converting to QImage to reduce CPU
-        target_w = max(1, self.label.width())
-        target_h = max(1, self.label.height())
-        if frame.shape[1] > 0 and frame.shape[0] > 0 and (frame.shape[1] != target_w or frame.shape[0] != target_h):
-            disp = cv2.resize(frame, (target_w, target_h), interpolation=cv2.INTER_AREA)
+        if wall is not None:
+            target_w, target_h = wall.cell_size(self.camera_id)
         else:
+            target_w = max(1, self.label.width())
+            target_h = max(1, self.label.height())
+        if wall is not None and not need_person:
+            # the wall's painter scales into the cell and nothing draws on the frame: hand over the borrowed frame
             disp = frame
+        elif frame.shape[1] > 0 and frame.shape[0] > 0 and (frame.shape[1] != target_w or frame.shape[0] != target_h):
+            buf = self._disp_pool.acquire((target_h, target_w) + frame.shape[2:], frame.dtype)
+            disp = cv2.resize(frame, (target_w, target_h), dst=buf, interpolation=cv2.INTER_AREA)
+        else:
+            # already tile-sized (in-pipeline scaling / reduced decode); overlays below draw on disp, not the ring slot
+            disp = self._disp_pool.acquire(frame.shape, frame.dtype)
+            np.copyto(disp, frame)
         # Apply subtle hover zoom (1.02x) by scaling and center-cropping
-        if self._hovered:
+        if self._hovered and wall is None:
             try:
                 zoom_w = int(target_w * 1.02)
                 zoom_h = int(target_h * 1.02)
@@ -409,10 +674,11 @@ class CameraTile(QWidget):
                 pass
         # Person detection (HOG). Compute count if policy requires OR overlay toggle is on; draw only if overlay is on.
         self._person_count_last = 0
-        # Determine effective policy (camera override; if manual, use global)
-        eff_policy = self._record_policy if self._record_policy != 'manual' else self._global_policy
-        need_person = (eff_policy == 'person') or self._detect_people
         rects = []
+        conv_secs = (time.perf_counter() - t_conv) if t_conv else 0.0
+        if tracing.active:
+            tracing.span("conversion", t_conv, t_conv + conv_secs, self.camera_id, step="resize")
+        t_det = m.start() if need_person else 0.0
         if need_person:
             try:
                 # YOLO is only allowed when overlay is toggled ON (to avoid heavy memory when only policy triggers)
@@ -465,7 +731,7 @@ class CameraTile(QWidget):
                             self._hog.setSVMDetector(cv2.HOGDescriptor_getDefaultPeopleDetector())
                         scale = 0.5 if max(target_w, target_h) > 640 else 1.0
                         small = disp if scale == 1.0 else cv2.resize(disp, (int(target_w*scale), int(target_h*scale)), interpolation=cv2.INTER_AREA)
-                        rects, _ = self._hog.detectMultiScale(small, winStride=(8,8), padding=(8,8), scale=1.05)
+                        rects, _ = self._hog.detectMultiScale(small, **HOG_PARAMS)
                         self._person_count_last = len(rects)
                         if self._detect_people and rects:  # draw only if overlay ON
                             for (x, y, w0, h0) in rects:
@@ -482,37 +748,25 @@ class CameraTile(QWidget):
                     except Exception:
                         pass
                     self._yolo_notice_shown = True
-        # Ensure C-contiguous memory before building QImage (cropping can create non-contiguous views)
-        if not getattr(disp.flags, 'c_contiguous', True):
-            disp = np.ascontiguousarray(disp)
-        h, w, ch = disp.shape
-        bytes_per_line = ch * w
-        # Initialize tile-level writer if needed
-        if self._tile_recording:
-            if self._tile_writer is None or self._tile_writer_size != (disp.shape[1], disp.shape[0]):
-                # open writer with current frame size
-                try:
-                    rp, th, vc = self.db.get_preferences()
-                except Exception:
-                    vc = "mp4"
-                use_avi = (str(vc).lower() == "avi")
-                fourcc = cv2.VideoWriter_fourcc(*("MJPG" if use_avi else "mp4v"))
-                ext = ".avi" if use_avi else ".mp4"
-                out_dir = Path(self.cfg.recordings_dir)
-                out_dir.mkdir(parents=True, exist_ok=True)
-                ts = time.strftime("%Y%m%d_%H%M%S")
-                out_path = out_dir / f"cam{self.camera_id}_tile_{ts}{ext}"
-                self._tile_writer = cv2.VideoWriter(str(out_path), fourcc, float(self._tile_writer_fps), (disp.shape[1], disp.shape[0]))
-                self._tile_writer_size = (disp.shape[1], disp.shape[0])
-                self.status_lbl.setText(f"Recording: {out_path.name}")
-            if self._tile_writer is not None and self._tile_writer.isOpened():
-                try:
-                    self._tile_writer.write(disp)
-                except Exception:
-                    pass
+        m.stop("detection", t_det)
+        if wall is not None:
+            if conv_secs:
+                m.observe("conversion", conv_secs)
+            wall.set_frame(self.camera_id, disp, recording=self._is_recording())
+            try:
+                self._update_fps_label()
+            except Exception:
+                pass
+        else:
+            self._paint_label(disp, conv_secs)
+        self._apply_record_policy(motion)
 
+    def _paint_label(self, disp, conv_secs: float):
+        m = self.metrics
+        t_conv = m.start()
+        h, w = disp.shape[:2]
         # Update chip (LIVE/REC + timer)
-        is_rec = (isinstance(self.worker, CameraWorker) and getattr(self.worker, "_recording", False)) or self._tile_recording
+        is_rec = self._is_recording()
         if is_rec:
             self._update_chip(kind="REC")
         else:
@@ -526,15 +780,50 @@ class CameraTile(QWidget):
         # Update info labels
         try:
             self.lbl_res.setText(f"{w}x{h}")
-            # We keep FPS label subtle to avoid noise; can be improved by measuring frames/sec
-            self.lbl_fps.setText("")
+            self._update_fps_label()
         except Exception:
             pass
 
-        # Detach to avoid referencing temporary NumPy buffer
-        qimg = QImage(disp.data, w, h, bytes_per_line, QImage.Format_BGR888).copy()
-        self.label.setPixmap(QPixmap.fromImage(qimg))
+        # Painted straight from the pooled buffer: the image pins it until the next frame replaces it
+        qimg = wrap_bgr(disp)
+        if t_conv:
+            now = time.perf_counter()
+            m.observe("conversion", conv_secs + now - t_conv)
+            if tracing.active:
+                tracing.span("conversion", t_conv, now, self.camera_id, step="qimage")
+        t = m.start()
+        self.label.set_image(qimg)
+        if t:
+            m.stop("paint", t)
+            m.count("painted")
+            if m.last_capture:
+                m.observe("latency", time.perf_counter() - m.last_capture)
+
+    def _count_people(self):
+        # Person-policy check without the display path: HOG on the analysis frame, nothing drawn
+        now = time.time()
+        if (now - self._ai_last_ts) < self._ai_min_interval:
+            return
+        self._ai_last_ts = now
+        img = self._analysis_frame()
+        if img is None:
+            return
+        m = self.metrics
+        t = m.start()
+        try:
+            if self._hog is None:
+                self._hog = cv2.HOGDescriptor()
+                self._hog.setSVMDetector(cv2.HOGDescriptor_getDefaultPeopleDetector())
+            h, w = img.shape[:2]
+            scale = min(1.0, 640.0 / max(1, w))
+            small = img if scale == 1.0 else cv2.resize(img, (int(w * scale), int(h * scale)), interpolation=cv2.INTER_AREA)
+            rects, _ = self._hog.detectMultiScale(small, **HOG_PARAMS)
+            self._person_count_last = len(rects)
+        except Exception:
+            self._person_count_last = 0
+        m.stop("detection", t)
 
+    def _apply_record_policy(self, motion: bool):
         # Apply recording policy (do not override manual)
         try:
             eff_policy = self._record_policy if self._record_policy != 'manual' else self._global_policy
@@ -545,34 +834,40 @@ class CameraTile(QWidget):
                 should_rec = bool(motion)
             elif eff_policy == 'person':
                 should_rec = (self._person_count_last > 0)
-            # Start/stop recording depending on worker type; if manual, do nothing
-            from ...camera.camera_worker import CameraWorker as _CW
-            if isinstance(self.worker, _CW):
-                if eff_policy != 'manual' and should_rec and not getattr(self.worker, '_recording', False):
+            # Start/stop worker recording; if manual, do nothing
+            if self.worker is not None:
+                if eff_policy != 'manual' and should_rec and not self._is_recording():
                     try:
-                        self.worker.start_recording(name_prefix=f"cam{self.camera_id}")
+                        self._start_recording(f"cam{self.camera_id}")
+                        self._rec_start_ts = time.time()
                     except Exception:
                         pass
-                elif eff_policy != 'manual' and (not should_rec) and getattr(self.worker, '_recording', False):
+                elif eff_policy != 'manual' and (not should_rec) and self._is_recording():
                     try:
-                        self.worker.stop_recording()
+                        self._stop_recording()
                     except Exception:
                         pass
-            else:
-                # HTTP snapshot tile-level writer
-                if eff_policy != 'manual' and should_rec and not self._tile_recording:
-                    self._tile_recording = True
-                    self._tile_writer = None
-                    self._tile_writer_size = None
-                    self.status_lbl.setText("Recording starting...")
-                    self._rec_start_ts = time.time()
-                elif eff_policy != 'manual' and (not should_rec) and self._tile_recording:
-                    self._tile_recording = False
         except Exception:
             pass
 
     def _toggle_ai(self, checked: bool):
         self._detect_people = bool(checked)
+        self._update_decode_target()
+
+    def _update_decode_target(self):
+        # Consumers changed: open/close the main stream if the camera has a sub-stream
+        self._update_main_demand()
+        # HTTP sources decode JPEGs at 1/2..1/8 scale and GStreamer tee pipelines scale in-pipeline; request full
+        # resolution only when fullscreen or person detection needs native pixels (recording uses the original stream).
+        # With a sub-stream those consumers use the main stream, so the grid worker always stays tile-sized.
+        if self.worker is None or not hasattr(self.worker, "set_decode_target"):
+            return
+        need_full = not self.sub_url and (self._detect_people or bool(self.fullscreen is not None and self.fullscreen.isVisible()))
+        size = self._wall.cell_size(self.camera_id) if self._wall is not None else (max(1, self.label.width()), max(1, self.label.height()))
+        try:
+            self.worker.set_decode_target(None if need_full else size)
+        except Exception:
+            pass
 
     # Hover behavior to show controls and enable zoom effect
     def enterEvent(self, e):
@@ -628,6 +923,15 @@ class CameraTile(QWidget):
             pass
         super().leaveEvent(e)
 
+    def set_wall(self, wall):
+        """Paint into a VideoWall instead of this tile's label (None: back to the label)."""
+        if wall is self._wall:
+            return
+        if self._wall is not None:
+            self._wall.clear_frame(self.camera_id)
+        self._wall = wall
+        self._update_decode_target()
+
     def set_broadcast(self, on: bool):
         self._broadcast_ui = bool(on)
         try:
@@ -654,24 +958,36 @@ class CameraTile(QWidget):
     def edit_camera(self):
         from ..edit_camera_dialog import EditCameraDialog
         # pass current policy to dialog
-        dlg = EditCameraDialog(self.name, self.url, self.cam_type, self, policy=self._record_policy)
+        dlg = EditCameraDialog(self.name, self.url, self.cam_type, self, policy=self._record_policy, rates=self._rates, sub_url=self.sub_url)
         if dlg.exec():
             new_name, new_url, new_type, new_policy = dlg.get_values()
-            if (new_name, new_url, new_type) != (self.name, self.url, self.cam_type):
+            try:
+                if hasattr(self.db, 'set_camera_rates'):
+                    self._rates = dlg.get_rates()
+                    self.db.set_camera_rates(self.camera_id, *self._rates)
+                    self._apply_rates()
+            except Exception:
+                pass
+            new_sub = dlg.get_sub_url()
+            if (new_name, new_url, new_type, new_sub) != (self.name, self.url, self.cam_type, self.sub_url):
                 # ask confirm if url/type changed
-                if (new_url != self.url) or (new_type != self.cam_type):
+                if (new_url != self.url) or (new_type != self.cam_type) or (new_sub != self.sub_url):
                     r = QMessageBox.question(self, "Confirm Changes", "Save changes to this camera's configuration?", QMessageBox.Yes | QMessageBox.No)
                     if r != QMessageBox.Yes:
                         return
                 self.name, self.url, self.cam_type = new_name, new_url, new_type
                 try:
                     self.db.update_camera(self.camera_id, self.name, self.url, self.cam_type)
+                    if new_sub != self.sub_url and hasattr(self.db, 'set_camera_sub_url'):
+                        self.db.set_camera_sub_url(self.camera_id, new_sub)
                 except Exception:
                     pass
                 # restart if running
                 was_running = bool(self.worker and self.worker.isRunning())
                 if was_running:
                     self.stop()
+                self.sub_url = new_sub
+                if was_running:
                     self.start()
             # Save policy regardless
             try:
@@ -733,6 +1049,7 @@ class CameraTile(QWidget):
                         pass
         except Exception:
             pass
+        self._update_decode_target()
         super().resizeEvent(e)
 
     def _make_red_dot_icon(self, size: int = 18) -> QIcon:
@@ -803,13 +1120,16 @@ class CameraTile(QWidget):
 
     # Fullscreen viewer
     def mouseDoubleClickEvent(self, e):
+        self.open_fullscreen()
+        super().mouseDoubleClickEvent(e)
+
+    def open_fullscreen(self):
         if not self.fullscreen:
             self.fullscreen = _FullscreenViewer(self.name)
-            # mirror frames
-            if self.worker:
-                self.worker.frame_ready.connect(self.fullscreen.on_frame)
+            self.fullscreen.finished.connect(lambda _r: self._update_decode_target())
+            # frames are mirrored from on_frame / on_main_frame, so restarted workers keep feeding it
         self.fullscreen.showFullScreen()
-        super().mouseDoubleClickEvent(e)
+        self._update_decode_target()
 
     def _reconnect(self):
         try:
@@ -835,6 +1155,10 @@ class CameraTile(QWidget):
         if self.worker and self.worker.isRunning():
             stale_secs = 8
             if self._last_frame_ts and (now - self._last_frame_ts) > stale_secs:
+                if getattr(self.worker, "self_healing", False):
+                    # the worker runs its own reconnect/backoff; just reflect the state
+                    self._update_chip(kind="ERR")
+                    return
                 if now >= self._next_retry_ts:
                     self._retry_count = min(self._retry_count + 1, 6)
                     delay = min(30, 2 ** self._retry_count)
@@ -862,26 +1186,18 @@ class _FullscreenViewer(QDialog):
         super().__init__()
         self.setWindowTitle(title)
         self.setModal(False)
-        self.label = QLabel("No Signal")
+        self.label = ImageView("No Signal")
         self.label.setAlignment(Qt.AlignCenter)
         lay = QVBoxLayout(self)
         lay.addWidget(self.label)
 
     def on_frame(self, frame, cam_id: int):
         try:
-            if not getattr(frame.flags, 'c_contiguous', True):
-                frame = np.ascontiguousarray(frame)
-            h, w, ch = frame.shape
-            bytes_per_line = ch * w
-            qimg = QImage(frame.data, w, h, bytes_per_line, QImage.Format_BGR888).copy()
-            self.label.setPixmap(QPixmap.fromImage(qimg).scaled(self.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation))
+            # full-resolution frame scaled by the painter; holds the worker's ring slot until the next frame
+            self.label.set_image(wrap_bgr(frame), smooth=True)
         except Exception:
             pass
 
-    def closeEvent(self, e):
-        self.stop()
-        super().closeEvent(e)
-
     def delete_camera(self):
         # Stop worker and remove from DB, then notify parent
         from PySide6.QtWidgets import QMessageBox
@@ -0,0 +1,211 @@
+import math
+import time
+
+from PySide6.QtWidgets import QWidget
+from PySide6.QtGui import QPainter, QColor, QPen, QFont, QRegion
+from PySide6.QtCore import Qt, Signal, QRect, QRectF, QTimer
+
+from ..camera.metrics import metrics_for
+from .display_buffers import wrap_bgr
+
+
+class VideoWall(QWidget):
+    """
+    Composited grid for many live cameras: keeps the newest frame per camera and paints every dirty cell in one
+    paintEvent with QPainter.drawImage, letting the painter do the scaling. Tiles keep running the pipeline
+    (workers, analytics, recording) and hand frames over with set_frame() instead of building a pixmap each.
+    Frames are wrapped, not copied; holding the array keeps a worker's ring slot borrowed until the next frame.
+    Repaints are paced at REFRESH_HZ by set_frame itself (with a timer for the last frames of a burst) rather than
+    update(): Qt posts update requests at low priority, and with many cameras the stream of queued frame signals
+    starves them.
+    """
+
+    selected = Signal(int)  # camera_id (click)
+    activated = Signal(int)  # camera_id (double-click)
+    layout_changed = Signal()  # cell sizes changed; tiles re-request their decode size
+
+    SPACING = 4
+    MARGIN = 8
+    REFRESH_HZ = 30
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setAttribute(Qt.WA_OpaquePaintEvent)
+        self.setMouseTracking(False)
+        self._order = []  # camera ids in grid order
+        self._names = {}
+        self._cells = {}  # camera_id -> [frame, QImage, recording, fresh]
+        self._rects = {}  # camera_id -> QRect
+        self._cols = 0  # 0 = auto
+        self._selected = None
+        self._smooth = False  # bilinear scaling costs more per cell than it's worth at wall sizes
+        self._font = QFont(self.font())
+        self._font.setPointSize(max(7, self._font.pointSize() - 1))
+        self._dirty = set()  # cameras with a frame not painted yet
+        self._next_paint = 0.0
+        self._pump = QTimer(self)
+        self._pump.setInterval(int(1000 / self.REFRESH_HZ))
+        self._pump.timeout.connect(self._flush)
+
+    # --- contents ---
+    def set_cameras(self, cams, cols: int = 0):
+        """cams: [(camera_id, name)] in display order."""
+        self._order = [int(cid) for cid, _name in cams]
+        self._names = {int(cid): name for cid, name in cams}
+        self._cells = {cid: c for cid, c in self._cells.items() if cid in self._names}
+        self._cols = max(0, int(cols or 0))
+        self._relayout()
+
+    def set_columns(self, cols: int):
+        self._cols = max(0, int(cols or 0))
+        self._relayout()
+
+    def set_selected(self, camera_id):
+        self._selected = camera_id
+        self.update()
+
+    def set_frame(self, camera_id: int, frame, recording: bool = False):
+        rect = self._rects.get(camera_id)
+        if rect is None or frame is None:
+            return
+        self._cells[camera_id] = [frame, wrap_bgr(frame), bool(recording), True]
+        self._dirty.add(camera_id)
+        if time.perf_counter() >= self._next_paint:
+            self._flush()
+        elif not self._pump.isActive():
+            self._pump.start()
+
+    def _flush(self):
+        if not self._dirty:
+            self._pump.stop()
+            return
+        self._next_paint = time.perf_counter() + 1.0 / self.REFRESH_HZ
+        region = QRegion()
+        for cid in self._dirty:
+            rect = self._rects.get(cid)
+            if rect is not None:
+                region += rect
+        self._dirty.clear()
+        if self.isVisible() and not region.isEmpty():
+            # one synchronous pass over every cell that changed since the last tick
+            self.repaint(region)
+
+    def clear_frame(self, camera_id: int):
+        if self._cells.pop(camera_id, None) is not None and camera_id in self._rects:
+            self.update(self._rects[camera_id])
+
+    def clear(self):
+        self._cells.clear()
+        self._dirty.clear()
+        self.update()
+
+    def cell_size(self, camera_id=None):
+        rect = self._rects.get(camera_id) if camera_id is not None else next(iter(self._rects.values()), None)
+        if rect is None:
+            return 1, 1
+        return max(1, rect.width()), max(1, rect.height())
+
+    # --- layout ---
+    def _columns(self, n: int, W: int, H: int) -> int:
+        if self._cols:
+            return self._cols
+        # widest 16:9 cell that fits every camera without scrolling (as MainWindow._suggest_cols)
+        best_c, best_w = max(1, int(math.ceil(math.sqrt(n)))), 0.0
+        for c in range(1, n + 1):
+            rows = int(math.ceil(n / float(c)))
+            cw = (W - (c - 1) * self.SPACING) / float(c)
+            ch = min(cw * 9.0 / 16.0, (H - (rows - 1) * self.SPACING) / float(rows))
+            cw = min(cw, ch * 16.0 / 9.0)
+            if cw > best_w:
+                best_w, best_c = cw, c
+        return best_c
+
+    def _relayout(self):
+        n = len(self._order)
+        old = {cid: (r.width(), r.height()) for cid, r in self._rects.items()}
+        self._rects = {}
+        if n:
+            W = max(1, self.width() - 2 * self.MARGIN)
+            H = max(1, self.height() - 2 * self.MARGIN)
+            cols = min(n, self._columns(n, W, H))
+            rows = int(math.ceil(n / float(cols)))
+            cw = (W - (cols - 1) * self.SPACING) / float(cols)
+            ch = (H - (rows - 1) * self.SPACING) / float(rows)
+            for idx, cid in enumerate(self._order):
+                r, c = divmod(idx, cols)
+                x = self.MARGIN + c * (cw + self.SPACING)
+                y = self.MARGIN + r * (ch + self.SPACING)
+                self._rects[cid] = QRect(int(x), int(y), int(cw), int(ch))
+        self.update()
+        if old != {cid: (r.width(), r.height()) for cid, r in self._rects.items()}:
+            self.layout_changed.emit()
+
+    def resizeEvent(self, e):
+        self._relayout()
+        return super().resizeEvent(e)
+
+    def _cell_at(self, pos):
+        for cid, rect in self._rects.items():
+            if rect.contains(pos):
+                return cid
+        return None
+
+    def mousePressEvent(self, e):
+        cid = self._cell_at(e.position().toPoint())
+        if cid is not None and e.button() == Qt.LeftButton:
+            self.selected.emit(cid)
+        return super().mousePressEvent(e)
+
+    def mouseDoubleClickEvent(self, e):
+        cid = self._cell_at(e.position().toPoint())
+        if cid is not None:
+            self.activated.emit(cid)
+        return super().mouseDoubleClickEvent(e)
+
+    # --- painting ---
+    @staticmethod
+    def _fit(rect: QRect, w: int, h: int) -> QRectF:
+        s = min(rect.width() / float(w), rect.height() / float(h))
+        tw, th = w * s, h * s
+        return QRectF(rect.x() + (rect.width() - tw) / 2.0, rect.y() + (rect.height() - th) / 2.0, tw, th)
+
+    def paintEvent(self, e):
+        p = QPainter(self)
+        dirty = e.rect()
+        p.fillRect(dirty, QColor(12, 12, 12))
+        p.setRenderHint(QPainter.SmoothPixmapTransform, self._smooth)
+        p.setFont(self._font)
+        for cid in self._order:
+            rect = self._rects.get(cid)
+            if rect is None or not rect.intersects(dirty):
+                continue
+            cell = self._cells.get(cid)
+            p.fillRect(rect, QColor(24, 24, 24))
+            if cell is not None:
+                frame, img, recording, fresh = cell
+                m = metrics_for(cid)
+                t = m.start()
+                p.drawImage(self._fit(rect, img.width(), img.height()), img)
+                if t and fresh:
+                    m.stop("paint", t)
+                    m.count("painted")
+                    if m.last_capture:
+                        m.observe("latency", time.perf_counter() - m.last_capture)
+                cell[3] = False
+                if recording:
+                    p.setPen(Qt.NoPen)
+                    p.setBrush(QColor(220, 0, 32))
+                    p.drawEllipse(rect.x() + 8, rect.y() + 8, 10, 10)
+            # name label on a dark backing so it stays readable over the camera's own OSD
+            name = self._names.get(cid, str(cid))
+            fm = p.fontMetrics()
+            x = rect.x() + (24 if cell is not None and cell[2] else 6)
+            label = QRect(x, rect.y() + 4, min(rect.width() - (x - rect.x()) - 4, fm.horizontalAdvance(name) + 8), fm.height() + 2)
+            p.fillRect(label, QColor(0, 0, 0, 150))
+            p.setPen(QColor(235, 235, 235))
+            p.drawText(label, Qt.AlignCenter, fm.elidedText(name, Qt.ElideRight, label.width() - 4))
+            if cid == self._selected:
+                p.setPen(QPen(QColor("#2aa3ff"), 2))
+                p.setBrush(Qt.NoBrush)
+                p.drawRect(rect.adjusted(1, 1, -1, -1))
+        p.end()
@@ -0,0 +1,267 @@
+"""
+Micro-benchmarks for the per-frame hot paths, with fixed synthetic inputs and recorded baselines:
+
+    python -m benchmarks.micro                    # run, compare with benchmarks/baselines.json, exit 1 on regression
+    python -m benchmarks.micro --only motion,hog  # subset (substring match)
+    python -m benchmarks.micro --update           # re-record the baselines on this machine
+
+Each benchmark times one unit of work (one MJPEG part, one frame through the motion detector, ...) over --repeat
+timed rounds. The fastest round is compared with the baseline (the median is printed too; it moves with machine
+load), and a result slower than --tolerance x its baseline is a regression. Baselines are
+only comparable on the machine (and OpenCV/Qt build) that recorded them; the file keeps a note of both.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ.setdefault("OPENCV_LOG_LEVEL", "ERROR")
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+BASELINES = Path(__file__).resolve().parent / "baselines.json"
+
+_BENCHES = {}
+_keep = []  # widgets must outlive their benchmark
+
+
+class Unavailable(Exception):
+    """Raised by a benchmark's setup when this build lacks the capability it measures (reported as skipped)."""
+
+
+def bench(name: str):
+    """Register a benchmark: the decorated function does the setup and returns the callable to time."""
+    def deco(fn):
+        _BENCHES[name] = fn
+        return fn
+    return deco
+
+
+def _frames(n: int, w: int, h: int, pattern: str = "moving"):
+    from app.camera.sim import SimSource
+    src = SimSource(w, h, 25.0, pattern, seed=1234)
+    return [src.next_frame().copy() for _ in range(n)]
+
+
+def _cycle(items):
+    state = {"i": 0}
+
+    def take():
+        i = state["i"]
+        state["i"] = (i + 1) % len(items)
+        return items[i]
+    return take
+
+
+@bench("mjpeg_parse")
+def _mjpeg_parse():
+    # One 640x360 part per call, fed in 64 KiB chunks like HttpMJPEGWorker's fill() loop
+    import cv2
+    from app.camera.mjpeg_parser import MJPEGStreamParser
+    parts = []
+    for f in _frames(30, 640, 360):
+        jpg = cv2.imencode(".jpg", f, [int(cv2.IMWRITE_JPEG_QUALITY), 80])[1].tobytes()
+        parts.append(b"--frame\r\nContent-Type: image/jpeg\r\nContent-Length: %d\r\n\r\n" % len(jpg) + jpg + b"\r\n")
+    stream = b"".join(parts)
+    chunks = [stream[i:i + 65536] for i in range(0, len(stream), 65536)]
+    parser = MJPEGStreamParser(b"--frame")
+    state = {"chunks": iter(())}
+
+    def run():
+        while True:
+            part = parser.next_part()
+            if part is not None:
+                return part
+            chunk = next(state["chunks"], None)
+            if chunk is None:
+                parser.reset()
+                state["chunks"] = iter(chunks)
+                continue
+            parser.feed(chunk)
+    return run
+
+
+@bench("motion_detect")
+def _motion_detect():
+    from app.camera.motion import SimpleMotionDetector
+    det = SimpleMotionDetector()
+    take = _cycle(_frames(50, 640, 360))
+    for _ in range(50):
+        det.detect(take())  # let MOG2 settle on the background
+    return lambda: det.detect(take())
+
+
+@bench("person_postprocess")
+def _person_postprocess():
+    # YOLOv5n-shaped output (1 x 25200 x 85) with a fixed sprinkling of confident person rows
+    import numpy as np
+    from app.camera.detect import PersonDetector
+    rng = np.random.default_rng(7)
+    preds = rng.random((1, 25200, 85), dtype=np.float32) * 0.2
+    preds[0, :, 0:4] = rng.random((25200, 4), dtype=np.float32) * 640
+    hot = rng.choice(25200, 40, replace=False)
+    preds[0, hot, 4] = 0.9
+    preds[0, hot, 5] = 0.9
+    det = PersonDetector(Path("/nonexistent"))
+    return lambda: det._postprocess(preds, 1280, 720)
+
+
+@bench("hog_people")
+def _hog_people():
+    # CameraTile's alert/overlay HOG pass on a half-scale analysis frame
+    import cv2
+    if not hasattr(cv2, "HOGDescriptor"):
+        raise Unavailable(f"OpenCV {cv2.__version__} was built without the HOG people detector")
+    from app.ui.ui_components.camera_tile import HOG_PARAMS
+    hog = cv2.HOGDescriptor()
+    hog.setSVMDetector(cv2.HOGDescriptor_getDefaultPeopleDetector())
+    take = _cycle(_frames(5, 480, 270))
+    return lambda: hog.detectMultiScale(take(), **HOG_PARAMS)
+
+
+@bench("bgr_to_qimage")
+def _bgr_to_qimage():
+    # CameraTile's display path: tile-sized BGR frame wrapped without a copy and painted into a window-format target
+    from PySide6.QtGui import QImage, QPainter
+    from app.ui.display_buffers import wrap_bgr
+    take = _cycle(_frames(5, 640, 360))
+    target = QImage(640, 360, QImage.Format_ARGB32_Premultiplied)
+
+    def run():
+        p = QPainter(target)
+        p.drawImage(0, 0, wrap_bgr(take()))
+        p.end()
+    return run
+
+
+@bench("player_draw")
+def _player_draw():
+    # Recording player repaint of a 720p frame into a 960x540 view at 1.5x zoom (update + the view's paint)
+    from PySide6.QtGui import QImage
+    from app.ui.recording_manager import VideoPlayerDialog
+    dlg = VideoPlayerDialog(str(ROOT / "benchmarks" / "no-such-video.mp4"))
+    dlg.view.resize(960, 540)
+    dlg._zoom = 1.5
+    take = _cycle(_frames(5, 1280, 720))
+    target = QImage(960, 540, QImage.Format_ARGB32_Premultiplied)
+    _keep.append(dlg)
+
+    def run():
+        dlg._draw(take())
+        dlg.view.render(target)
+    return run
+
+
+def _time(fn, repeat: int, min_round: float):
+    fn()  # warm-up (lazy init, caches)
+    # calibrate calls per round so short functions aren't dominated by timer overhead
+    number = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        dt = time.perf_counter() - t0
+        if dt >= min_round or number >= 1 << 16:
+            break
+        number *= 2
+    rounds = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        rounds.append((time.perf_counter() - t0) / number * 1000.0)
+    return {"median_ms": statistics.median(rounds), "min_ms": min(rounds), "calls": number, "rounds": repeat}
+
+
+def _machine() -> dict:
+    import cv2
+    import PySide6
+    return {
+        "host": platform.node(),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "opencv": cv2.__version__,
+        "pyside6": PySide6.__version__,
+        "cpus": os.cpu_count(),
+    }
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Hot-path micro-benchmarks with baseline comparison")
+    ap.add_argument("--only", default="", help="comma-separated name filters")
+    ap.add_argument("--repeat", type=int, default=7, help="timed rounds per benchmark")
+    ap.add_argument("--min-round", type=float, default=0.1, help="minimum seconds per round")
+    ap.add_argument("--tolerance", type=float, default=None, help="allowed slowdown factor (default: from baselines, else 1.5)")
+    ap.add_argument("--baselines", default=str(BASELINES))
+    ap.add_argument("--update", action="store_true", help="record the results as the new baselines")
+    ap.add_argument("--out", default=None, help="write the JSON results here")
+    args = ap.parse_args(argv)
+
+    import cv2
+    cv2.setNumThreads(1)  # single-threaded numbers are stable across machines with different core counts
+    from PySide6.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([])  # noqa: F841 (QPixmap/widgets need it)
+
+    filters = [f.strip() for f in args.only.split(",") if f.strip()]
+    names = [n for n in _BENCHES if not filters or any(f in n for f in filters)]
+    path = Path(args.baselines)
+    try:
+        base = json.loads(path.read_text())
+    except Exception:
+        base = {}
+    tolerance = args.tolerance or float(base.get("tolerance", 1.5))
+    recorded = base.get("results", {})
+
+    results = {}
+    failed = []
+    broken = []
+    print(f"{'benchmark':<22}{'median ms':>12}{'min ms':>10}{'baseline':>10}{'ratio':>8}")
+    for name in names:
+        try:
+            fn = _BENCHES[name]()
+        except Unavailable as e:
+            # a missing capability is not a regression, but say so
+            print(f"{name:<22}  skipped: {e}")
+            continue
+        except Exception as e:
+            # broken imports or renamed hot-path helpers must fail the run, not skip it
+            print(f"{name:<22}  SETUP FAILED: {type(e).__name__}: {e}")
+            broken.append(name)
+            continue
+        res = _time(fn, args.repeat, args.min_round)
+        results[name] = res
+        ref = recorded.get(name)
+        ratio = res["min_ms"] / ref if ref else None
+        flag = ""
+        if ratio is not None and ratio > tolerance:
+            flag = "  REGRESSION"
+            failed.append(name)
+        print(f"{name:<22}{res['median_ms']:>12.3f}{res['min_ms']:>10.3f}"
+              f"{(f'{ref:.3f}' if ref else '-'):>10}{(f'{ratio:.2f}' if ratio else 'new'):>8}{flag}")
+
+    if args.out:
+        Path(args.out).write_text(json.dumps({"machine": _machine(), "results": results}, indent=2))
+    if broken:
+        print(f"{len(broken)} benchmark(s) failed to set up: {', '.join(broken)}", file=sys.stderr)
+        return 1
+    if args.update:
+        merged = dict(recorded)
+        merged.update({n: round(r["min_ms"], 4) for n, r in results.items()})
+        path.write_text(json.dumps({"machine": _machine(), "tolerance": tolerance, "results": merged}, indent=2) + "\n")
+        print(f"baselines written to {path}")
+        return 0
+    if failed:
+        print(f"{len(failed)} regression(s) beyond {tolerance:.2f}x: {', '.join(failed)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,410 @@
+"""
+End-to-end multi-camera benchmark: N simulated cameras through the real workers and CameraTile pipeline
+(headless Qt, offscreen platform), one measurement per camera count.
+
+    python -m benchmarks.multicam --counts 1,4,16,32,64 --secs 10 --out multicam.json
+    python -m benchmarks.multicam --source mjpeg --counts 8,16 --w 1280 --h 720 --fps 25
+
+Sources: sim (sim:// cameras through CameraWorker / the capture process), mjpeg and snapshot (the local
+sim_server in a child process, through the HTTP workers). Frames carry the simulator's counter and render-time
+stamp, so drops and latency are measured on the frames themselves.
+
+Per camera count the JSON report has ingest FPS (frames reaching the tile), displayed FPS (frames handed to the
+tile's view, or to the video wall with --wall),
+dropped frames (counter gaps), ingest/display latency percentiles (ms), CPU % of one core and RSS. The first count
+whose per-camera ingest FPS falls below --saturation of the expected rate, or whose p95 display latency exceeds
+--max-latency-ms, is reported as the saturation point.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Headless Qt and the app's thread settings must be in place before PySide6/OpenCV are imported
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ.setdefault("OPENCV_LOG_LEVEL", "ERROR")
+os.environ.setdefault("OMP_NUM_THREADS", "1")
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+
+def _percentiles(values, ps=(50, 90, 95, 99)):
+    if not values:
+        return {f"p{p}": None for p in ps}
+    v = sorted(values)
+    out = {}
+    for p in ps:
+        k = min(len(v) - 1, max(0, int(round(p / 100.0 * (len(v) - 1)))))
+        out[f"p{p}"] = round(v[k], 2)
+    return out
+
+
+def _rss_bytes(pid: int | None = None) -> int:
+    try:
+        with open(f"/proc/{pid or 'self'}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except Exception:
+        try:
+            import resource
+            # peak, not current; KiB on Linux
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+        except Exception:
+            return 0
+
+
+class _Usage:
+    """CPU seconds and RSS of this process plus (with psutil) its children, e.g. capture processes."""
+
+    def __init__(self):
+        try:
+            import psutil  # optional
+            self._proc = psutil.Process()
+        except Exception:
+            self._proc = None
+
+    def cpu(self) -> float:
+        if self._proc is not None:
+            try:
+                total = sum(self._proc.cpu_times()[:2])
+                for c in self._proc.children(recursive=True):
+                    try:
+                        total += sum(c.cpu_times()[:2])
+                    except Exception:
+                        pass
+                return total
+            except Exception:
+                pass
+        t = os.times()
+        return t.user + t.system
+
+    def rss(self) -> int:
+        if self._proc is not None:
+            try:
+                total = self._proc.memory_info().rss
+                for c in self._proc.children(recursive=True):
+                    try:
+                        total += c.memory_info().rss
+                    except Exception:
+                        pass
+                return total
+            except Exception:
+                pass
+        return _rss_bytes()
+
+    @property
+    def includes_children(self) -> bool:
+        return self._proc is not None
+
+
+def _free_port() -> int:
+    s = socket.socket()
+    s.bind(("127.0.0.1", 0))
+    port = s.getsockname()[1]
+    s.close()
+    return port
+
+
+def _start_server(args):
+    # separate process so encoding the synthetic streams doesn't count against the app
+    port = _free_port()
+    cmd = [sys.executable, "-m", "app.camera.sim_server", "--port", str(port), "--cameras", "0",
+           "--w", str(args.w), "--h", str(args.h), "--fps", str(args.fps), "--pattern", args.pattern]
+    proc = subprocess.Popen(cmd, cwd=str(ROOT), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 10
+    while time.time() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return proc, f"http://127.0.0.1:{port}"
+        except OSError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError("sim_server did not start")
+
+
+def _camera_specs(args, n: int, base_url: str | None):
+    specs = []
+    for i in range(1, n + 1):
+        if args.source == "sim":
+            specs.append((f"sim://cam{i}?w={args.w}&h={args.h}&fps={args.fps}&pattern={args.pattern}", "sim"))
+        elif args.source == "mjpeg":
+            specs.append((f"{base_url}/cam/{i}/video", "http"))
+        else:
+            specs.append((f"{base_url}/cam/{i}/shot.jpg", "http-snapshot"))
+    return specs
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Multi-camera end-to-end benchmark (headless)")
+    ap.add_argument("--counts", default="1,4,16,32", help="comma-separated camera counts")
+    ap.add_argument("--secs", type=float, default=10.0, help="measurement window per count")
+    ap.add_argument("--warmup", type=float, default=3.0)
+    ap.add_argument("--source", choices=["sim", "mjpeg", "snapshot"], default="sim")
+    ap.add_argument("--mode", choices=["thread", "process"], default=None, help="CCTV_CAPTURE_MODE for sim cameras")
+    ap.add_argument("--w", type=int, default=640)
+    ap.add_argument("--h", type=int, default=360)
+    ap.add_argument("--fps", type=float, default=15.0)
+    ap.add_argument("--pattern", default="moving", choices=["moving", "static", "bars", "noise"])
+    ap.add_argument("--rates", default="0,0,0", help="per-camera display,analytics,record fps (0 = every frame)")
+    ap.add_argument("--window", default="1920x1080", help="offscreen grid size")
+    ap.add_argument("--wall", action="store_true", help="paint through the composited video wall instead of the tiles")
+    ap.add_argument("--saturation", type=float, default=0.9, help="min fraction of the expected per-camera FPS")
+    ap.add_argument("--max-latency-ms", type=float, default=500.0, help="max p95 display latency")
+    ap.add_argument("--stop-at-saturation", action="store_true", help="skip larger counts once saturated")
+    ap.add_argument("--out", default=None, help="write the JSON report here (default: stdout)")
+    args = ap.parse_args(argv)
+
+    if args.mode:
+        os.environ["CCTV_CAPTURE_MODE"] = args.mode
+    # throwaway app root: DB, recordings and settings stay out of the real install
+    bench_root = tempfile.mkdtemp(prefix="cctv-bench-")
+    os.environ["CCTV_APP_ROOT"] = bench_root
+
+    from PySide6.QtCore import QEventLoop, QObject, QTimer, Slot
+    from PySide6.QtWidgets import QApplication, QGridLayout, QWidget
+    import cv2
+    import PySide6
+
+    from app.camera.ingest import shutdown_ingest_service
+    from app.camera.sim import frame_age_ms, read_counter
+    from app.config import AppConfig
+    from app.database.db import Database
+    from app.ui.ui_components.camera_tile import CameraTile
+    from app.ui.video_wall import VideoWall
+
+    app = QApplication.instance() or QApplication([])
+    cfg = AppConfig()
+    db = Database(cfg)
+    db.initialize()
+    rates = tuple(float(x) for x in args.rates.split(","))
+    counts = [int(x) for x in args.counts.split(",") if x.strip()]
+    ww, wh = (int(x) for x in args.window.lower().split("x"))
+    usage = _Usage()
+
+    def spin(secs: float):
+        loop = QEventLoop()
+        QTimer.singleShot(int(secs * 1000), loop.quit)
+        loop.exec()
+
+    class Probe(QObject):
+        """Per-camera counters; lives in the GUI thread so frames are observed where the tile sees them."""
+
+        def __init__(self):
+            super().__init__()
+            self.reset()
+
+        def reset(self):
+            self.frames = 0
+            self.painted = 0
+            self.first = None
+            self.last = None
+            self.gaps = 0
+            self.ingest_ms = []
+            self.display_ms = []
+
+        @Slot(object, int)
+        def on_frame(self, frame, cam_id: int):
+            now = time.time()
+            self.frames += 1
+            n = read_counter(frame, args.w)
+            if n is not None:
+                if self.last is not None and n > self.last + 1:
+                    self.gaps += n - self.last - 1
+                if self.first is None:
+                    self.first = n
+                self.last = n if self.last is None else max(self.last, n)
+            age = frame_age_ms(frame, args.w, now)
+            if age is not None and age < 60000:
+                self.ingest_ms.append(age)
+
+        def on_paint(self, tile):
+            self.painted += 1
+            frame = tile._last_frame
+            if frame is not None:
+                age = frame_age_ms(frame, args.w)
+                if age is not None and age < 60000:
+                    self.display_ms.append(age)
+
+    expected = args.fps
+    if args.source == "snapshot":
+        # snapshot cameras are polled at the worker's rate; the server's counter advances in real time, so
+        # skipped numbers are sampling, not drops
+        expected = min(args.fps, 6.0)
+    elif rates[0] > 0 or rates[1] > 0:
+        expected = min(args.fps, max(rates[0], rates[1]))
+    if args.source == "sim" and cfg.capture_mode == "process":
+        # ProcessCameraWorker forwards the newest shared-memory frame at a fixed ~12 FPS
+        expected = min(expected, 12.0)
+
+    report = {
+        "benchmark": "multicam",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "opencv": cv2.__version__,
+            "pyside6": PySide6.__version__,
+            "git": _git_rev(),
+            "capture_mode": cfg.capture_mode,
+            "cpu_includes_children": usage.includes_children,
+        },
+        "config": vars(args),
+        "expected_fps_per_camera": expected,
+        "runs": [],
+        "saturation": None,
+    }
+
+    server = base_url = None
+    if args.source != "sim":
+        server, base_url = _start_server(args)
+    try:
+        for n in counts:
+            for cid, *_ in db.list_cameras():
+                db.remove_camera(cid)
+            grid_host = QWidget()
+            grid_host.resize(ww, wh)
+            grid = QGridLayout(grid_host)
+            cols = max(1, int(round(n ** 0.5)))
+            tiles, probes = [], []
+            wall = None
+            if args.wall:
+                # tiles stay in the (hidden) grid and run the pipeline; the wall paints
+                wall = VideoWall()
+                wall.resize(ww, wh)
+                by_cam = {}
+                orig_set_frame = wall.set_frame
+
+                def wall_frame(cid, frame, recording=False, _orig=orig_set_frame, _by_cam=by_cam):
+                    hit = _by_cam.get(cid)
+                    if hit is not None:
+                        hit[0].on_paint(hit[1])
+                    _orig(cid, frame, recording)
+
+                wall.set_frame = wall_frame
+            for i, (url, typ) in enumerate(_camera_specs(args, n, base_url)):
+                cid = db.add_camera(f"bench{i + 1}", url, typ)
+                db.set_camera_rates(cid, *rates)
+                tile = CameraTile(cid, f"bench{i + 1}", url, typ, cfg, db)
+                grid.addWidget(tile, *divmod(i, cols))
+                probe = Probe()
+                if wall is not None:
+                    by_cam[cid] = (probe, tile)
+                else:
+                    # count repaints: wrap the tile's view update (ImageView paints the frame it is handed)
+                    orig = tile.label.set_image
+
+                    def painted(img, *a, _orig=orig, _probe=probe, _tile=tile, **kw):
+                        _probe.on_paint(_tile)
+                        _orig(img, *a, **kw)
+
+                    tile.label.set_image = painted
+                tiles.append(tile)
+                probes.append(probe)
+            if wall is not None:
+                wall.set_cameras([(t.camera_id, t.name) for t in tiles])
+                for tile in tiles:
+                    tile.set_wall(wall)
+                wall.show()
+            else:
+                grid_host.show()
+            for tile, probe in zip(tiles, probes):
+                tile.start()
+                tile.worker.frame_ready.connect(probe.on_frame)
+            spin(args.warmup)
+            for p in probes:
+                p.reset()
+            rss0 = usage.rss()
+            cpu0 = usage.cpu()
+            t0 = time.time()
+            spin(args.secs)
+            elapsed = time.time() - t0
+            cpu = usage.cpu() - cpu0
+            rss = usage.rss()
+            for tile in tiles:
+                tile.stop()
+            grid_host.close()
+            grid_host.deleteLater()
+            if wall is not None:
+                wall.close()
+                wall.deleteLater()
+            spin(0.5)
+
+            frames = sum(p.frames for p in probes)
+            painted = sum(p.painted for p in probes)
+            produced = sum((p.last - p.first + 1) for p in probes if p.first is not None)
+            gaps = sum(p.gaps for p in probes)
+            run = {
+                "cameras": n,
+                "seconds": round(elapsed, 2),
+                "ingest_fps_total": round(frames / elapsed, 2),
+                "ingest_fps_per_camera": round(frames / elapsed / n, 2),
+                "ingest_fps_min_camera": round(min(p.frames for p in probes) / elapsed, 2),
+                "display_fps_total": round(painted / elapsed, 2),
+                "display_fps_per_camera": round(painted / elapsed / n, 2),
+                "dropped_frames": gaps if args.source != "snapshot" else None,
+                "dropped_pct": round(100.0 * gaps / produced, 2) if produced and args.source != "snapshot" else None,
+                "latency_ms": {
+                    "ingest": _percentiles([v for p in probes for v in p.ingest_ms]),
+                    "display": _percentiles([v for p in probes for v in p.display_ms]),
+                },
+                "cpu_pct": round(100.0 * cpu / elapsed, 1),
+                "cpu_pct_per_camera": round(100.0 * cpu / elapsed / n, 2),
+                "rss_mb": round(rss / 2 ** 20, 1),
+                "rss_delta_mb": round((rss - rss0) / 2 ** 20, 1),
+            }
+            p95 = run["latency_ms"]["display"]["p95"]
+            run["saturated"] = bool(
+                run["ingest_fps_per_camera"] < args.saturation * expected
+                or (p95 is not None and p95 > args.max_latency_ms)
+            )
+            report["runs"].append(run)
+            print(
+                f"{n:4d} cams  ingest {run['ingest_fps_per_camera']:6.2f} fps/cam  display {run['display_fps_per_camera']:6.2f} "
+                f"fps/cam  drop {run['dropped_pct']}%  p95 display {p95} ms  cpu {run['cpu_pct']}%  rss {run['rss_mb']} MB"
+                + ("  SATURATED" if run["saturated"] else ""),
+                file=sys.stderr,
+            )
+            if run["saturated"] and report["saturation"] is None:
+                report["saturation"] = {"cameras": n, "last_unsaturated": _last_ok(report["runs"])}
+                if args.stop_at_saturation:
+                    break
+    finally:
+        # stop the shared HTTP ingest loop (CCTV_HTTP_INGEST=async) before its QThread object goes away
+        shutdown_ingest_service()
+        if server is not None:
+            server.terminate()
+            server.wait(5)
+        db.conn.close()
+        shutil.rmtree(bench_root, ignore_errors=True)
+
+    text = json.dumps(report, indent=2)
+    if args.out:
+        Path(args.out).write_text(text, encoding="utf-8")
+    else:
+        print(text)
+    return 0
+
+
+def _last_ok(runs):
+    ok = [r["cameras"] for r in runs if not r["saturated"]]
+    return max(ok) if ok else None
+
+
+def _git_rev():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=str(ROOT), stderr=subprocess.DEVNULL).decode().strip()
+    except Exception:
+        return None
+
+
+if __name__ == "__main__":
+    sys.exit(main())